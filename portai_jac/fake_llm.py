@@ -0,0 +1,277 @@
+"""
+PortAI Fake LLM — deterministic, offline stand-in for Gemini
+=============================================================
+A tiny OpenAI-compatible chat-completions server that byllm's `Model` can be
+pointed at instead of Gemini. Every reply is derived from a hash of the prompt,
+so the same walker call always gets the same answer, and it sleeps for a
+configurable latency so load tests see realistic LLM wait times.
+
+Structured outputs (AISummary, PlayerAnalysis, CrystalBallPrediction, ...) are
+built from the JSON schema byllm sends in `response_format`. When no schema is
+sent, the known PortAI types are recognised by name in the prompt and a canned
+object is returned instead.
+
+Usage:
+    python fake_llm.py                              # 127.0.0.1:4010, 0.8s latency
+    python fake_llm.py --port 4010 --latency 1.5 --jitter 0.5
+    python fake_llm.py --latency 0                  # as fast as possible
+
+Then start the app against it:
+    export PORTAI_FAKE_LLM_URL=http://127.0.0.1:4010/v1
+    jac start
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# ── Canned vocabulary ────────────────────────────────────────────────────────
+
+SCHOOLS = [
+    "Alabama Crimson Tide", "Georgia Bulldogs", "Ohio State Buckeyes",
+    "Michigan Wolverines", "Texas Longhorns", "Oregon Ducks", "LSU Tigers",
+    "Penn State Nittany Lions", "Notre Dame Fighting Irish", "USC Trojans",
+    "Florida State Seminoles", "Miami Hurricanes", "Tennessee Volunteers",
+    "Ole Miss Rebels", "Clemson Tigers", "Oklahoma Sooners",
+]
+
+SENTENCES = [
+    "Portal activity has been concentrated among Power Four programs looking for immediate starters.",
+    "Quarterback and edge rusher remain the most sought-after positions this cycle.",
+    "Several four-star transfers have already committed within a week of entering.",
+    "Programs with coaching changes continue to see the largest outgoing classes.",
+    "The SEC and Big Ten account for the majority of high-rated commitments.",
+    "Depth at the offensive line is driving a steady stream of late additions.",
+    "Group of Five standouts are increasingly moving up to fill starting roles.",
+    "Retention efforts have slowed departures at a handful of contenders.",
+]
+
+STRENGTHS = [
+    "Elite athleticism", "Proven production", "Strong football IQ",
+    "Versatility across alignments", "Physical at the point of attack",
+    "Reliable hands", "Quick processing", "Leadership experience",
+]
+
+GROWTH = [
+    "Consistency against top competition", "Pad level", "Ball security",
+    "Route-running detail", "Tackling angles", "Durability",
+]
+
+# Fields whose sem strings pin them to a fixed set of values.
+ENUM_FIELDS = {
+    "confidence": ["High", "Medium", "Low"],
+    "fit_rating": ["Excellent", "Good", "Moderate", "Uncertain"],
+    "risk_level": ["Low", "Moderate", "High"],
+    "category": ["Transfer News", "Analysis", "Trending", "Recruiting"],
+}
+
+# Field layouts for the PortAI obj types, used when no schema is sent.
+KNOWN_TYPES = {
+    "CrystalBallPrediction": {"prediction": "str", "confidence": "str", "reasoning": "str"},
+    "PlayerAnalysis": {
+        "strengths": "list", "areas_for_growth": "list", "overall_assessment": "str",
+        "projected_impact": "str", "fit_rating": "str",
+    },
+    "TeamAnalysis": {
+        "portal_strategy": "str", "key_additions": "str", "key_losses": "str",
+        "outlook": "str", "risk_level": "str",
+    },
+    "NewsStory": {
+        "headline": "str", "summary": "str", "content": "str", "source": "str",
+        "date": "str", "category": "str",
+    },
+    "PortalOverview": {"title": "str", "content": "str"},
+    "AISummary": {"title": "str", "content": "str"},
+    "TransferImpact": {"impact": "str"},
+    "ChatResponse": {"response": "str"},
+}
+
+
+# ── Value generation ─────────────────────────────────────────────────────────
+
+def _sentences(rng, n):
+    return " ".join(rng.sample(SENTENCES, n))
+
+
+def fake_string(name, rng):
+    """Plausible text for a field, chosen by field name."""
+    if name in ENUM_FIELDS:
+        return rng.choice(ENUM_FIELDS[name])
+    if name == "prediction":
+        return rng.choice(SCHOOLS)
+    if name in ("title", "headline"):
+        return f"{rng.choice(SCHOOLS).split()[0]} Reshapes Its Roster Through the Portal"
+    if name == "source":
+        return rng.choice(["ESPN", "247Sports", "On3", "The Athletic"])
+    if name == "date":
+        return "January 15, 2026"
+    if name in ("content", "overall_assessment", "portal_strategy", "outlook"):
+        return _sentences(rng, 3)
+    return _sentences(rng, 1)
+
+
+def fake_list(name, rng):
+    if name == "areas_for_growth":
+        return rng.sample(GROWTH, 2)
+    return rng.sample(STRENGTHS, 3)
+
+
+def from_schema(schema, rng, name="", defs=None):
+    """Build a value that validates against a (simple) JSON schema."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        schema = defs.get(schema["$ref"].rsplit("/", 1)[-1], {})
+    if "enum" in schema:
+        return rng.choice(schema["enum"])
+    if "anyOf" in schema:
+        options = [s for s in schema["anyOf"] if s.get("type") != "null"]
+        return from_schema(options[0] if options else {}, rng, name, defs)
+
+    kind = schema.get("type", "string")
+    if kind == "object":
+        props = schema.get("properties", {})
+        return {k: from_schema(v, rng, k, defs) for k, v in props.items()}
+    if kind == "array":
+        items = schema.get("items", {"type": "string"})
+        if items.get("type", "string") == "string" and "enum" not in items:
+            return fake_list(name, rng)
+        return [from_schema(items, rng, name, defs) for _ in range(3)]
+    if kind == "integer":
+        return rng.randint(1, 5)
+    if kind == "number":
+        return round(rng.uniform(0.5, 1.0), 4)
+    if kind == "boolean":
+        return rng.random() < 0.5
+    return fake_string(name, rng)
+
+
+def from_known_type(type_name, rng):
+    fields = KNOWN_TYPES[type_name]
+    return {
+        k: fake_list(k, rng) if kind == "list" else fake_string(k, rng)
+        for k, kind in fields.items()
+    }
+
+
+def build_reply(payload):
+    """Return the assistant message content for a chat-completions payload."""
+    prompt = json.dumps(payload.get("messages", []), sort_keys=True)
+    seed = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:8], "big")
+    rng = random.Random(seed)
+
+    fmt = payload.get("response_format") or {}
+    schema = (fmt.get("json_schema") or {}).get("schema")
+    if schema:
+        return json.dumps(from_schema(schema, rng))
+
+    for type_name in KNOWN_TYPES:
+        if type_name in prompt:
+            return json.dumps(from_known_type(type_name, rng))
+
+    if fmt.get("type") == "json_object":
+        return json.dumps({"response": _sentences(rng, 2)})
+    return _sentences(rng, 2)
+
+
+# ── HTTP server ──────────────────────────────────────────────────────────────
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    latency = 0.8
+    jitter = 0.2
+    _count = 0
+    _lock = threading.Lock()
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "portai-fake", "object": "model"}]})
+        else:
+            self._send_json(200, {"status": "ok", "requests": FakeLLMHandler._count})
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+            return
+
+        length = int(self.headers.get("Content-Length", 0))
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except json.JSONDecodeError:
+            self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+            return
+
+        content = build_reply(payload)
+
+        # Latency jitter is seeded from the reply so runs are reproducible.
+        delay = self.latency
+        if self.jitter:
+            delay += random.Random(content).uniform(-self.jitter, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        with FakeLLMHandler._lock:
+            FakeLLMHandler._count += 1
+            request_id = FakeLLMHandler._count
+
+        self._send_json(200, {
+            "id": f"chatcmpl-fake-{request_id}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "portai-fake"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": len(json.dumps(payload.get("messages", []))) // 4,
+                "completion_tokens": len(content) // 4,
+                "total_tokens": (len(json.dumps(payload.get("messages", []))) + len(content)) // 4,
+            },
+        })
+
+
+def serve(host="127.0.0.1", port=4010, latency=0.8, jitter=0.2):
+    FakeLLMHandler.latency = latency
+    FakeLLMHandler.jitter = min(jitter, latency)
+    server = ThreadingHTTPServer((host, port), FakeLLMHandler)
+    server.daemon_threads = True
+    return server
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Deterministic offline LLM for PortAI")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=4010)
+    p.add_argument("--latency", type=float, default=0.8,
+                   help="Mean seconds to wait before each reply (default: 0.8)")
+    p.add_argument("--jitter", type=float, default=0.2,
+                   help="± seconds of deterministic jitter around --latency (default: 0.2)")
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    server = serve(args.host, args.port, args.latency, args.jitter)
+    print(f"Fake LLM listening on http://{args.host}:{args.port}/v1  "
+          f"(latency={args.latency}s ±{FakeLLMHandler.jitter}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,267 @@
+"""
+PortAI Load Test — replays realistic walker mixes against a running server
+==========================================================================
+Each virtual user signs up, logs in, then loops over weighted "page visits"
+that issue the same walker calls the frontend makes:
+
+    players  → search_players, get_portal_stats, get_transfers
+    detail   → get_player_detail, get_ai_impact, predict_destination,
+               get_player_analysis
+    chat     → chat
+
+Latency is recorded per walker and reported as p50/p95/p99 plus throughput.
+Pair it with fake_llm.py so the AI walkers can be exercised offline.
+
+Usage:
+    python loadtest.py                                  # 10 users, 60s
+    python loadtest.py --users 50 --duration 120
+    python loadtest.py --mix players=6,detail=3,chat=1
+    python loadtest.py --base-url http://localhost:8000 --json results.json
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+DEFAULT_MIX = {"players": 6, "detail": 3, "chat": 1}
+
+CHAT_QUESTIONS = [
+    "Which SEC teams have been most active in the portal?",
+    "Who are the top quarterbacks still in the portal?",
+    "How has Ohio State done in the transfer portal this year?",
+    "Which positions are in the highest demand right now?",
+    "What does Texas need to add before next season?",
+]
+
+POSITIONS = ["all", "all", "all", "QB", "WR", "CB", "EDGE", "OT"]
+
+
+# ── HTTP client ──────────────────────────────────────────────────────────────
+
+class WalkerClient:
+    """One authenticated session, equivalent to one browser tab."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def authenticate(self):
+        creds = {
+            "username": f"loadtest-{uuid.uuid4().hex[:12]}@portai.test",
+            "password": "loadtest-pass",
+        }
+        creds["email"] = creds["username"]
+        self.session.post(f"{self.base_url}/user/register", json=creds, timeout=self.timeout)
+        resp = self.session.post(f"{self.base_url}/user/login", json=creds, timeout=self.timeout)
+        resp.raise_for_status()
+        token = _find_token(resp.json())
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def spawn(self, walker, **fields):
+        resp = self.session.post(
+            f"{self.base_url}/walker/{walker}", json=fields, timeout=self.timeout
+        )
+        resp.raise_for_status()
+        return resp.json()
+
+
+def _find_token(body):
+    if isinstance(body, dict):
+        if isinstance(body.get("token"), str):
+            return body["token"]
+        for value in body.values():
+            token = _find_token(value)
+            if token:
+                return token
+    return None
+
+
+def _reports(body):
+    """Pull the walker's report list out of the response envelope."""
+    if isinstance(body, dict):
+        if "reports" in body:
+            return body["reports"] or []
+        for value in body.values():
+            reports = _reports(value)
+            if reports:
+                return reports
+    return []
+
+
+# ── Page scenarios ───────────────────────────────────────────────────────────
+
+def visit_players(client, rng, call):
+    body = call("search_players", query="", offset=0, limit=50,
+                position_filter=rng.choice(POSITIONS))
+    call("get_portal_stats")
+    call("get_transfers", offset=0, limit=100, search_query="",
+         position_filter="all", status_filter="all")
+    players = []
+    for report in _reports(body):
+        players.extend(report.get("players", []))
+    return [p["id"] for p in players if "id" in p]
+
+
+def visit_detail(client, rng, call, player_ids):
+    player_id = rng.choice(player_ids) if player_ids else str(rng.randint(1, 500))
+    body = call("get_player_detail", player_id=player_id)
+    reports = _reports(body)
+    player = reports[0] if reports else {}
+    call("get_ai_impact", player_id=player_id)
+    call("predict_destination", player_id=player_id)
+    info = ", ".join(str(player.get(k, "")) for k in ("name", "position", "fromTeam", "toTeam"))
+    call("get_player_analysis", player_info=info or f"Player {player_id}")
+
+
+def visit_chat(client, rng, call):
+    call("chat", question=rng.choice(CHAT_QUESTIONS))
+
+
+# ── Runner ───────────────────────────────────────────────────────────────────
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def record(self, walker, seconds, ok):
+        with self._lock:
+            if ok:
+                self.latencies[walker].append(seconds)
+            else:
+                self.errors[walker] += 1
+
+
+def run_user(user_idx, args, mix, recorder, deadline):
+    rng = random.Random(args.seed + user_idx)
+    client = WalkerClient(args.base_url, args.timeout)
+    try:
+        client.authenticate()
+    except requests.RequestException as e:
+        print(f"  [user {user_idx}] login failed: {e}")
+        recorder.record("login", 0.0, False)
+        return
+
+    def call(walker, **fields):
+        start = time.perf_counter()
+        try:
+            body = client.spawn(walker, **fields)
+        except (requests.RequestException, ValueError):
+            recorder.record(walker, time.perf_counter() - start, False)
+            return {}
+        recorder.record(walker, time.perf_counter() - start, True)
+        return body
+
+    pages, weights = zip(*mix.items())
+    player_ids = []
+    while time.monotonic() < deadline:
+        page = rng.choices(pages, weights=weights)[0]
+        if page == "players":
+            player_ids = visit_players(client, rng, call) or player_ids
+        elif page == "detail":
+            visit_detail(client, rng, call, player_ids)
+        elif page == "chat":
+            visit_chat(client, rng, call)
+        if args.think:
+            time.sleep(rng.uniform(0, args.think))
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def summarize(recorder, elapsed):
+    rows = []
+    for walker in sorted(set(recorder.latencies) | set(recorder.errors)):
+        lat = sorted(recorder.latencies.get(walker, []))
+        rows.append({
+            "walker": walker,
+            "ok": len(lat),
+            "errors": recorder.errors.get(walker, 0),
+            "p50_ms": percentile(lat, 50) * 1000,
+            "p95_ms": percentile(lat, 95) * 1000,
+            "p99_ms": percentile(lat, 99) * 1000,
+            "rps": len(lat) / elapsed if elapsed else 0.0,
+        })
+    return rows
+
+
+def print_report(rows, elapsed, users):
+    print(f"\n{'=' * 78}")
+    print(f"{users} users  ·  {elapsed:.1f}s")
+    print(f"{'=' * 78}")
+    print(f"{'walker':<26}{'ok':>7}{'err':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>9}")
+    for r in rows:
+        print(f"{r['walker']:<26}{r['ok']:>7}{r['errors']:>6}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}{r['rps']:>9.2f}")
+    total_ok = sum(r["ok"] for r in rows)
+    total_err = sum(r["errors"] for r in rows)
+    print(f"{'-' * 78}")
+    print(f"{'total':<26}{total_ok:>7}{total_err:>6}{'':>30}{total_ok / elapsed if elapsed else 0:>9.2f}")
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise argparse.ArgumentTypeError(f"Unknown page '{name}' (choose from {', '.join(DEFAULT_MIX)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="PortAI walker load test")
+    p.add_argument("--base-url", default="http://localhost:8000")
+    p.add_argument("--users",    type=int, default=10, help="Concurrent virtual users (default: 10)")
+    p.add_argument("--duration", type=float, default=60.0, help="Seconds to run (default: 60)")
+    p.add_argument("--mix",      type=parse_mix, default=dict(DEFAULT_MIX),
+                   help="Page weights, e.g. players=6,detail=3,chat=1")
+    p.add_argument("--think",    type=float, default=0.0,
+                   help="Max random think time between page visits in seconds (default: 0)")
+    p.add_argument("--timeout",  type=float, default=60.0, help="Per-request timeout (default: 60)")
+    p.add_argument("--seed",     type=int, default=42)
+    p.add_argument("--json",     default=None, help="Also write results to this JSON file")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    print(f"\nLoad testing {args.base_url} with {args.users} user(s) for {args.duration:.0f}s")
+    print(f"  mix={args.mix}  think={args.think}s\n")
+
+    recorder = Recorder()
+    start = time.monotonic()
+    deadline = start + args.duration
+    with ThreadPoolExecutor(max_workers=args.users) as pool:
+        for i in range(args.users):
+            pool.submit(run_user, i, args, args.mix, recorder, deadline)
+    elapsed = time.monotonic() - start
+
+    rows = summarize(recorder, elapsed)
+    print_report(rows, elapsed, args.users)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"users": args.users, "elapsed_s": elapsed, "mix": args.mix,
+                       "walkers": rows}, f, indent=2)
+        print(f"\nResults saved → {args.json}")
+
+
+if __name__ == "__main__":
+    main()
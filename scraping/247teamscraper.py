@@ -3,19 +3,81 @@
 Scrapes the 247Sports transfer portal for every FBS team.
 Outputs one combined CSV with a 'team' column.
 Team names and institution keys are stored in teams.py.
+
+Pages are fetched concurrently by fetch_engine.FetchEngine: a pooled HTTP
+client, at most --concurrency requests in flight and a per-host token bucket
+(--rate requests/second) in place of a fixed sleep, with retries and
+exponential backoff on 429/5xx.
+
+Responses are cached on disk (http_cache.py): past seasons are never
+re-downloaded, and the current season is revalidated with a conditional GET
+once it is older than --current-ttl seconds. Only pages with at least one
+player are cached, so a soft block or an empty page is fetched again next
+run instead of being kept forever.
+
+Progress is checkpointed per (season, team) (checkpoint.py): each team's rows
+are written as soon as it finishes, and a re-run after a crash skips every
+team already done, re-scraping current-season teams after --stale-after hours.
+
+Rows are streamed (row_writers.py): each team is appended to its season CSV
+(and, with --parquet, a Parquet file) as soon as it arrives, and the
+all-seasons file is assembled by concatenating every season file on disk
+(not just this run's --seasons), so memory stays flat however many seasons
+are backfilled.
+
+Pages are parsed with lxml by default (page_parsers.py); --parser bs4 selects
+the original BeautifulSoup parser, which returns the same rows.
+
+Each team-season is recorded in a run log (run_log.py): fetch and parse
+time, bytes, retries and rows, one JSON line per team, with a summary at
+the end (`python run_log.py` reports on the latest run).
+
+Usage:
+    python 247teamscraper.py
+    python 247teamscraper.py --fresh            # ignore checkpoints, start over
+    python 247teamscraper.py --seasons 2026 2025 --concurrency 4 --rate 2
+    python 247teamscraper.py --refresh          # revalidate every cached page
+    python 247teamscraper.py --no-cache
+    python 247teamscraper.py --parquet          # also write .parquet files
+    python 247teamscraper.py --parser bs4       # BeautifulSoup instead of lxml
 """
 
-import requests
-from bs4 import BeautifulSoup
-import csv
+import argparse
+import asyncio
+import glob
+import os
 import time
 
+from checkpoint import Checkpoint
+from fetch_engine import FetchEngine
+from http_cache import HttpCache, season_policy
+from page_parsers import BACKENDS, DEFAULT_BACKEND, parse_team_page
+from row_writers import SCHEMA_247, RowWriter, concat_csv, concat_parquet
+from run_log import RunLog
 from teamkeys import TEAMS, MISSING_KEYS
 
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
 
+SEASONS = list(range(2026, 2017, -1))  # 2026 → 2018
+
+FIELDNAMES = [
+    'season',
+    'team',
+    'institution_key',
+    'name',
+    'position',
+    'height',
+    'weight',
+    'stars',
+    'rating',
+    'status',
+    'from_school',
+    'to_school',
+    'profile_url'
+]
+
 
 SLUG_OVERRIDES = {
     "Connecticut": "transfer-portal",
@@ -30,168 +92,170 @@ SLUG_OVERRIDES = {
 }
 
 
-def scrape_team(team_name, institution_key, season_year):
+def team_url(team_name, institution_key, season_year):
     if team_name in SLUG_OVERRIDES:
         slug = SLUG_OVERRIDES[team_name]
     else:
         slug = team_name.lower().replace(" ", "-").replace("(", "").replace(")", "").replace("&", "").replace(".", "")
-    url = f"https://247sports.com/college/{slug}/season/{season_year}-football/transferportal/?institutionkey={institution_key}"
-
-
-    try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        print(f"  [ERROR] Could not fetch {team_name}: {e}")
-        return []
-
-    soup = BeautifulSoup(response.text, 'lxml')
-    players_li = soup.find_all('li', class_='transfer-player')
-
-    players = []
-    for li in players_li:
-        player = {
-            'team': team_name,
-            'institution_key': institution_key,
-            'season': season_year
-        }
-
-
-        # Name
-        name_elem = li.find('h3')
-        if name_elem:
-            name_link = name_elem.find('a')
-            if name_link:
-                player['name'] = name_link.get_text(strip=True)
-                player['profile_url'] = name_link.get('href', 'N/A')
-            else:
-                player['name'] = name_elem.get_text(strip=True)
-                player['profile_url'] = 'N/A'
-        else:
-            player['name'] = 'N/A'
-            player['profile_url'] = 'N/A'
-
-        # Position
-        pos_elem = li.find('div', class_='position')
-        player['position'] = pos_elem.get_text(strip=True) if pos_elem else 'N/A'
-
-        # Height / Weight
-        bio_elem = li.find('div', class_='bio')
-        if bio_elem:
-            bio_text = bio_elem.get_text(strip=True)
-            parts = bio_text.split('/')
-            if len(parts) >= 2:
-                player['height'] = parts[0].strip().replace('-', "'") + '"'
-                player['weight'] = parts[1].strip() + ' lbs'
-            else:
-                player['height'] = bio_text.strip()
-                player['weight'] = 'N/A'
-        else:
-            player['height'] = 'N/A'
-            player['weight'] = 'N/A'
-
-        # Stars + numeric rating
-        star_container = li.find('div', class_='starContainer')
-        if star_container:
-            filled_stars = star_container.find_all('path', fill='#FBD032')
-            player['stars'] = len(filled_stars)
-            rating_elem = li.find('div', class_='rating')
-            player['rating'] = rating_elem.get_text(strip=True) if rating_elem else 'N/A'
-        else:
-            player['stars'] = 0
-            player['rating'] = 'N/A'
-
-        # Status
-        status_elem = li.find('div', class_='status')
-        player['status'] = status_elem.get_text(strip=True) if status_elem else 'N/A'
-
-        # From / To schools
-        prediction_div = li.find('div', class_='transfer-prediction')
-        if prediction_div:
-            source_img = prediction_div.find('img', class_='source')
-            player['from_school'] = source_img.get('alt', 'N/A') if source_img else 'N/A'
-
-            dest_li = prediction_div.find('li', class_='destination')
-            if dest_li:
-                dest_img = dest_li.find('img')
-                player['to_school'] = dest_img.get('alt', 'N/A') if dest_img else 'N/A'
-            else:
-                player['to_school'] = 'N/A'
-        else:
-            player['from_school'] = 'N/A'
-            player['to_school'] = 'N/A'
-
-        players.append(player)
-
+    return f"https://247sports.com/college/{slug}/season/{season_year}-football/transferportal/?institutionkey={institution_key}"
+
+
+def has_players(html):
+    """Whether a page lists at least one player (what both parsers look for)."""
+    return "transfer-player" in html
+
+
+async def scrape_team(engine, team_name, institution_key, season_year,
+                      parser=DEFAULT_BACKEND, run_log=None):
+    """Parsed players, or None if the page could not be fetched."""
+    unit = (run_log or RunLog("247", path=None)).unit(team_name, season_year)
+    with unit.timing("network"):
+        html = await engine.fetch(team_url(team_name, institution_key, season_year),
+                                  unit=unit, validate=has_players)
+    if html is None:
+        print(f"  [ERROR] Could not fetch {team_name}")
+        unit.finish(error="fetch failed")
+        return None
+    with unit.timing("parse"):
+        players = parse_team_page(html, team_name, institution_key, season_year,
+                                  backend=parser)
+    unit.finish(rows=len(players), rounds=1)
     return players
 
 
-def main():
+async def scrape_season(engine, season_year, checkpoint, writer, parser=DEFAULT_BACKEND,
+                        run_log=None):
+    """Stream the season's rows into writer; returns the number of teams done.
+
+    Rows are written in TEAMS order whatever order pages finish in, so the
+    season CSV is the same from run to run (main.jac numbers players by row):
+    each team is written once every team before it is written or has failed.
+    Checkpointed teams are read back from their part files when their turn
+    comes. Each team fetched is recorded in run_log (run_log.py), if given.
+    """
+    order = list(TEAMS)
+    todo = {name: TEAMS[name] for name in order if not checkpoint.is_done(season_year, name)}
+    print(f"{len(TEAMS) - len(todo)}/{len(TEAMS)} teams already checkpointed")
+    finished = {}  # scraped team → its rows (None if it failed), until written
+    written = 0
+    done = 0
+
+    def flush():
+        nonlocal written
+        while written < len(order):
+            name = order[written]
+            if name not in todo:
+                writer.write(checkpoint.load_rows(season_year, name))
+            elif name in finished:
+                writer.write(finished.pop(name) or [])
+            else:
+                return
+            written += 1
+
+    async def one(team_name, inst_key):
+        nonlocal done
+        players = await scrape_team(engine, team_name, inst_key, season_year, parser, run_log)
+        done += 1
+        if players is None:
+            checkpoint.fail(season_year, team_name, "fetch failed")
+            print(f"[{done}/{len(todo)}] {team_name}: failed (retried next run)")
+        else:
+            checkpoint.save(season_year, team_name, players)
+            print(f"[{done}/{len(todo)}] {team_name}: {len(players)} players")
+        finished[team_name] = players
+        flush()
+
+    flush()
+    await asyncio.gather(*(one(name, key) for name, key in todo.items()))
+    return sum(checkpoint.is_done(season_year, name) for name in order)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="247Sports transfer portal scraper — all FBS teams")
+    p.add_argument("--seasons", type=int, nargs="+", default=SEASONS,
+                   help="Seasons to scrape (default: 2026 → 2018)")
+    p.add_argument("--concurrency", type=int, default=8,
+                   help="Requests in flight at once (default: 8)")
+    p.add_argument("--rate", type=float, default=2.0,
+                   help="Requests per second to 247sports.com (default: 2)")
+    p.add_argument("--retries", type=int, default=4,
+                   help="Retries on 429/5xx/connection errors (default: 4)")
+    p.add_argument("--current-ttl", type=int, default=3600,
+                   help="Seconds a cached current-season page stays fresh (default: 3600)")
+    p.add_argument("--refresh", action="store_true",
+                   help="Revalidate every cached page, past seasons included")
+    p.add_argument("--no-cache", action="store_true", help="Always download")
+    p.add_argument("--stale-after", type=float, default=6,
+                   help="Hours before a current-season team is re-scraped (default: 6)")
+    p.add_argument("--fresh", action="store_true",
+                   help="Ignore checkpoints and scrape every team again")
+    p.add_argument("--parquet", action="store_true",
+                   help="Also write each CSV as Parquet (zstd, typed schema)")
+    p.add_argument("--parser", choices=BACKENDS, default=DEFAULT_BACKEND,
+                   help=f"HTML parser backend (default: {DEFAULT_BACKEND})")
+    return p.parse_args()
+
+
+async def main():
+    args = parse_args()
     print("=" * 70)
     print("247SPORTS ALL-TEAM TRANSFER PORTAL SCRAPER")
     print("=" * 70)
-
-    seasons = list(range(2026, 2017, -1))  # 2026 → 2018
-    master_players = []
-
-    fieldnames = [
-        'season',
-        'team',
-        'institution_key',
-        'name',
-        'position',
-        'height',
-        'weight',
-        'stars',
-        'rating',
-        'status',
-        'from_school',
-        'to_school',
-        'profile_url'
-    ]
-
-    for season_year in seasons:
-        print(f"\n{'=' * 60}")
-        print(f"SCRAPING SEASON {season_year}")
-        print(f"{'=' * 60}")
-
-        season_players = []
-        total_teams = len(TEAMS)
-
-        for i, (team_name, inst_key) in enumerate(TEAMS.items(), 1):
-            print(f"[{i}/{total_teams}] {team_name}")
-
-            players = scrape_team(team_name, inst_key, season_year)
-            print(f"  Found {len(players)} players")
-
-            season_players.extend(players)
-            time.sleep(1.0)
-
-        print(f"\nSeason {season_year} total players: {len(season_players)}")
-
-        # ✅ Save individual season CSV
-        season_filename = f"transfer_portal_{season_year}.csv"
-        with open(season_filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-            writer.writeheader()
-            writer.writerows(season_players)
-
-        print(f"✓ Saved {season_filename}")
-
-        master_players.extend(season_players)
-
+    print(f"concurrency={args.concurrency}  rate={args.rate}/s  retries={args.retries}  "
+          f"parser={args.parser}")
+
+    total_players = 0
+    start = time.perf_counter()
+    cache = None if args.no_cache else HttpCache(
+        policy=season_policy(current_ttl=args.current_ttl), refresh=args.refresh
+    )
+    checkpoint = Checkpoint("247", FIELDNAMES, stale_after=args.stale_after * 3600,
+                            fresh=args.fresh)
+    run_log = RunLog("247", args=vars(args))
+
+    async with FetchEngine(concurrency=args.concurrency, rate=args.rate,
+                           retries=args.retries, headers=HEADERS, cache=cache) as engine:
+        for season_year in args.seasons:
+            print(f"\n{'=' * 60}")
+            print(f"SCRAPING SEASON {season_year}")
+            print(f"{'=' * 60}")
+
+            # ✅ Stream the individual season CSV as teams finish
+            season_filename = f"transfer_portal_{season_year}.csv"
+            parquet_filename = season_filename[:-4] + ".parquet" if args.parquet else None
+            with RowWriter(season_filename, FIELDNAMES, parquet=parquet_filename,
+                           schema=SCHEMA_247) as writer:
+                await scrape_season(engine, season_year, checkpoint, writer, args.parser,
+                                    run_log)
+            print(f"\nSeason {season_year} total players: {writer.rows}")
+            print(f"✓ Saved {season_filename}")
+
+            total_players += writer.rows
+
+    # Every season on disk, newest first, so a --seasons 2026 run keeps the
+    # backfilled seasons in the all-seasons file.
+    season_files = sorted(glob.glob("transfer_portal_[0-9][0-9][0-9][0-9].csv"), reverse=True)
     master_filename = "transfer_portal_247_all_seasons.csv"
-
-    with open(master_filename, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
-        writer.writeheader()
-        writer.writerows(master_players)
+    concat_csv(season_files, master_filename)
+    if args.parquet:
+        parquet_files = [f[:-4] + ".parquet" for f in season_files]
+        missing = [f for f in parquet_files if not os.path.exists(f)]
+        if missing:
+            print(f"⚠️  Not rebuilding {master_filename[:-4]}.parquet: no {', '.join(missing)} "
+                  f"(re-run those seasons with --parquet)")
+        else:
+            concat_parquet(parquet_files, master_filename[:-4] + ".parquet", SCHEMA_247)
 
     print(f"\n{'=' * 70}")
-    print(f"ALL DONE — Total players across all seasons: {len(master_players)}")
-    print(f"✓ Saved {master_filename}")
+    print(f"ALL DONE — Total players this run: {total_players}")
+    print(f"Fetched in {time.perf_counter() - start:.1f}s ({engine.stats})")
+    if cache:
+        print(f"Cache: {cache.stats}")
+    print(f"✓ Saved {master_filename} ({len(season_files)} seasons)")
+    run_log.close()
+    print(run_log.report())
     print(f"{'=' * 70}")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
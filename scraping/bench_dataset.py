@@ -0,0 +1,151 @@
+"""
+Load time and memory: scraped CSVs vs the Parquet dataset
+=========================================================
+Each case runs in a fresh Python process so peak RSS is its own; the number
+reported is peak RSS above the process's RSS right after its imports.
+
+    app       the server's 2026 transfers, as main.jac asks for them on each
+              request: its CSV reader parses the file every time, while
+              dataset.load_app_transfers decodes one row group once and
+              then hands out copies ("first" is the cold load)
+    training  every 247 + On3 season as a cleaned DataFrame (parse + clean
+              vs one memory-mapped Parquet read)
+    espn      every ESPN stats file as DataFrames
+
+Run `python dataset.py` first.
+
+Usage:
+    python bench_dataset.py
+    python bench_dataset.py --repeat 10
+"""
+
+import argparse
+import csv
+import glob
+import json
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+import dataset
+
+CASES = {
+    "app": ("app_csv", "app_parquet"),
+    "training": ("training_csv", "training_parquet"),
+    "espn": ("espn_csv", "espn_parquet"),
+}
+
+
+def app_csv():
+    """main.jac's read_all_transfers_raw, line for line."""
+    transfers = []
+    path = dataset.DATA_DIR / "transfer_247_data" / "transfer_portal_247_2026.csv"
+    with open(path, encoding="utf-8") as f:
+        for row_id, row in enumerate(csv.DictReader(f), start=1):
+            stars_str = row.get("stars", "0").strip()
+            raw_rating = row.get("rating", "").strip()
+            rating = None
+            if raw_rating and "N/A" not in raw_rating and raw_rating.replace(".", "", 1).isdigit():
+                rating = float(raw_rating)
+            weight_str = row.get("weight", "0").replace(" lbs", "").replace("lbs", "").strip()
+            status = row.get("status", "N/A")
+            to_school = row.get("to_school", "N/A")
+            to_school = "Undecided" if to_school == "N/A" or not to_school else to_school
+            transfers.append({
+                "id": str(row_id), "playerId": str(row_id),
+                "playerName": row.get("name", "Unknown"), "playerPhoto": "👤",
+                "position": row.get("position", "N/A"),
+                "fromTeam": row.get("from_school", "Unknown"), "fromTeamLogo": "🏈",
+                "toTeam": to_school, "toTeamLogo": "🏈" if to_school != "Undecided" else "❓",
+                "starRating": int(stars_str) if stars_str.isdigit() else 0,
+                "rating": rating, "height": row.get("height", "N/A"),
+                "weight": int(weight_str) if weight_str.isdigit() else 0,
+                "status": "In Portal" if status == "N/A" else status,
+                "stats": {}, "date": "2026", "sport": "Football",
+                "profileUrl": row.get("profile_url", ""),
+            })
+    return transfers
+
+
+def app_parquet():
+    return dataset.load_app_transfers(2026, dedupe=False)
+
+
+def training_csv():
+    import pandas as pd
+    files = dataset.source_files()
+    return dataset.clean(pd.concat([dataset.read_source_file(s, p) for s, p in files],
+                                   ignore_index=True))
+
+
+def training_parquet():
+    return dataset.read_table(dataset.TRANSFERS_FILE).to_pandas()
+
+
+def espn_csv():
+    import pandas as pd
+    return [pd.read_csv(p) for p in sorted(glob.glob(str(dataset.DATA_DIR / dataset.ESPN_SOURCES)))]
+
+
+def espn_parquet():
+    return [dataset.load_espn(c) for c in dataset.espn_files()]
+
+
+def rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / scale
+
+
+def run_case(name, repeat):
+    """Child process: time `repeat` loads, report peak RSS growth of the first."""
+    import pandas  # noqa: F401  (imported by both sides; keep it out of the delta)
+    fn = globals()[name]
+    base = rss_mb()
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    frames = result if isinstance(result, list) and not isinstance(result[0], dict) else [result]
+    rows = sum(len(r) for r in frames)
+    print(json.dumps({"first_s": times[0], "median_s": statistics.median(times),
+                      "peak_mb": rss_mb() - base, "rows": rows}))
+
+
+def measure(name, repeat):
+    out = subprocess.run([sys.executable, __file__, "--case", name, "--repeat", str(repeat)],
+                         capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Compare CSV and Parquet dataset loads")
+    p.add_argument("--repeat", type=int, default=5, help="Loads per case (default: 5)")
+    p.add_argument("--case", help=argparse.SUPPRESS)
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.case:
+        run_case(args.case, args.repeat)
+        return
+    if not dataset.has_dataset():
+        sys.exit("Build the dataset first: python dataset.py")
+
+    print(f"{'case':<10}{'format':<9}{'rows':>8}{'first ms':>10}{'median ms':>11}{'peak MB':>9}")
+    for label, (csv_case, parquet_case) in CASES.items():
+        results = {}
+        for fmt, case in (("csv", csv_case), ("parquet", parquet_case)):
+            r = results[fmt] = measure(case, args.repeat)
+            print(f"{label:<10}{fmt:<9}{r['rows']:>8}{r['first_s'] * 1000:>10.1f}"
+                  f"{r['median_s'] * 1000:>11.1f}{r['peak_mb']:>9.1f}")
+        speedup = results["csv"]["median_s"] / results["parquet"]["median_s"]
+        print(f"{'':<19}parquet is {speedup:.1f}× faster\n")
+
+
+if __name__ == "__main__":
+    main()
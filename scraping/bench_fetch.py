@@ -0,0 +1,146 @@
+"""
+Fetch engine benchmark against a local stub server
+===================================================
+Serves synthetic 247 transfer-portal pages from a local threaded HTTP server
+(fixed latency per response, and a 429 every --throttle-every requests), then
+fetches and parses one season's worth of team pages:
+
+    serial      requests.get in a loop, as 247teamscraper.py used to do
+                (the old fixed 1 s sleep per team is added on paper)
+    engine N    FetchEngine with concurrency N
+
+Usage:
+    python bench_fetch.py
+    python bench_fetch.py --pages 138 --latency 0.3 --concurrency 1 4 16 64
+    python bench_fetch.py --rate 10          # show the per-host limiter at work
+"""
+
+import argparse
+import asyncio
+import importlib
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from fetch_engine import FetchEngine
+
+scraper = importlib.import_module("247teamscraper")
+
+PLAYER = """
+<li class="transfer-player">
+  <h3><a href="https://247sports.com/player/stub-player-{i}/">Stub Player {i}</a></h3>
+  <div class="position">WR</div>
+  <div class="bio">6-2 / 195</div>
+  <div class="starContainer"><svg><path fill="#FBD032"/><path fill="#FBD032"/>
+    <path fill="#FBD032"/><path fill="#C4C4C4"/></svg></div>
+  <div class="rating">0.8{r}</div>
+  <div class="status">Committed</div>
+  <div class="transfer-prediction"><img class="source" alt="Old State">
+    <ul><li class="destination"><img alt="New State"></li></ul></div>
+</li>"""
+
+
+def stub_page(players=40):
+    items = "".join(PLAYER.format(i=i, r=i % 10) for i in range(players))
+    return f"<html><body><ul>{items}</ul></body></html>".encode()
+
+
+def start_stub_server(latency, throttle_every, players):
+    page = stub_page(players)
+    counter = {"n": 0}
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with lock:
+                counter["n"] += 1
+                throttled = throttle_every and counter["n"] % throttle_every == 0
+            time.sleep(latency)
+            if throttled:
+                self.send_response(429)
+                self.send_header("Retry-After", "0")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page)))
+            self.end_headers()
+            self.wfile.write(page)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def urls(base, pages):
+    return [f"{base}/college/team-{i}/season/2026-football/transferportal/" for i in range(pages)]
+
+
+def run_serial(targets):
+    rows = 0
+    start = time.perf_counter()
+    for url in targets:
+        for _ in range(5):  # retry 429s, like the engine does
+            response = requests.get(url, timeout=15)
+            if response.status_code != 429:
+                break
+        rows += len(scraper.parse_team_page(response.text, "Stub", 0, 2026))
+    return time.perf_counter() - start, rows
+
+
+async def run_engine(targets, concurrency, rate):
+    async def one(engine, url):
+        html = await engine.fetch(url)
+        return len(scraper.parse_team_page(html, "Stub", 0, 2026)) if html else 0
+
+    start = time.perf_counter()
+    async with FetchEngine(concurrency=concurrency, rate=rate, backoff=0.05) as engine:
+        counts = await asyncio.gather(*(one(engine, u) for u in targets))
+    return time.perf_counter() - start, sum(counts), engine.stats
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark FetchEngine against a local stub server")
+    p.add_argument("--pages", type=int, default=138, help="Team pages per run (default: 138)")
+    p.add_argument("--latency", type=float, default=0.2,
+                   help="Stub server seconds per response (default: 0.2)")
+    p.add_argument("--players", type=int, default=40, help="Players per page (default: 40)")
+    p.add_argument("--throttle-every", type=int, default=25,
+                   help="Answer every Nth request with 429 (0 = never, default: 25)")
+    p.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    p.add_argument("--rate", type=float, default=1e6,
+                   help="Per-host requests/second for the engine (default: unlimited)")
+    p.add_argument("--skip-serial", action="store_true")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    server = start_stub_server(args.latency, args.throttle_every, args.players)
+    targets = urls(f"http://127.0.0.1:{server.server_port}", args.pages)
+    print(f"{args.pages} pages × {args.players} players, {args.latency * 1000:.0f} ms latency, "
+          f"429 every {args.throttle_every or '∞'} requests\n")
+    print(f"{'mode':<22}{'wall s':>9}{'pages/s':>9}{'rows':>8}  notes")
+
+    if not args.skip_serial:
+        wall, rows = run_serial(targets)
+        print(f"{'serial':<22}{wall:>9.2f}{args.pages / wall:>9.1f}{rows:>8}  "
+              f"+ old 1 s sleep per team ≈ {wall + args.pages:.0f}s")
+
+    for n in args.concurrency:
+        wall, rows, stats = asyncio.run(run_engine(targets, n, args.rate))
+        label = f"engine c={n}" + (f" rate={args.rate:g}" if args.rate < 1e6 else "")
+        print(f"{label:<22}{wall:>9.2f}{args.pages / wall:>9.1f}{rows:>8}  {stats}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
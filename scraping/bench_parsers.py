@@ -0,0 +1,196 @@
+"""
+Offline parser benchmark and golden-output check
+================================================
+Runs each page parser (page_parsers.py) over the saved pages in fixtures/,
+times it per page and per row, and compares its records with the golden CSV
+next to the page. No browser or network access is needed, so parser
+speedups and markup changes can be checked on any machine. Sources with more
+than one backend (247 and On3: lxml and bs4) run every backend against the
+same golden file, and each row after bs4 shows its speedup over it.
+
+    fixtures/manifest.json              page → parser and its arguments
+    fixtures/<source>/<page>.html.gz    saved page
+    fixtures/<source>/<page>.golden.csv expected records
+
+The committed pages are rebuilt from scraped rows in each site's markup
+(including pages of edge cases); real pages can be added from the HTTP
+cache with --capture. After an intended change to a parser's output, rewrite
+the golden files with --update-golden and review the diff.
+
+Usage:
+    python bench_parsers.py
+    python bench_parsers.py --only espn --repeat 3
+    python bench_parsers.py --backend lxml
+    python bench_parsers.py --update-golden
+    python bench_parsers.py --capture 247 alabama_2025 "<url>" \\
+        --meta team=Alabama institution_key=24096 season=2025
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from page_parsers import BACKENDS, parse_entries, parse_stats_table, parse_team_page
+
+FIXTURE_DIR = Path(__file__).resolve().parent / "fixtures"
+MANIFEST = FIXTURE_DIR / "manifest.json"
+
+# source → {backend: parse(html, manifest entry)}
+PARSERS = {
+    "247": {b: (lambda html, m, b=b: parse_team_page(
+                html, m["team"], m["institution_key"], m["season"], backend=b))
+            for b in BACKENDS},
+    "on3": {b: (lambda html, m, b=b: parse_entries(html, m["team"], backend=b))
+            for b in BACKENDS},
+    "espn": {"lxml": lambda html, m: parse_stats_table(html)},
+}
+
+
+def load_manifest():
+    with open(MANIFEST, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_page(name):
+    with gzip.open(FIXTURE_DIR / name, "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def golden_path(name):
+    return FIXTURE_DIR / name.replace(".html.gz", ".golden.csv")
+
+
+def to_records(output):
+    """Parser output as a list of {column: str} — what the scrapers write."""
+    if output is None:
+        return []
+    if isinstance(output, list):
+        return [{k: str(v) for k, v in row.items()} for row in output]
+    # DataFrame (ESPN): the same post-processing and CSV write as espnstats.scrape_all
+    output.columns = [str(c).strip() for c in output.columns]
+    buffer = io.StringIO()
+    output[(output.notna() & (output != "")).any(axis=1)].to_csv(buffer, index=False)
+    buffer.seek(0)
+    return list(csv.DictReader(buffer))
+
+
+def write_golden(name, records):
+    fieldnames = list(records[0]) if records else []
+    with open(golden_path(name), "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(records)
+
+
+def read_golden(name):
+    with open(golden_path(name), newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+
+def first_difference(expected, actual):
+    if len(expected) != len(actual):
+        return f"{len(actual)} rows, golden has {len(expected)}"
+    for i, (want, got) in enumerate(zip(expected, actual)):
+        if want != got:
+            keys = sorted(set(want) | set(got), key=lambda k: (k not in want, k))
+            diffs = [f"{k}: {want.get(k)!r} → {got.get(k)!r}" for k in keys
+                     if want.get(k) != got.get(k)]
+            return f"row {i}: " + "; ".join(diffs[:3])
+    return None
+
+
+def bench(name, meta, repeat, backend=None):
+    html = read_page(name)
+    backends = PARSERS[meta["parser"]]
+    parse = backends[backend] if backend else next(iter(backends.values()))
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = parse(html, meta)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), to_records(output), len(html)
+
+
+def capture(source, page, url, meta_pairs):
+    """Copy a page from the HTTP cache (http_cache.py) into fixtures/."""
+    from http_cache import HttpCache
+
+    cache = HttpCache()
+    entry = cache.get(url)
+    if entry is None:
+        sys.exit(f"{url} is not in the HTTP cache; scrape it first")
+    name = f"{source}/{page}.html.gz"
+    (FIXTURE_DIR / source).mkdir(parents=True, exist_ok=True)
+    with gzip.open(FIXTURE_DIR / name, "wt", encoding="utf-8") as f:
+        f.write(cache.body(entry))
+    meta = {"parser": source}
+    for pair in meta_pairs:
+        key, value = pair.split("=", 1)
+        meta[key] = int(value) if value.isdigit() else value
+    manifest = load_manifest()
+    manifest[name] = meta
+    MANIFEST.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    _, records, _ = bench(name, meta, 1)
+    write_golden(name, records)
+    print(f"✓ Saved {name} ({len(records)} records) — check the golden CSV by hand")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Benchmark page parsers on saved fixtures")
+    p.add_argument("--only", choices=sorted(PARSERS), help="Run one source's fixtures")
+    p.add_argument("--repeat", type=int, default=5, help="Parses per page (default: 5)")
+    p.add_argument("--backend", choices=BACKENDS,
+                   help="Run one parser backend (default: every backend a source has)")
+    p.add_argument("--update-golden", action="store_true",
+                   help="Rewrite the golden CSVs from the current parsers")
+    p.add_argument("--capture", nargs=3, metavar=("SOURCE", "PAGE", "URL"),
+                   help="Add a cached page as a fixture")
+    p.add_argument("--meta", nargs="*", default=[], help="Parser arguments for --capture")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.capture:
+        capture(*args.capture, args.meta)
+        return
+
+    failures = 0
+    print(f"{'fixture':<34}{'backend':<8}{'KB':>7}{'rows':>7}{'ms/page':>10}{'µs/row':>9}"
+          f"{'vs bs4':>8}  golden")
+    for name, meta in load_manifest().items():
+        if args.only and meta["parser"] != args.only:
+            continue
+        # bs4 (the original backend) first, so the others can be compared with it
+        backends = sorted((b for b in PARSERS[meta["parser"]] if args.backend in (None, b)),
+                          key=lambda b: b != "bs4")
+        baseline = None
+        for i, backend in enumerate(backends):
+            seconds, records, size = bench(name, meta, args.repeat, backend)
+            if backend == "bs4":
+                baseline = seconds
+            if args.update_golden:
+                # every backend is checked against the same golden file
+                if i == 0:
+                    write_golden(name, records)
+                status = "updated" if i == 0 else "—"
+            else:
+                problem = first_difference(read_golden(name), records)
+                status = f"✗ {problem}" if problem else "✓"
+                failures += bool(problem)
+            per_row = seconds / len(records) * 1e6 if records else 0
+            speedup = f"{baseline / seconds:.1f}×" if baseline and backend != "bs4" else ""
+            print(f"{name:<34}{backend:<8}{size / 1024:>7.0f}{len(records):>7}"
+                  f"{seconds * 1000:>10.1f}{per_row:>9.1f}{speedup:>8}  {status}")
+    if failures:
+        sys.exit(f"\n{failures} fixture(s) differ from their golden output")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Resumable scraping checkpoints
+==============================
+Each scraper records progress per (scope, team), where scope is a season
+(247) or a year/status filter (On3). As soon as a team finishes, its rows go
+to a part file and a line is appended to the manifest, so a crash costs at
+most the teams in flight. The next run skips every unit that is done and
+not stale:
+
+    .cache/checkpoints/<source>/manifest.jsonl      one JSON line per unit update
+    .cache/checkpoints/<source>/<scope>/<team>.csv  that unit's rows
+
+Scopes for seasons before CURRENT_SEASON never go stale; the current season
+(or a scope with no year) is re-scraped once its checkpoint is older than
+stale_after seconds.
+
+Usage:
+    checkpoint = Checkpoint("247", FIELDNAMES)
+    if not checkpoint.is_done(2025, "Alabama"):
+        checkpoint.save(2025, "Alabama", rows)
+    rows = checkpoint.load_rows(2025, "Alabama")
+"""
+
+import csv
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+CHECKPOINT_DIR = Path(__file__).resolve().parent / ".cache" / "checkpoints"
+CURRENT_SEASON = 2026
+
+
+def _safe(name):
+    return re.sub(r"[^a-z0-9]+", "_", str(name).lower()).strip("_") or "all"
+
+
+class Checkpoint:
+    def __init__(self, source, fieldnames, root=CHECKPOINT_DIR, stale_after=6 * 3600,
+                 fresh=False):
+        self.dir = Path(root) / source
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.fieldnames = fieldnames
+        self.stale_after = stale_after
+        self.manifest_path = self.dir / "manifest.jsonl"
+        self.units = {}
+        if fresh:
+            self.manifest_path.unlink(missing_ok=True)
+        else:
+            self._load()
+
+    def _load(self):
+        if not self.manifest_path.exists():
+            return
+        with open(self.manifest_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue  # a torn last line from a crash
+                self.units[(str(record["scope"]), record["team"])] = record
+
+    def _append(self, record):
+        self.units[(str(record["scope"]), record["team"])] = record
+        with open(self.manifest_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def part_path(self, scope, team):
+        return self.dir / _safe(scope) / f"{_safe(team)}.csv"
+
+    def is_stale(self, scope, record):
+        year = re.match(r"(20\d{2})", str(scope))
+        if year and int(year.group(1)) < CURRENT_SEASON:
+            return False
+        return time.time() - record["finished_at"] > self.stale_after
+
+    def is_done(self, scope, team):
+        record = self.units.get((str(scope), team))
+        return (
+            record is not None
+            and record["status"] == "done"
+            and self.part_path(scope, team).exists()
+            and not self.is_stale(scope, record)
+        )
+
+    def save(self, scope, team, rows):
+        """Write the unit's rows, then mark it done."""
+        path = self.part_path(scope, team)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=self.fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp, path)
+        self._append({"scope": str(scope), "team": team, "status": "done",
+                      "rows": len(rows), "finished_at": time.time()})
+
+    def fail(self, scope, team, error):
+        self._append({"scope": str(scope), "team": team, "status": "failed",
+                      "error": str(error), "finished_at": time.time()})
+
+    def load_rows(self, scope, team):
+        with open(self.part_path(scope, team), newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    def summary(self, scope, teams):
+        done = sum(self.is_done(scope, t) for t in teams)
+        return f"{done}/{len(teams)} teams already done"
@@ -0,0 +1,458 @@
+"""
+Canonical typed dataset
+=======================
+The scraped CSVs are text, and every consumer used to re-parse and re-clean
+them on its own. This conversion stage cleans the 247, On3 and ESPN data
+once and writes typed, zstd-compressed Parquet under dataset/:
+
+    transfers.parquet        247 + On3, every season, one row per scraped row
+                             (247 lists a transfer under both teams; kept)
+    espn_<category>.parquet  ESPN player stats per category, all seasons
+    manifest.json            source hash and row count per file
+
+Cleaning (shared with the model through training_data.py):
+
+    height  6'2"         → 74 (inches)
+    weight  225 lbs      → 225
+    rating  ( N/A )      → null; On3's 0-100 scale is divided by 100 to match 247
+    teams   "Avatar"     → null (On3 placeholder logo with no school)
+            "USC Trojans" → "USC" (On3 full names → 247 short names)
+    ESPN    "('Tackles', 'SOLO')" headers → tackles_solo; numeric columns typed
+
+Readers use memory-mapped Parquet reads with column projection and row
+filters, so the server only decodes the season it shows.
+
+Usage:
+    python dataset.py                 # rebuild anything whose source CSVs changed
+    python dataset.py --rebuild       # rebuild everything
+
+    from dataset import load_transfers, load_app_transfers
+    data = load_transfers()                         # pandas, all rows
+    rows = load_app_transfers(season=2026)          # app dicts, cached
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DATA_DIR = Path(__file__).resolve().parent
+DATASET_DIR = "dataset"
+MANIFEST = "manifest.json"
+TRANSFERS_FILE = "transfers.parquet"
+CURRENT_SEASON = 2026
+RELOAD_INTERVAL_S = 30  # same as model_service
+
+SOURCES = {
+    "247": "transfer_247_data/transfer_portal_247_20*.csv",
+    "on3": "transfer_on3_data/transfer_portal_on3_20*.csv",
+}
+ESPN_SOURCES = "espn_cfb_stats/espn_*_20*.csv"
+
+# Bump when the cleaning rules change so old builds are not reused.
+CLEANING_VERSION = 2
+
+COLUMNS = [
+    "source", "season", "team", "name", "position", "year_class", "height",
+    "weight", "stars", "rating", "status", "from_school", "to_school",
+    "profile_url",
+]
+
+TRANSFER_SCHEMA = pa.schema([
+    ("source", pa.string()),
+    ("season", pa.int16()),
+    ("team", pa.string()),
+    ("name", pa.string()),
+    ("position", pa.string()),
+    ("year_class", pa.string()),
+    ("height", pa.int8()),
+    ("weight", pa.int16()),
+    ("stars", pa.int8()),
+    ("rating", pa.float64()),
+    ("status", pa.string()),
+    ("from_school", pa.string()),
+    ("to_school", pa.string()),
+    ("profile_url", pa.string()),
+])
+
+ON3_RENAME = {
+    "School": "team",
+    "Name": "name",
+    "Position": "position",
+    "Year/Class": "year_class",
+    "Status": "status",
+    "From Team": "from_school",
+    "To Team": "to_school",
+    "Rating": "rating",
+    "Profile URL": "profile_url",
+}
+
+MISSING = ["N/A", "( N/A )", "", "None", "Avatar", "Default Avatar"]
+
+
+def dataset_path(name, data_dir=DATA_DIR):
+    return Path(data_dir) / DATASET_DIR / name
+
+
+# ── Loading (runs in worker processes) ───────────────────────────────────────
+
+def _season_from_path(path):
+    match = re.search(r"(20\d{2})\.csv$", path)
+    return int(match.group(1)) if match else None
+
+
+def read_source_file(source, path):
+    """Read one season file and map it onto COLUMNS (no cleaning yet)."""
+    import pandas as pd
+
+    df = pd.read_csv(path, dtype=str, keep_default_na=False)
+    if source == "on3":
+        df = df.rename(columns=ON3_RENAME)
+        df["season"] = _season_from_path(path)
+    df["source"] = source
+    return df.reindex(columns=COLUMNS)
+
+
+# ── Cleaning (one vectorised pass over all seasons) ──────────────────────────
+
+def _short_school_names(names):
+    """Map On3 full names ("Texas A&M Aggies") to 247 short names ("Texas A&M")."""
+    from teamkeys import TEAMS
+
+    shorts = sorted(TEAMS, key=len, reverse=True)
+    mapping = {}
+    for full in names:
+        mapping[full] = next(
+            (s for s in shorts if full == s or full.startswith(s + " ")), full
+        )
+    return mapping
+
+
+def clean(data):
+    import pandas as pd
+
+    data = data.replace(MISSING, pd.NA)
+    for col in ("team", "from_school", "to_school"):
+        data[col] = data[col].str.replace(r"\s+Avatar$", "", regex=True).str.strip()
+
+    height = data["height"].str.extract(r"(\d+)['-](\d+)").astype(float)
+    data["height"] = height[0] * 12 + height[1]
+    data["weight"] = pd.to_numeric(
+        data["weight"].str.replace("lbs", "", regex=False).str.strip(), errors="coerce"
+    )
+    data["stars"] = pd.to_numeric(data["stars"], errors="coerce")
+    data["season"] = pd.to_numeric(data["season"], errors="coerce").astype("Int64")
+
+    rating = pd.to_numeric(data["rating"], errors="coerce")
+    data["rating"] = rating.where(data["source"] != "on3", rating / 100)
+
+    on3 = data["source"] == "on3"
+    for col in ("team", "from_school", "to_school"):
+        names = data.loc[on3, col].dropna().unique()
+        data.loc[on3, col] = data.loc[on3, col].map(_short_school_names(names))
+    return data.reset_index(drop=True)
+
+
+def clean_espn(df, season):
+    """Flatten ESPN's two-level headers to snake_case and type numeric columns.
+
+    Headers are "Group/STAT" (page_parsers.STAT_HEADER_SEP) or, in files
+    scraped before that, pandas' "('Group', 'STAT')" tuple strings; both
+    give group_stat.
+    """
+    import pandas as pd
+
+    def column(name):
+        parts = re.findall(r"'([^']*)'", name) or [name]
+        parts = [p for p in parts if not p.startswith("Unnamed")]
+        label = "_".join(parts).replace("%", "_pct")
+        return re.sub(r"[^a-z0-9]+", "_", label.lower()).strip("_")
+
+    df = df.rename(columns=column)
+    for col in df.columns:
+        if col in ("name", "team", "pos"):
+            continue
+        values = pd.to_numeric(df[col].str.replace(",", "", regex=False), errors="coerce")
+        if values.notna().sum() == df[col].replace("", pd.NA).notna().sum():
+            df[col] = values  # every value parsed; "0-0" style columns stay text
+    df.insert(0, "season", season)
+    return df
+
+
+# ── Build ────────────────────────────────────────────────────────────────────
+
+def source_files(sources=SOURCES, data_dir=DATA_DIR):
+    return [
+        (source, path)
+        for source, pattern in sources.items()
+        for path in sorted(glob.glob(str(Path(data_dir) / pattern)))
+    ]
+
+
+def espn_files(data_dir=DATA_DIR):
+    """{category: [csv paths]} for every scraped ESPN category."""
+    files = {}
+    for path in sorted(glob.glob(str(Path(data_dir) / ESPN_SOURCES))):
+        category = re.match(r"espn_(\w+?)_20\d{2}\.csv$", os.path.basename(path)).group(1)
+        files.setdefault(category, []).append(path)
+    return files
+
+
+def cache_key(files):
+    h = hashlib.sha256(f"v{CLEANING_VERSION}".encode())
+    for source, path in files:
+        h.update(f"{source}:{os.path.basename(path)}".encode())
+        with open(path, "rb") as f:
+            h.update(hashlib.sha256(f.read()).digest())
+    return h.hexdigest()[:16]
+
+
+def read_manifest(data_dir=DATA_DIR):
+    try:
+        with open(dataset_path(MANIFEST, data_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {"files": {}}
+
+
+def _write_parquet(table, path, group_by=None):
+    """Write table; with group_by, one row group per run of equal values so
+    filtered reads skip the other groups by their statistics."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with pq.ParquetWriter(tmp, table.schema, compression="zstd") as writer:
+        if group_by is None:
+            writer.write_table(table)
+        else:
+            keys = list(zip(*(table.column(c).to_pylist() for c in group_by)))
+            start = 0
+            for i in range(1, len(keys) + 1):
+                if i == len(keys) or keys[i] != keys[start]:
+                    writer.write_table(table.slice(start, i - start))
+                    start = i
+    os.replace(tmp, path)
+
+
+def _record(manifest, name, key, rows, data_dir):
+    manifest["files"][name] = {"key": key, "rows": rows}
+    manifest["built"] = datetime.now().isoformat(timespec="seconds")
+    path = dataset_path(MANIFEST, data_dir)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def build_transfers(data_dir=DATA_DIR, workers=None):
+    import pandas as pd
+
+    files = source_files(data_dir=data_dir)
+    if not files:
+        raise FileNotFoundError(f"No source CSVs found under {data_dir}")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        frames = list(pool.map(read_source_file, *zip(*files)))
+    data = clean(pd.concat(frames, ignore_index=True))
+    table = pa.Table.from_pandas(data, schema=TRANSFER_SCHEMA, preserve_index=False)
+    _write_parquet(table, dataset_path(TRANSFERS_FILE, data_dir), group_by=["source", "season"])
+    return cache_key(files), table.num_rows
+
+
+def build_espn(category, paths, data_dir=DATA_DIR):
+    import pandas as pd
+
+    frames = [
+        clean_espn(pd.read_csv(p, dtype=str, keep_default_na=False), _season_from_path(p))
+        for p in paths
+    ]
+    data = pd.concat(frames, ignore_index=True)
+    table = pa.Table.from_pandas(data, preserve_index=False)
+    _write_parquet(table, dataset_path(f"espn_{category}.parquet", data_dir))
+    return cache_key([("espn", p) for p in paths]), table.num_rows
+
+
+def build(data_dir=DATA_DIR, workers=None, rebuild=False, verbose=False):
+    """Convert every source whose CSVs changed since the last build."""
+    manifest = read_manifest(data_dir)
+    jobs = [(TRANSFERS_FILE, source_files(data_dir=data_dir),
+             lambda: build_transfers(data_dir, workers))]
+    for category, paths in espn_files(data_dir).items():
+        jobs.append((f"espn_{category}.parquet", [("espn", p) for p in paths],
+                     lambda c=category, p=paths: build_espn(c, p, data_dir)))
+
+    for name, files, convert in jobs:
+        if not files:
+            continue
+        current = manifest["files"].get(name, {}).get("key")
+        if not rebuild and current == cache_key(files) and dataset_path(name, data_dir).exists():
+            # Checked against the CSVs now, even if they were only re-saved
+            # unchanged; has_dataset(season=...) compares against this mtime.
+            os.utime(dataset_path(name, data_dir))
+            if verbose:
+                print(f"  {name:<28} up to date")
+            continue
+        start = time.perf_counter()
+        key, rows = convert()
+        _record(manifest, name, key, rows, data_dir)
+        if verbose:
+            print(f"✓ {name:<28} {rows:>7} rows  ({time.perf_counter() - start:.2f}s)")
+    return manifest
+
+
+# ── Readers ──────────────────────────────────────────────────────────────────
+
+def read_table(name, columns=None, filters=None, data_dir=DATA_DIR):
+    """Arrow table from dataset/, memory-mapped, with projection and filters
+    (row groups whose statistics rule them out are never decoded)."""
+    return pq.read_table(dataset_path(name, data_dir), columns=columns, filters=filters,
+                         memory_map=True)
+
+
+def load_transfers(data_dir=DATA_DIR, workers=None, rebuild=False, verbose=False):
+    """Cleaned transfers (all rows) as pandas, rebuilt first if the CSVs changed."""
+    files = source_files(data_dir=data_dir)
+    manifest = read_manifest(data_dir)
+    path = dataset_path(TRANSFERS_FILE, data_dir)
+    stale = manifest["files"].get(TRANSFERS_FILE, {}).get("key") != cache_key(files)
+    if rebuild or stale or not path.exists():
+        start = time.perf_counter()
+        key, rows = build_transfers(data_dir, workers)
+        _record(manifest, TRANSFERS_FILE, key, rows, data_dir)
+        if verbose:
+            print(f"Built {TRANSFERS_FILE} from {len(files)} files in "
+                  f"{time.perf_counter() - start:.2f}s")
+    elif verbose:
+        print(f"Using {DATASET_DIR}/{TRANSFERS_FILE}")
+    return read_table(TRANSFERS_FILE, data_dir=data_dir).to_pandas()
+
+
+def load_espn(category, season=None, data_dir=DATA_DIR):
+    filters = [("season", "=", season)] if season else None
+    return read_table(f"espn_{category}.parquet", filters=filters, data_dir=data_dir).to_pandas()
+
+
+# ── App view (server) ────────────────────────────────────────────────────────
+# Same dicts main.jac's CSV reader builds, from the typed columns.
+
+APP_COLUMNS = ["name", "position", "height", "weight", "stars", "rating", "status",
+               "from_school", "to_school", "profile_url"]
+
+
+def app_transfer(row_id, row):
+    height = row["height"]
+    to_school = row["to_school"] or "Undecided"
+    return {
+        "id": str(row_id),
+        "playerId": str(row_id),
+        "playerName": row["name"] or "N/A",
+        "playerPhoto": "👤",
+        "position": row["position"] or "N/A",
+        "fromTeam": row["from_school"] or "N/A",
+        "fromTeamLogo": "🏈",
+        "toTeam": to_school,
+        "toTeamLogo": ("🏈" if to_school != "Undecided" else "❓"),
+        "starRating": row["stars"] or 0,
+        "rating": row["rating"],
+        "height": f"{height // 12}'{height % 12}\"" if height is not None else "N/A",
+        "weight": row["weight"] or 0,
+        "status": row["status"] or "In Portal",
+        "stats": {},
+        "date": str(row["season"]),
+        "sport": "Football",
+        "profileUrl": row["profile_url"] or "",
+    }
+
+
+class AppTransfers:
+    """One season of 247 rows in app form; `raw` keeps both listings of a
+    transfer, `deduped` the first per profile URL. Each is built on first use."""
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @cached_property
+    def raw(self):
+        return [app_transfer(i + 1, row) for i, row in enumerate(self.rows)]
+
+    @cached_property
+    def deduped(self):
+        out = []
+        seen = set()
+        for row in self.rows:
+            url = row["profile_url"]
+            if url and url in seen:
+                continue
+            if url:
+                seen.add(url)
+            out.append(app_transfer(len(out) + 1, row))
+        return out
+
+    @classmethod
+    def load(cls, season=CURRENT_SEASON, data_dir=DATA_DIR):
+        table = read_table(TRANSFERS_FILE, columns=APP_COLUMNS + ["season"],
+                           filters=[("source", "=", "247"), ("season", "=", season)],
+                           data_dir=data_dir)
+        # Column-wise to Python, then zip: much faster than Table.to_pylist().
+        columns = {name: table.column(name).to_pylist() for name in table.column_names}
+        return cls([dict(zip(columns, values)) for values in zip(*columns.values())])
+
+
+def has_dataset(data_dir=DATA_DIR, season=None):
+    """Whether transfers.parquet exists; with season, also whether it is at
+    least as new as that season's 247 CSV (a scraper run since the last
+    build makes the CSV the fresher copy until build() is run)."""
+    path = dataset_path(TRANSFERS_FILE, data_dir)
+    if not path.exists():
+        return False
+    if season is None:
+        return True
+    csv_path = Path(data_dir) / SOURCES["247"].replace("20*", str(season))
+    return not csv_path.exists() or csv_path.stat().st_mtime_ns <= path.stat().st_mtime_ns
+
+
+_cache = {}  # (data_dir, season) → {"view", "mtime", "checked"}
+
+
+def load_app_transfers(season=CURRENT_SEASON, dedupe=True, data_dir=DATA_DIR):
+    """Fresh copies of the season's app dicts (callers add fields to them).
+
+    Loaded once and re-read when dataset.py rebuilds the file; the mtime is
+    checked at most every RELOAD_INTERVAL_S, and the dataset is rebuilt first
+    if the season's 247 CSV has been rewritten since the last build.
+    """
+    key = (str(data_dir), season)
+    entry = _cache.get(key)
+    now = time.monotonic()
+    if entry is None or now - entry["checked"] >= RELOAD_INTERVAL_S:
+        if not has_dataset(data_dir, season):
+            build(data_dir)
+        mtime = dataset_path(TRANSFERS_FILE, data_dir).stat().st_mtime_ns
+        if entry is None or mtime != entry["mtime"]:
+            entry = {"view": AppTransfers.load(season, data_dir), "mtime": mtime}
+            _cache[key] = entry
+        entry["checked"] = now
+    rows = entry["view"].deduped if dedupe else entry["view"].raw
+    return [dict(row) for row in rows]
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Convert scraped CSVs to the typed Parquet dataset")
+    p.add_argument("--workers", type=int, default=None,
+                   help="Worker processes for the transfer CSVs (default: one per CPU)")
+    p.add_argument("--rebuild", action="store_true", help="Rebuild every file")
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    build(workers=args.workers, rebuild=args.rebuild, verbose=True)
+    print(f"\nDataset ready in {time.perf_counter() - start:.2f}s → {DATA_DIR / DATASET_DIR}/")
@@ -1,10 +1,35 @@
 """
 ESPN College Football Player Stats Scraper — Full Data (all pages)
 ===================================================================
+Scrapes every stats category (passing, rushing, receiving, defense, scoring,
+returning, kicking, punting) for every season, one CSV per page:
+espn_cfb_stats/espn_<category>_<season>.csv.
+
+Pages are loaded by a pool of headless Chrome drivers (--workers), one per
+worker thread, working through the season × category pages in parallel.
+Each page is expanded by one in-page script (EXPAND_JS) that follows the
+page's own "Show More" pagination, requesting the next batch as soon as the
+previous one has rendered, instead of polling a list of selectors with
+3-second waits and sleeping DELAY seconds per click. The Python click loop
+(click_show_more) only runs if the script stalls.
+
 Requirements:
     pip install selenium webdriver-manager beautifulsoup4 pandas lxml
 Usage:
-    python espn_cfb_scraper.py
+    python espnstats.py
+    python espnstats.py --seasons 2025 2024 --workers 4
+    python espnstats.py --categories defense kicking
+    python espnstats.py --block none       # load everything (bandwidth baseline)
+
+Fully expanded pages are cached on disk (http_cache.py) by URL: past seasons
+are served from the cache forever and the current season for --current-ttl
+seconds, so re-runs only drive the browser for pages that could have changed.
+The browser gives no access to ETag/Last-Modified, so nothing is revalidated
+conditionally; stale pages are simply loaded again.
+
+Each page is recorded in a run log (run_log.py): load and parse time, bytes,
+Show More clicks and rows, one JSON line per page, with a summary at the end
+(`python run_log.py` reports on the latest run).
 """
 
 from selenium import webdriver
@@ -13,33 +38,58 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
-import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import threading
 import time
 import os
 
+from http_cache import CURRENT_SEASON, HttpCache, season_policy
+from page_parsers import parse_stats_table
+from run_log import RunLog
+from resource_blocking import (
+    DEFAULT_SPEC, BlockingRules, BlockStats, block_selenium, collect_selenium_stats,
+    selenium_logging_prefs,
+)
+
 # ── Config ────────────────────────────────────────────────────────────────────
 
-URLS = {
-    "espn_passing_2018":   "https://www.espn.com/college-football/stats/player/_/season/2018",
-    "espn_rushing_2018":   "https://www.espn.com/college-football/stats/player/_/stat/rushing/season/2018",
-    "espn_receiving_2018": "https://www.espn.com/college-football/stats/player/_/stat/receiving/season/2018",
-    "espn_defense_2018":   "https://www.espn.com/college-football/stats/player/_/view/defense/season/2018",
-    "espn_scoring_2018":   "https://www.espn.com/college-football/stats/player/_/view/scoring/season/2018",
-    "espn_returning_2018":   "https://www.espn.com/college-football/stats/player/_/view/special/season/2018",
-    "espn_kicking_2018":   "https://www.espn.com/college-football/stats/player/_/view/special/stat/kicking/season/2018",
-    "espn_punting_2018":   "https://www.espn.com/college-football/stats/player/_/view/special/stat/punting/season/2018",
+BASE_URL = "https://www.espn.com/college-football/stats/player/_/"
+
+# category → URL path before "season/<year>"
+CATEGORIES = {
+    "passing":   "",
+    "rushing":   "stat/rushing/",
+    "receiving": "stat/receiving/",
+    "defense":   "view/defense/",
+    "scoring":   "view/scoring/",
+    "returning": "view/special/",
+    "kicking":   "view/special/stat/kicking/",
+    "punting":   "view/special/stat/punting/",
 }
+SEASONS = list(range(CURRENT_SEASON, 2017, -1))  # 2026 → 2018
 
 OUTPUT_DIR = "espn_cfb_stats"
-DELAY = 1.5  # seconds to wait after each "Show More" click
+DELAY = 1.5  # seconds to wait after each "Show More" click (fallback loop)
+BLOCK = DEFAULT_SPEC  # requests dropped via CDP; "none" loads everything
+CURRENT_TTL = 3600  # seconds a cached current-season page stays fresh
+WORKERS = 3  # Chrome instances loading pages in parallel
+BATCH_TIMEOUT = 20  # seconds EXPAND_JS waits for one batch of rows
+
+
+def stats_url(category, season):
+    return f"{BASE_URL}{CATEGORIES[category]}season/{season}"
+
+
+def page_name(category, season):
+    return f"espn_{category}_{season}"
 
 
 # ── Driver setup ──────────────────────────────────────────────────────────────
 
-def get_driver():
+def get_driver(block=BLOCK):
     opts = Options()
     opts.add_argument("--headless")
     opts.add_argument("--no-sandbox")
@@ -50,9 +100,55 @@ def get_driver():
         "AppleWebKit/537.36 (KHTML, like Gecko) "
         "Chrome/120.0.0.0 Safari/537.36"
     )
-    return webdriver.Chrome(
+    selenium_logging_prefs(opts)
+    driver = webdriver.Chrome(
         service=Service(ChromeDriverManager().install()), options=opts
     )
+    # Only the stats tables are read: skip images, fonts, video and ad/analytics
+    # scripts (resource_blocking.py).
+    block_selenium(driver, BlockingRules.from_spec(block))
+    # EXPAND_JS runs until every batch is in; each batch has its own timeout.
+    driver.set_script_timeout(3600)
+    return driver
+
+
+class DriverPool:
+    """One Chrome per worker thread, started on its first page."""
+
+    def __init__(self, block=BLOCK):
+        self.block = block
+        self._local = threading.local()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def get(self):
+        driver = getattr(self._local, "driver", None)
+        if driver is None:
+            driver = self._local.driver = get_driver(self.block)
+            with self._lock:
+                self._drivers.append(driver)
+        return driver
+
+    def discard(self):
+        """Quit this thread's driver (after a crash); the next page starts a new one."""
+        driver = getattr(self._local, "driver", None)
+        self._local.driver = None
+        if driver is not None:
+            with self._lock:
+                self._drivers.remove(driver)
+            try:
+                driver.quit()
+            except WebDriverException:
+                pass
+
+    def quit(self):
+        with self._lock:
+            for driver in self._drivers:
+                try:
+                    driver.quit()
+                except WebDriverException:
+                    pass
+            self._drivers.clear()
 
 
 # ── Debug helper ──────────────────────────────────────────────────────────────
@@ -71,198 +167,258 @@ def debug_show_more_button(driver):
         print("  [DEBUG] No 'show more' elements found in DOM.")
 
 
-# ── Click through all "Show More" ─────────────────────────────────────────────
+# ── Expand every row ──────────────────────────────────────────────────────────
+
+# The selectors click_show_more used to try one by one, as one XPath union.
+SHOW_MORE_XPATH = " | ".join([
+    "//a[contains(@class,'loadMore')]",
+    "//a[contains(@class,'ShowMore')]",
+    "//a[contains(@class,'showMore')]",
+    "//button[contains(@class,'ShowMore')]",
+    "//button[contains(@class,'showMore')]",
+    "//a[normalize-space(text())='Show More']",
+    "//button[normalize-space(text())='Show More']",
+    "//div[contains(@class,'ShowMore')]//a",
+    "//div[contains(@class,'showMore')]//a",
+])
+
+# Runs in the page: click Show More, wait until the new batch of rows has
+# rendered (polled every 50 ms), repeat until the button is gone. Reports
+# {clicks, rows, complete}; complete is false if a batch never arrived.
+EXPAND_JS = """
+const [xpath, timeoutMs, done] = arguments;
+const rows = () => document.querySelectorAll("table tbody tr").length;
+const button = () => {
+  const hits = document.evaluate(xpath, document, null,
+                                 XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+  for (let i = 0; i < hits.snapshotLength; i++) {
+    const el = hits.snapshotItem(i);
+    if (el.offsetParent !== null) return el;  // visible
+  }
+  return null;
+};
+(async () => {
+  let clicks = 0;
+  for (;;) {
+    const btn = button();
+    if (!btn) return done({clicks, rows: rows(), complete: true});
+    const before = rows();
+    btn.click();
+    clicks++;
+    const start = Date.now();
+    while (rows() === before) {
+      if (Date.now() - start > timeoutMs) return done({clicks, rows: before, complete: false});
+      await new Promise(r => setTimeout(r, 50));
+    }
+  }
+})().catch(e => done({clicks: 0, rows: rows(), complete: false, error: String(e)}));
+"""
+
+
+def expand_rows(driver, label=""):
+    """Load every row of the open page. Returns (Show More clicks made,
+    whether every row is in)."""
+    result = driver.execute_async_script(EXPAND_JS, SHOW_MORE_XPATH, BATCH_TIMEOUT * 1000)
+    if result.get("complete"):
+        return result["clicks"], True
+    print(f"  {label}: in-page expansion stalled after {result['clicks']} clicks "
+          f"({result.get('error', 'no new rows')}); clicking from Python")
+    clicks, complete = click_show_more(driver)
+    return result["clicks"] + clicks, complete
+
 
 def click_show_more(driver):
-    """Keep clicking 'Show More' until it's gone. Returns total clicks made."""
+    """Keep clicking 'Show More' until it's gone. Returns (total clicks made,
+    False if clicking stopped on an error with the button still there)."""
     clicks = 0
+    complete = True
     while True:
         try:
-            btn = None
-            selectors = [
-                (By.XPATH,       "//a[contains(@class,'ShowMore')]"),
-                (By.XPATH,       "//a[contains(@class,'showMore')]"),
-                (By.XPATH,       "//button[contains(@class,'ShowMore')]"),
-                (By.XPATH,       "//button[contains(@class,'showMore')]"),
-                (By.XPATH,       "//a[normalize-space(text())='Show More']"),
-                (By.XPATH,       "//button[normalize-space(text())='Show More']"),
-                (By.XPATH,       "//div[contains(@class,'ShowMore')]//a"),
-                (By.XPATH,       "//div[contains(@class,'showMore')]//a"),
-                (By.CSS_SELECTOR, "a.ShowMore"),
-                (By.CSS_SELECTOR, "div.ShowMore a"),
-                (By.CSS_SELECTOR, "button.ShowMore"),
-            ]
-
-            for by, selector in selectors:
-                try:
-                    btn = WebDriverWait(driver, 3).until(
-                        EC.element_to_be_clickable((by, selector))
-                    )
-                    break  # found it
-                except TimeoutException:
-                    continue
-
-            if btn is None:
+            try:
+                btn = WebDriverWait(driver, 3).until(
+                    EC.element_to_be_clickable((By.XPATH, SHOW_MORE_XPATH))
+                )
+            except TimeoutException:
                 break  # no button found with any selector — we're done
 
             driver.execute_script("arguments[0].scrollIntoView(true);", btn)
             time.sleep(0.5)
             driver.execute_script("arguments[0].click();", btn)  # JS click avoids overlay issues
             clicks += 1
-            print(f"    Clicked 'Show More' ({clicks}x)...", end="\r")
             time.sleep(DELAY)
 
         except Exception as e:
             print(f"\n    Stopped at click {clicks}: {e}")
+            complete = False
             break
 
-    if clicks:
-        print(f"    Clicked 'Show More' {clicks} times — all rows loaded.     ")
-    else:
+    if not clicks:
         print("    'Show More' button not found — running debug check...")
         debug_show_more_button(driver)
 
-    return clicks
-
-
-# ── Parse the loaded HTML ─────────────────────────────────────────────────────
-
-def parse_stats_table(soup):
-    """
-    ESPN uses two side-by-side tables:
-      Table 1 — RK, Name (with team embedded as a sub-element), POS
-      Table 2 — stat columns
-
-    The player name and team are in the same <td> but in separate elements:
-      <td>
-        <a>Drew Mestemaker</a>  ← player name
-        <span>UNT</span>        ← team
-      </td>
-
-    We manually extract name + team from Table 1, then merge with Table 2.
-    """
-    tables = soup.find_all("table")
-    if not tables:
-        print("  No <table> tags found.")
-        return None
-
-    # ── Manually parse Table 1 for RK, Name, Team, POS ──────────────────────
-    rows = []
-    table1 = tables[0]
-    for tr in table1.find_all("tr"):
-        tds = tr.find_all("td")
-        if not tds:
-            continue
-
-        row = {}
-
-        for i, td in enumerate(tds):
-            if i == 0:
-                row["RK"] = td.get_text(strip=True)
-
-            elif i == 1:
-                # Name is in <a>, team is in a nested <span> or <a> after it
-                anchors = td.find_all("a")
-                spans   = td.find_all("span")
-
-                if anchors:
-                    row["NAME"] = anchors[0].get_text(strip=True)
-                else:
-                    row["NAME"] = td.get_text(strip=True)
-
-                # Team is usually the last <span> or second <a>
-                if len(anchors) >= 2:
-                    row["TEAM"] = anchors[1].get_text(strip=True)
-                elif spans:
-                    row["TEAM"] = spans[-1].get_text(strip=True)
-                else:
-                    row["TEAM"] = ""
-
-            elif i == 2:
-                row["POS"] = td.get_text(strip=True)
-
-        if row:
-            rows.append(row)
-
-    if not rows:
-        print("  Could not parse player info from Table 1.")
-        return None
-
-    df_info = pd.DataFrame(rows)
-
-    # ── Parse Table 2 for stats ───────────────────────────────────────────────
-    if len(tables) < 2:
-        return df_info
-
-    try:
-        df_stats = pd.read_html(str(tables[1]))[0]
-    except Exception as e:
-        print(f"  Could not parse stats table: {e}")
-        return df_info
-
-    # Drop duplicate columns (RK, POS sometimes appear in both)
-    drop_cols = [c for c in df_stats.columns if str(c).upper() in ("RK", "POS", "NAME")]
-    df_stats = df_stats.drop(columns=drop_cols, errors="ignore")
-
-    # Align row counts before merging
-    min_len = min(len(df_info), len(df_stats))
-    merged = pd.concat(
-        [df_info.iloc[:min_len].reset_index(drop=True),
-         df_stats.iloc[:min_len].reset_index(drop=True)],
-        axis=1
-    )
-    return merged
+    return clicks, complete
 
 
 # ── Main scraper ──────────────────────────────────────────────────────────────
 
-def scrape_all():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
-    driver = get_driver()
-    results = {}
+def load_page(driver, url, label=""):
+    """(page HTML, Show More clicks, whether every row was loaded), or
+    (None, 0, False) if the stats table never appeared."""
+    driver.get(url)
 
+    # Wait for initial table load
     try:
-        for name, url in URLS.items():
-            print(f"\n[{name.upper()}]  {url}")
-
-            driver.get(url)
-
-            # Wait for initial table load
-            try:
-                WebDriverWait(driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
-                )
-            except TimeoutException:
-                print("  Timed out waiting for table. Skipping.")
-                continue
+        WebDriverWait(driver, 15).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "table"))
+        )
+    except TimeoutException:
+        print(f"  {label}: timed out waiting for table. Skipping.")
+        return None, 0, False
 
-            # Expand all rows by clicking Show More repeatedly
-            click_show_more(driver)
+    clicks, complete = expand_rows(driver, label)
+    return driver.page_source, clicks, complete
 
-            # Parse fully-loaded page
-            soup = BeautifulSoup(driver.page_source, "html.parser")
-            df = parse_stats_table(soup)
 
-            if df is None or df.empty:
-                print("  No data extracted.")
-                continue
-
-            df.columns = [str(c).strip() for c in df.columns]
-            df = df.dropna(how="all")
-
-            out_path = os.path.join(OUTPUT_DIR, f"{name}.csv")
-            df.to_csv(out_path, index=False)
-            print(f"  Saved {len(df)} rows  -->  {out_path}")
-            results[name] = df
+def fetch(pool, name, url, unit=None):
+    """Worker thread: (html or None, BlockStats, clicks, seconds) for one page.
 
+    html is None unless every row was loaded: a page whose Show More rounds
+    stalled is truncated, and caching it would freeze a past season's
+    partial page (they never expire) and its CSV. unit (a run_log.Unit), if
+    given, starts its clock here and is charged the load time, traffic and
+    Show More clicks.
+    """
+    if unit:
+        unit.begin()
+    start = time.perf_counter()
+    stats = BlockStats()
+    try:
+        driver = pool.get()
+        html, clicks, complete = load_page(driver, url, name)
+        collect_selenium_stats(driver, stats)
+        if html is not None and not complete:
+            print(f"  {name}: not every row loaded; not saving this page")
+            html = None
+    except WebDriverException as e:
+        print(f"  {name}: browser error, restarting its driver ({e.msg})")
+        pool.discard()
+        html, clicks = None, 0
+    seconds = time.perf_counter() - start
+    if unit:
+        unit.add(network_s=seconds, bytes=stats.bytes_downloaded, requests=stats.requests,
+                 rounds=clicks)
+    return html, stats, clicks, seconds
+
+
+def save(name, html, out_dir, unit=None):
+    """Parse a fully loaded page and write its CSV; returns rows saved."""
+    start = time.perf_counter()
+    df = parse_stats_table(html)
+    if unit:
+        unit.add(parse_s=time.perf_counter() - start)
+
+    if df is None or df.empty:
+        print(f"  {name}: no data extracted.")
+        return 0
+
+    df.columns = [str(c).strip() for c in df.columns]
+    # Blank cells are "" (None only where a row is short), so drop rows
+    # with nothing in any cell rather than all-NaN rows.
+    df = df[(df.notna() & (df != "")).any(axis=1)]
+
+    out_path = os.path.join(out_dir, f"{name}.csv")
+    df.to_csv(out_path, index=False)
+    return len(df)
+
+
+def scrape_all(seasons=SEASONS, categories=CATEGORIES, workers=WORKERS, block=BLOCK,
+               current_ttl=CURRENT_TTL, out_dir=OUTPUT_DIR, run_log=None):
+    """Scrape every season × category page. Returns {page name: rows saved}.
+
+    Cached pages are parsed straight away; the rest are loaded by `workers`
+    drivers in parallel and parsed (and cached) as each one finishes. Each
+    page is recorded in run_log (run_log.py), if given.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    run_log = run_log or RunLog("espn", path=None)
+    cache = HttpCache(policy=season_policy(current_ttl=current_ttl))
+    results = {}
+    totals = BlockStats()
+
+    todo = {}
+    for season in seasons:
+        for category in categories:
+            name, url = page_name(category, season), stats_url(category, season)
+            entry = cache.get(url)
+            if entry and cache.is_fresh(entry):
+                cache.stats.fresh += 1
+                unit = run_log.unit(category, season)
+                results[name] = save(name, cache.body(entry), out_dir, unit)
+                unit.finish(rows=results[name], cache="fresh")
+                print(f"  {name:<24} {results[name]:>6} rows  (cache)")
+            else:
+                todo[name] = (url, run_log.unit(category, season))
+    if not todo:
+        print(f"\nCache: {cache.stats}")
+        return results
+
+    print(f"\nLoading {len(todo)} page(s) with {min(workers, len(todo))} browser(s)...")
+    pool = DriverPool(block)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(fetch, pool, name, url, unit): (name, url, unit)
+                       for name, (url, unit) in todo.items()}
+            for future in as_completed(futures):
+                name, url, unit = futures[future]
+                html, page_stats, clicks, seconds = future.result()
+                totals.merge(page_stats)
+                if html is None:
+                    unit.finish(error="page did not load fully")
+                    continue
+                cache.store(url, html)
+                results[name] = save(name, html, out_dir, unit)
+                unit.finish(rows=results[name])
+                print(f"  {name:<24} {results[name]:>6} rows  ({clicks} Show More, "
+                      f"{seconds:.0f}s, {page_stats.summary()})")
     finally:
-        driver.quit()
+        print(f"\nNetwork total: {totals.summary()}")
+        print(f"Cache: {cache.stats}")
+        pool.quit()
 
     return results
 
 
+def parse_args():
+    p = argparse.ArgumentParser(description="ESPN CFB player stats scraper — all pages")
+    p.add_argument("--seasons", type=int, nargs="+", default=SEASONS,
+                   help=f"Seasons to scrape (default: {SEASONS[0]} → {SEASONS[-1]})")
+    p.add_argument("--categories", nargs="+", choices=list(CATEGORIES), default=list(CATEGORIES),
+                   help="Stat categories to scrape (default: all)")
+    p.add_argument("--workers", type=int, default=WORKERS,
+                   help=f"Chrome instances loading pages in parallel (default: {WORKERS})")
+    p.add_argument("--block", default=BLOCK,
+                   help=f"Requests to drop: resource types and/or 'trackers', "
+                        f"or 'none' (default: {BLOCK})")
+    p.add_argument("--current-ttl", type=int, default=CURRENT_TTL,
+                   help=f"Seconds a cached current-season page stays fresh "
+                        f"(default: {CURRENT_TTL})")
+    p.add_argument("--out", default=OUTPUT_DIR,
+                   help=f"Output directory (default: {OUTPUT_DIR})")
+    return p.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
     print("ESPN CFB Stats Scraper — Full Roster Mode")
     print("=" * 44)
-    results = scrape_all()
-    print(f"\nDone: {len(results)}/{len(URLS)} categories saved to '{OUTPUT_DIR}/'")
\ No newline at end of file
+    start = time.perf_counter()
+    run_log = RunLog("espn", args=vars(args))
+    try:
+        results = scrape_all(args.seasons, args.categories, args.workers, args.block,
+                             args.current_ttl, args.out, run_log)
+    finally:
+        run_log.close()
+    total = len(args.seasons) * len(args.categories)
+    print(f"\nDone: {len(results)}/{total} pages saved to '{args.out}/' "
+          f"in {time.perf_counter() - start:.0f}s")
+    print(f"\n{run_log.report()}")
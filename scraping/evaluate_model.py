@@ -0,0 +1,156 @@
+"""
+Destination model evaluation & hyperparameter search
+=====================================================
+A random 80/20 split lets the same transfer class (and often the same player)
+appear in train and test, and says nothing about predicting a *new* season.
+This harness uses rolling-origin splits instead: for each test season, train
+on every earlier season and score that season only.
+
+Each (candidate, season) fold runs in its own worker process; the forest
+inside can use extra cores with --n-jobs. For every fold it records top-1 /
+top-3 / top-5 accuracy, fit and predict time, and tree node count, then
+writes the full results and a per-candidate summary to eval_reports/.
+
+Usage:
+    python evaluate_model.py
+    python evaluate_model.py --seasons 2023 2024 2025 --workers 4 --n-jobs 2
+    python evaluate_model.py --grid "n_estimators=100,300 min_samples_leaf=5,10,20"
+"""
+
+import argparse
+import csv
+import itertools
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+from model_service import MODEL_DIR, build_pipeline, top_k_accuracy
+from training_data import load_training_data, model_frame
+
+REPORT_DIR = MODEL_DIR / "eval_reports"
+
+DEFAULT_GRID = {
+    "n_estimators": [150, 300],
+    "max_depth": [20, None],
+    "min_samples_leaf": [10, 20],
+}
+
+_X = _y = None
+
+
+def _init_worker():
+    # Each worker reads the cached Parquet once instead of receiving a pickle.
+    global _X, _y
+    _X, _y = model_frame(load_training_data())
+
+
+def run_fold(params, test_season, n_jobs):
+    train = _X["season"] < test_season
+    test = _X["season"] == test_season
+    model = build_pipeline(n_jobs=n_jobs, random_state=42, **params)
+
+    start = time.perf_counter()
+    model.fit(_X[train], _y[train])
+    fit_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    probs = model.predict_proba(_X[test])
+    predict_s = time.perf_counter() - start
+
+    forest = model.named_steps["forest"]
+    return {
+        "params": params,
+        "test_season": test_season,
+        "train_rows": int(train.sum()),
+        "test_rows": int(test.sum()),
+        "top1": top_k_accuracy(model, None, _y[test], 1, probs),
+        "top3": top_k_accuracy(model, None, _y[test], 3, probs),
+        "top5": top_k_accuracy(model, None, _y[test], 5, probs),
+        "fit_s": fit_s,
+        "predict_ms_per_row": predict_s * 1000 / max(int(test.sum()), 1),
+        "nodes": sum(e.tree_.node_count for e in forest.estimators_),
+    }
+
+
+def summarize(results):
+    by_params = {}
+    for r in results:
+        by_params.setdefault(json.dumps(r["params"], sort_keys=True), []).append(r)
+    summary = []
+    for key, folds in by_params.items():
+        n = len(folds)
+        summary.append({
+            "params": json.loads(key),
+            "folds": n,
+            **{m: sum(f[m] for f in folds) / n
+               for m in ("top1", "top3", "top5", "fit_s", "predict_ms_per_row", "nodes")},
+        })
+    return sorted(summary, key=lambda s: s["top3"], reverse=True)
+
+
+def parse_grid(text):
+    grid = {}
+    for part in text.split():
+        name, _, values = part.partition("=")
+        grid[name] = [None if v == "None" else int(v) for v in values.split(",")]
+    return grid
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Season-based evaluation of the destination model")
+    p.add_argument("--seasons", type=int, nargs="+", default=[2022, 2023, 2024, 2025],
+                   help="Test seasons; each trains on all earlier seasons")
+    p.add_argument("--grid", type=parse_grid, default=DEFAULT_GRID,
+                   help='Candidates, e.g. "n_estimators=100,300 max_depth=20,None"')
+    p.add_argument("--workers", type=int, default=2,
+                   help="Folds evaluated in parallel (default: 2)")
+    p.add_argument("--n-jobs", type=int, default=1,
+                   help="Cores per forest fit (RandomForestClassifier n_jobs, default: 1)")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    names = list(args.grid)
+    candidates = [dict(zip(names, values)) for values in itertools.product(*args.grid.values())]
+    jobs = [(c, s) for c in candidates for s in args.seasons]
+    print(f"Evaluating {len(candidates)} candidate(s) × {len(args.seasons)} season(s) "
+          f"= {len(jobs)} fits  (workers={args.workers}, n_jobs={args.n_jobs})\n")
+
+    load_training_data(verbose=True)  # build the cache once before workers start
+    start = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as pool:
+        futures = [pool.submit(run_fold, c, s, args.n_jobs) for c, s in jobs]
+        for i, future in enumerate(futures, 1):
+            r = future.result()
+            results.append(r)
+            print(f"  [{i:>3}/{len(jobs)}] {r['test_season']} {r['params']}  "
+                  f"top-3 {r['top3']:.3f}  fit {r['fit_s']:.1f}s")
+    elapsed = time.perf_counter() - start
+
+    summary = summarize(results)
+    print(f"\n{'top-1':>7}{'top-3':>7}{'top-5':>7}{'fit s':>8}{'ms/row':>8}{'nodes':>9}  params")
+    for s in summary:
+        print(f"{s['top1']:>7.3f}{s['top3']:>7.3f}{s['top5']:>7.3f}{s['fit_s']:>8.1f}"
+              f"{s['predict_ms_per_row']:>8.3f}{s['nodes']:>9.0f}  {s['params']}")
+
+    REPORT_DIR.mkdir(exist_ok=True)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    json_path = REPORT_DIR / f"eval_{stamp}.json"
+    with open(json_path, "w", encoding="utf-8") as f:
+        json.dump({"seasons": args.seasons, "elapsed_s": elapsed,
+                   "summary": summary, "folds": results}, f, indent=2)
+    csv_path = REPORT_DIR / f"eval_{stamp}.csv"
+    with open(csv_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+        writer.writeheader()
+        writer.writerows(results)
+    print(f"\nFinished in {elapsed:.1f}s")
+    print(f"✓ Saved {json_path.relative_to(MODEL_DIR)} and {Path(csv_path).name}")
+
+
+if __name__ == "__main__":
+    main()
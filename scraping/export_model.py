@@ -0,0 +1,125 @@
+"""
+Compact destination model export
+=================================
+Retrains the destination pipeline with capped trees and writes it to
+to_school_pipeline_compact.pkl, to weigh a smaller, faster-loading model
+against the accuracy it gives up. Capped trees lose accuracy (top-1
+0.083 → 0.058, top-3 0.171 → 0.125 with the defaults), so the server never
+loads this file; it serves the version published by make_model.py or
+refresh_model.py.
+
+Memory-mapping the pickle does not help either: sklearn copies each tree's
+nodes and values into private buffers as it unpickles, so every process
+still holds its own copy.
+
+Reports file size, cold load time, RSS after load and holdout accuracy for
+the current to_school_pipeline.pkl (if present) and the compact artifact.
+
+Usage:
+    python export_model.py
+    python export_model.py --max-depth 10 --min-samples-leaf 30 --n-estimators 100
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+import joblib
+from sklearn.model_selection import train_test_split
+
+from model_service import MODEL_DIR, PIPELINE_FILE, build_pipeline, top_k_accuracy
+from training_data import model_frame
+
+COMPACT_FILE = "to_school_pipeline_compact.pkl"
+
+# Run in a fresh interpreter so load time and RSS are not skewed by this one.
+_MEASURE = r"""
+import json, sys, time
+import joblib
+import model_service
+
+def rss_mb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return float("nan")
+
+before = rss_mb()
+start = time.perf_counter()
+model = joblib.load(sys.argv[1])
+print(json.dumps({"load_s": time.perf_counter() - start, "rss_mb": rss_mb() - before}))
+"""
+
+
+def measure_load(path):
+    out = subprocess.run(
+        [sys.executable, "-c", _MEASURE, str(path)],
+        cwd=MODEL_DIR, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def report_row(label, path, model, X_test, y_test):
+    load = measure_load(path)
+    return {
+        "artifact": label,
+        "size_mb": os.path.getsize(path) / 1e6,
+        "load_s": load["load_s"],
+        "rss_mb": load["rss_mb"],
+        "top1": top_k_accuracy(model, X_test, y_test, 1),
+        "top3": top_k_accuracy(model, X_test, y_test, 3),
+    }
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Export and compare a compact destination model")
+    p.add_argument("--n-estimators",     type=int, default=150)
+    p.add_argument("--max-depth",        type=int, default=20)
+    p.add_argument("--min-samples-leaf", type=int, default=10)
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    X, y = model_frame()
+    # Same split as make_model.py so accuracies are comparable.
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42
+    )
+
+    rows = []
+    current_path = MODEL_DIR / PIPELINE_FILE
+    if current_path.exists():
+        current = joblib.load(current_path)
+        rows.append(report_row("current", current_path, current, X_test, y_test))
+        del current
+    else:
+        print(f"No {PIPELINE_FILE} yet — run make_model.py to compare against it.")
+
+    start = time.perf_counter()
+    compact = build_pipeline(
+        n_estimators=args.n_estimators,
+        max_depth=args.max_depth,
+        min_samples_leaf=args.min_samples_leaf,
+        random_state=42,
+    )
+    compact.fit(X_train, y_train)
+    print(f"Trained compact model in {time.perf_counter() - start:.1f}s")
+
+    compact_path = MODEL_DIR / COMPACT_FILE
+    joblib.dump(compact, compact_path)
+    rows.append(report_row("compact", compact_path, compact, X_test, y_test))
+
+    print(f"\n{'artifact':<18}{'size MB':>10}{'load s':>9}{'RSS MB':>9}{'top-1':>8}{'top-3':>8}")
+    for r in rows:
+        print(f"{r['artifact']:<18}{r['size_mb']:>10.1f}{r['load_s']:>9.2f}"
+              f"{r['rss_mb']:>9.1f}{r['top1']:>8.3f}{r['top3']:>8.3f}")
+    print(f"\n✓ Saved {compact_path.name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Async HTTP fetch engine for the scrapers
+========================================
+One pooled aiohttp session, a cap on requests in flight, and a token bucket
+per host instead of a fixed sleep between requests. 429 and 5xx responses
+(and connection errors) are retried with exponential backoff and jitter,
+honouring Retry-After when the server sends it.
+
+With an http_cache.HttpCache, fresh entries are served from disk without a
+request and stale ones are revalidated with a conditional GET. A validate
+callback keeps pages that look wrong (a soft block, an empty shell) out of
+the cache: they are returned but not stored, and a cached body that fails
+it is fetched again.
+
+Usage:
+    async with FetchEngine(concurrency=8, rate=4.0) as engine:
+        html = await engine.fetch(url)          # str, or None after retries
+        html = await engine.fetch(url, validate=lambda text: "<table" in text)
+        pages = await asyncio.gather(*(engine.fetch(u) for u in urls))
+    print(engine.stats)
+"""
+
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """`rate` requests per second on average, bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class FetchStats:
+    def __init__(self):
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+        self.bytes = 0
+
+    def __str__(self):
+        return (f"{self.requests} requests, {self.retries} retries, "
+                f"{self.failures} failed, {self.bytes / 1e6:.1f} MB")
+
+
+class FetchEngine:
+    def __init__(self, concurrency=8, rate=4.0, burst=None, retries=4, backoff=1.0,
+                 timeout=15, headers=None, cache=None):
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst or concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.headers = headers or DEFAULT_HEADERS
+        self.stats = FetchStats()
+        self.cache = cache
+        self._buckets = {}
+        self._session = None
+        self._slots = None
+
+    async def __aenter__(self):
+        connector = aiohttp.TCPConnector(limit=self.concurrency, ttl_dns_cache=300)
+        self._session = aiohttp.ClientSession(
+            connector=connector, headers=self.headers, timeout=self.timeout
+        )
+        self._slots = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._session.close()
+
+    def _bucket(self, url):
+        host = urlsplit(url).hostname
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    def _delay(self, attempt, retry_after=None):
+        if retry_after and retry_after.isdigit():
+            return float(retry_after)
+        return self.backoff * 2 ** attempt * random.uniform(0.5, 1.5)
+
+    async def fetch(self, url, headers=None, unit=None, validate=None):
+        """Response body as text, or None once every retry has failed.
+
+        unit (a run_log.Unit), if given, is charged the requests, bytes and
+        retries this fetch makes and notes whether the cache answered.
+        validate(text), if given, must be true for a body to be cached or
+        served from the cache.
+        """
+        entry = self.cache.get(url) if self.cache else None
+        if entry and validate and not validate(self.cache.body(entry)):
+            entry = None
+        if entry:
+            if self.cache.is_fresh(entry):
+                self.cache.stats.fresh += 1
+                if unit:
+                    unit.note(cache="fresh")
+                return self.cache.body(entry)
+            headers = {**(headers or {}), **self.cache.validators(entry)}
+
+        response = await self.request(url, headers, unit)
+        if response is None:
+            return None
+        status, text, response_headers = response
+        if status == 304 and entry:
+            self.cache.touch(entry)
+            if unit:
+                unit.note(cache="revalidated")
+            return self.cache.body(entry)
+        if status != 200:
+            return None
+        if self.cache and (validate is None or validate(text)):
+            self.cache.store(url, text, response_headers)
+        return text
+
+    async def request(self, url, headers=None, unit=None):
+        """(status, text, response headers) for the final attempt, or None."""
+        for attempt in range(self.retries + 1):
+            await self._bucket(url).acquire()
+            retry_after = None
+            try:
+                async with self._slots:
+                    self.stats.requests += 1
+                    if unit:
+                        unit.add(requests=1)
+                    async with self._session.get(url, headers=headers) as resp:
+                        body = await resp.read()
+                        self.stats.bytes += len(body)
+                        if unit:
+                            unit.add(bytes=len(body))
+                        if resp.status not in RETRY_STATUSES:
+                            text = body.decode(resp.charset or "utf-8", "replace")
+                            return resp.status, text, resp.headers
+                        retry_after = resp.headers.get("Retry-After")
+                        error = f"HTTP {resp.status}"
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = str(e) or type(e).__name__
+
+            if attempt < self.retries:
+                self.stats.retries += 1
+                if unit:
+                    unit.add(retries=1)
+                await asyncio.sleep(self._delay(attempt, retry_after))
+
+        self.stats.failures += 1
+        print(f"  [ERROR] {url}: {error} after {self.retries + 1} attempts")
+        return None
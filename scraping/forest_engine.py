@@ -0,0 +1,281 @@
+"""
+NumPy-only destination model inference
+======================================
+Flattens the trained destination pipeline (one-hot encoder, imputers and the
+random forest) into a handful of contiguous NumPy arrays, and evaluates all
+trees for a batch of players at once. Serving Crystal Ball predictions then
+needs NumPy alone: no pandas or scikit-learn import at server start. It is
+built for one player per request; on large batches scikit-learn is faster,
+so prediction_table.py scores with the pipeline. make_model.py and
+refresh_model.py rewrite the export whenever they publish a model.
+
+Arrays in to_school_forest.npz:
+    feature, threshold, left, right   one entry per node, all trees back to back
+    roots                             first node of each tree
+    leaf_index, leaf_values           node → row of per-class leaf probabilities
+    classes, cat_*, impute            label names and preprocessing state
+
+Usage:
+    python forest_engine.py                 # convert the current pipeline .pkl
+    python forest_engine.py --check         # convert, then compare with predict_proba
+
+    from forest_engine import load_engine
+    engine = load_engine()
+    engine.predict_top_k(player, k=3)
+"""
+
+import argparse
+import os
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+MODEL_DIR = Path(__file__).resolve().parent
+ENGINE_FILE = "to_school_forest.npz"
+CURRENT_SEASON = 2026
+RELOAD_INTERVAL_S = 30  # same as model_service
+
+# App transfer keys → CSV/model keys (same as model_service)
+KEY_ALIASES = {"starRating": "stars", "fromTeam": "from_school"}
+
+_HEIGHT = re.compile(r"(\d+)['-](\d+)")
+
+
+# ── Conversion (needs a fitted pipeline, but not an sklearn import) ──────────
+
+def convert(pipeline):
+    """Flatten a fitted model_service pipeline into a dict of NumPy arrays."""
+    preprocess = pipeline.named_steps["preprocess"]
+    forest = pipeline.named_steps["forest"]
+    encoder = preprocess.named_transformers_["categorical"]
+    columns = {name: list(cols) for name, _, cols in preprocess.transformers_}
+    cat_columns = columns["categorical"]
+    numeric_columns = columns["height"] + columns["numeric"]
+    impute = np.concatenate([
+        preprocess.named_transformers_[name][-1].statistics_
+        for name in ("height", "numeric")
+    ])
+
+    feature, threshold, left, right, leaf_values, roots = [], [], [], [], [], []
+    leaf_index = []
+    offset = n_leaves = 0
+    for est in forest.estimators_:
+        tree = est.tree_
+        is_leaf = tree.children_left == -1
+        idx = np.full(tree.node_count, -1, dtype=np.int32)
+        idx[is_leaf] = np.arange(n_leaves, n_leaves + is_leaf.sum())
+
+        values = tree.value[is_leaf, 0, :]
+        leaf_values.append(values / values.sum(axis=1, keepdims=True))
+        roots.append(offset)
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        left.append(np.where(is_leaf, -1, tree.children_left + offset))
+        right.append(np.where(is_leaf, -1, tree.children_right + offset))
+        leaf_index.append(idx)
+        offset += tree.node_count
+        n_leaves += is_leaf.sum()
+
+    arrays = {
+        "feature":     np.concatenate(feature).astype(np.int32),
+        "threshold":   np.concatenate(threshold).astype(np.float64),
+        "left":        np.concatenate(left).astype(np.int32),
+        "right":       np.concatenate(right).astype(np.int32),
+        "leaf_index":  np.concatenate(leaf_index),
+        "leaf_values": np.concatenate(leaf_values).astype(np.float32),
+        "roots":       np.asarray(roots, dtype=np.int32),
+        "max_depth":   np.asarray(max(e.tree_.max_depth for e in forest.estimators_)),
+        "classes":     np.asarray(forest.classes_).astype(str),
+        "cat_columns": np.asarray(cat_columns).astype(str),
+        "num_columns": np.asarray(numeric_columns).astype(str),
+        "impute":      impute.astype(np.float64),
+    }
+    for col, cats in zip(cat_columns, encoder.categories_):
+        arrays[f"cat_{col}"] = np.asarray(cats).astype(str)
+    return arrays
+
+
+# ── Inference ────────────────────────────────────────────────────────────────
+
+def _number(value):
+    if value is None:
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace("lbs", "").strip())
+    except ValueError:
+        return np.nan
+
+
+def _height(value):
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _HEIGHT.match(str(value or ""))
+    return int(match.group(1)) * 12 + int(match.group(2)) if match else np.nan
+
+
+class ForestEngine:
+    def __init__(self, arrays):
+        self.a = arrays
+        self.classes = arrays["classes"]
+        self.max_depth = int(arrays["max_depth"])
+        self.cat_columns = list(arrays["cat_columns"])
+        self.num_columns = list(arrays["num_columns"])
+        self._cat_index = {}
+        offset = 0
+        for col in self.cat_columns:
+            cats = arrays[f"cat_{col}"]
+            self._cat_index[col] = {c: offset + i for i, c in enumerate(cats)}
+            offset += len(cats)
+        self.n_features = offset + len(self.num_columns)
+
+    @classmethod
+    def load(cls, model_dir=MODEL_DIR):
+        with np.load(Path(model_dir) / ENGINE_FILE) as data:
+            return cls({k: data[k] for k in data.files})
+
+    def encode(self, players):
+        """Dense float32 feature matrix, same layout as the sklearn pipeline."""
+        X = np.zeros((len(players), self.n_features), dtype=np.float32)
+        num_offset = self.n_features - len(self.num_columns)
+        impute = self.a["impute"]
+        for r, player in enumerate(players):
+            player = {KEY_ALIASES.get(k, k): v for k, v in player.items()}
+            for col in self.cat_columns:
+                idx = self._cat_index[col].get(str(player.get(col) or ""))
+                if idx is not None:
+                    X[r, idx] = 1.0
+            for j, col in enumerate(self.num_columns):
+                if col == "height":
+                    value = _height(player.get(col))
+                elif col == "season":
+                    value = _number(player.get(col) or CURRENT_SEASON)
+                else:
+                    value = _number(player.get(col))
+                X[r, num_offset + j] = impute[j] if np.isnan(value) else value
+        return X
+
+    def predict_proba(self, X):
+        """Walk every tree for every row at once; average the leaf probabilities."""
+        a = self.a
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(a["roots"], (X.shape[0], len(a["roots"]))).copy()
+        for _ in range(self.max_depth):
+            go_left = X[rows, a["feature"][node]] <= a["threshold"][node]
+            nxt = np.where(go_left, a["left"][node], a["right"][node])
+            moving = nxt != -1
+            if not moving.any():
+                break
+            node = np.where(moving, nxt, node)
+
+        leaves = a["leaf_index"][node]
+        probs = np.zeros((X.shape[0], len(self.classes)), dtype=np.float32)
+        for t in range(leaves.shape[1]):
+            probs += a["leaf_values"][leaves[:, t]]
+        return probs / leaves.shape[1]
+
+    def predict_top_k_batch(self, players, k=3):
+        if hasattr(players, "to_dict"):
+            players = players.to_dict("records")
+        probs = self.predict_proba(self.encode(list(players)))
+        k = min(k, probs.shape[1])
+        top = np.argpartition(probs, -k, axis=1)[:, -k:]
+        top_probs = np.take_along_axis(probs, top, axis=1)
+        order = np.argsort(-top_probs, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return self.classes[top], np.take_along_axis(top_probs, order, axis=1)
+
+    def predict_top_k(self, player, k=3):
+        schools, probs = self.predict_top_k_batch([player], k)
+        return [
+            {"school": str(school), "probability": float(prob)}
+            for school, prob in zip(schools[0], probs[0])
+        ]
+
+    def describe_top_k(self, player, k=3):
+        """Same text as model_service.describe_top_k, for the Crystal Ball prompt."""
+        top = self.predict_top_k(player, k)
+        lines = [f"Predicted School: {top[0]['school']}", "", f"Top {k} Predictions:"]
+        lines += [f"{p['school']}: {p['probability']:.2%}" for p in top]
+        return "\n".join(lines)
+
+
+def has_export(model_dir=MODEL_DIR):
+    return (Path(model_dir) / ENGINE_FILE).exists()
+
+
+def save(arrays, model_dir=MODEL_DIR):
+    """Write the export via a temp file so a serving process never reads half of it."""
+    path = Path(model_dir) / ENGINE_FILE
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp, path)
+    return path
+
+
+_engine = None
+_engine_mtime = None
+_checked_at = 0.0
+
+
+def load_engine(model_dir=MODEL_DIR):
+    """Load the flattened forest once per process and reuse it for every call.
+
+    At most every RELOAD_INTERVAL_S the file's mtime is checked; if
+    refresh_model.py has re-exported it, the new forest is swapped in.
+    """
+    global _engine, _engine_mtime, _checked_at
+    now = time.monotonic()
+    if _engine is None or now - _checked_at >= RELOAD_INTERVAL_S:
+        _checked_at = now
+        mtime = os.stat(Path(model_dir) / ENGINE_FILE).st_mtime_ns
+        if mtime != _engine_mtime:
+            _engine, _engine_mtime = ForestEngine.load(model_dir), mtime
+    return _engine
+
+
+# ── CLI: convert + parity check ──────────────────────────────────────────────
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Flatten the destination forest into NumPy arrays")
+    p.add_argument("--check", action="store_true",
+                   help="Compare against the sklearn pipeline's predict_proba")
+    p.add_argument("--rows", type=int, default=2000,
+                   help="Rows from the training set to check (default: 2000)")
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    from model_service import DestinationModel
+    from training_data import model_frame
+
+    args = parse_args()
+    pipeline = DestinationModel.load().pipeline
+    arrays = convert(pipeline)
+    save(arrays)
+    size_mb = (MODEL_DIR / ENGINE_FILE).stat().st_size / 1e6
+    print(f"✓ Saved {ENGINE_FILE}  ({len(arrays['roots'])} trees, "
+          f"{len(arrays['feature'])} nodes, {size_mb:.1f} MB)")
+
+    if args.check:
+        X, _ = model_frame()
+        X = X.sample(min(args.rows, len(X)), random_state=42)
+        engine = ForestEngine.load()
+
+        start = time.perf_counter()
+        expected = pipeline.predict_proba(X)
+        sk_s = time.perf_counter() - start
+        start = time.perf_counter()
+        got = engine.predict_proba(engine.encode(X.to_dict("records")))
+        np_s = time.perf_counter() - start
+
+        diff = np.abs(expected - got).max()
+        same_top = (expected.argmax(axis=1) == got.argmax(axis=1)).mean()
+        print(f"Parity on {len(X)} rows: max |Δp| = {diff:.2e}, same top-1 = {same_top:.2%}")
+        print(f"  sklearn {sk_s * 1000:.0f} ms   numpy {np_s * 1000:.0f} ms")
+        if diff > 1e-5:
+            raise SystemExit("✗ NumPy engine does not match predict_proba")
@@ -0,0 +1,125 @@
+"""
+On-disk HTTP response cache for the scrapers
+============================================
+Completed seasons never change, so there is no reason to download them on
+every run. Responses are kept under .cache/http/:
+
+    index/<sha256(url)>.json    url, ETag, Last-Modified, fetch time, body hash
+    bodies/<sha256(body)>.gz    gzip'd body, content-addressed (shared by
+                                identical pages)
+
+A freshness policy decides how long an entry may be served without asking
+the server; the default serves past seasons forever and the current season
+for an hour. Once stale, FetchEngine revalidates with If-None-Match /
+If-Modified-Since and a 304 reuses the stored body.
+
+Usage:
+    cache = HttpCache(policy=season_policy(current_ttl=3600))
+    async with FetchEngine(cache=cache) as engine: ...
+    print(cache.stats)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).resolve().parent / ".cache" / "http"
+CURRENT_SEASON = 2026
+
+_SEASON = re.compile(r"season[/=](20\d{2})\b")
+
+
+def season_policy(current_season=CURRENT_SEASON, current_ttl=3600):
+    """url → seconds an entry stays fresh (None = forever).
+
+    Pages for seasons before current_season never expire; the current
+    season, and URLs without a season, are fresh for current_ttl seconds.
+    """
+    def ttl(url):
+        match = _SEASON.search(url)
+        if match and int(match.group(1)) < current_season:
+            return None
+        return current_ttl
+    return ttl
+
+
+class CacheStats:
+    def __init__(self):
+        self.fresh = 0
+        self.revalidated = 0
+        self.stored = 0
+
+    def __str__(self):
+        return (f"{self.fresh} served from cache, {self.revalidated} revalidated (304), "
+                f"{self.stored} downloaded")
+
+
+class HttpCache:
+    def __init__(self, root=CACHE_DIR, policy=None, refresh=False):
+        self.root = Path(root)
+        self.policy = policy or season_policy()
+        self.refresh = refresh  # treat everything as stale (still revalidates)
+        self.stats = CacheStats()
+        (self.root / "index").mkdir(parents=True, exist_ok=True)
+        (self.root / "bodies").mkdir(parents=True, exist_ok=True)
+
+    def _index_path(self, url):
+        return self.root / "index" / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def _write(self, path, data):
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+    def get(self, url):
+        """Index entry for url, or None."""
+        try:
+            return json.loads(self._index_path(url).read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def is_fresh(self, entry):
+        if self.refresh:
+            return False
+        ttl = self.policy(entry["url"])
+        return ttl is None or time.time() - entry["fetched_at"] < ttl
+
+    def body(self, entry):
+        with gzip.open(self.root / "bodies" / f"{entry['body']}.gz", "rt", encoding="utf-8") as f:
+            return f.read()
+
+    def validators(self, entry):
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, text, headers=None):
+        data = text.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        body_path = self.root / "bodies" / f"{digest}.gz"
+        if not body_path.exists():
+            self._write(body_path, gzip.compress(data))
+        headers = headers or {}
+        entry = {
+            "url": url,
+            "body": digest,
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        self._write(self._index_path(url), json.dumps(entry).encode("utf-8"))
+        self.stats.stored += 1
+        return entry
+
+    def touch(self, entry):
+        """Mark a revalidated (304) entry as fresh again."""
+        entry["fetched_at"] = time.time()
+        self._write(self._index_path(entry["url"]), json.dumps(entry).encode("utf-8"))
+        self.stats.revalidated += 1
@@ -1,67 +1,28 @@
-import pandas as pd
-import glob
 import joblib
-import re
 
 from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
 
-# ------------------------
-# LOAD MULTIPLE CSV FILES
-# ------------------------
-
-files = glob.glob("transfer_247_data/transfer_portal_247_2018.csv")
-df_list = [pd.read_csv(file) for file in files]
-data = pd.concat(df_list, ignore_index=True)
+import forest_engine
+from model_service import PIPELINE_FILE, build_pipeline, publish_version
+from training_data import load_training_data, model_frame, row_keys
 
 # ------------------------
-# CLEAN DATA
+# LOAD ALL SEASONS (247 + On3)
 # ------------------------
 
-# Remove useless columns
-data = data.drop(columns=["institution_key","profile_url", "name", "status"])
-
-# Convert rating
-data["rating"] = data["rating"].replace("( N/A )", None)
-data["rating"] = pd.to_numeric(data["rating"], errors="coerce")
-
-# Convert height
-def convert_height(h):
-    if pd.isna(h):
-        return None
-    match = re.match(r"(\d+)'(\d+)", h)
-    if match:
-        feet = int(match.group(1))
-        inches = int(match.group(2))
-        return feet * 12 + inches
-    return None
-
-data["height"] = data["height"].apply(convert_height)
-
-# Convert weight
-data["weight"] = data["weight"].str.replace(" lbs", "")
-data["weight"] = pd.to_numeric(data["weight"], errors="coerce")
-
-# Remove rows with missing values
-data = data.dropna()
+# Parsed in parallel and cached by training_data.py; heights, weights,
+# ( N/A ) ratings and "Avatar" team names are already cleaned.
+data = load_training_data(verbose=True)
 
 # ------------------------
 # SET TARGET
 # ------------------------
 
-TARGET_COLUMN = "to_school"
-
-y = data[TARGET_COLUMN]
-X = data.drop(TARGET_COLUMN, axis=1)
-
-# ⚠️ Prevent leakage
-# If team == to_school in your dataset, drop it
-if "team" in X.columns:
-    X = X.drop(columns=["team"])
-
-# Convert categorical variables
-X = pd.get_dummies(X, drop_first=True)
+# ⚠️ Prevent leakage: only player attributes go in (no team / to_school).
+# One-hot encoding and imputation live in the pipeline
+# (model_service.build_pipeline) so the server applies exactly the same steps.
+X, y = model_frame(data)
 
 # ------------------------
 # TRAIN TEST SPLIT
@@ -75,10 +36,13 @@ X_train, X_test, y_train, y_test = train_test_split(
 # TRAIN MODEL
 # ------------------------
 
-model = RandomForestClassifier(
-    n_estimators=300,
-    max_depth=None,
-    random_state=42
+# Sparse OneHotEncoder(handle_unknown="ignore") for position/from_school,
+# numeric parsing + imputation for height/weight/rating, then the forest.
+# With every season there are ~600 destination classes, and each tree node
+# stores a probability per class, so unlimited-depth trees no longer fit in
+# memory; min_samples_leaf keeps each tree to a few hundred nodes.
+model = build_pipeline(
+    n_estimators=300, max_depth=None, min_samples_leaf=10, random_state=42
 )
 
 model.fit(X_train, y_train)
@@ -96,7 +60,16 @@ print("Model Accuracy:", accuracy)
 # SAVE MODEL
 # ------------------------
 
-joblib.dump(model, "to_school_model.pkl")
-joblib.dump(X.columns.tolist(), "model_columns.pkl")
+joblib.dump(model, PIPELINE_FILE)
+
+# Also publish it as the serving version; refresh_model.py grows it from here.
+# Every row is recorded as seen, held-out ones included, so the first refresh
+# doesn't mistake the 20% test split for new transfers.
+publish_version(model, row_keys(data.loc[X.index]), kind="full")
+
+# The server prefers the NumPy export when there is one; keep it in step.
+if forest_engine.has_export():
+    forest_engine.save(forest_engine.convert(model))
+    print(f"Re-exported {forest_engine.ENGINE_FILE}")
 
 print("Model saved successfully!")
@@ -0,0 +1,254 @@
+"""
+Crystal Ball destination model service
+=======================================
+Loads the pipeline trained by make_model.py once and serves top-k
+destination predictions in-process, so the server no longer pays interpreter
+startup, pandas/sklearn imports and a joblib.load per request.
+
+Usage (inside the server process):
+    from model_service import load_service
+    service = load_service()                   # loads the pipeline .pkl once
+    service.predict_top_k(player, k=3)         # [{"school": ..., "probability": ...}, ...]
+    service.predict_top_k_batch(players, k=3)  # (schools, probs) arrays, one row per player
+    service.describe_top_k(player, k=3)        # text block for the LLM context
+
+When refresh_model.py publishes a new model version, load_service() notices
+within RELOAD_INTERVAL_S and swaps it in without a server restart.
+
+`player` may use either the CSV keys (position, height, weight, stars, rating,
+from_school) or the app's transfer keys (starRating, fromTeam).
+"""
+
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline, make_pipeline
+from sklearn.preprocessing import FunctionTransformer, OneHotEncoder
+
+MODEL_DIR = Path(__file__).resolve().parent
+PIPELINE_FILE = "to_school_pipeline.pkl"
+VERSIONS_DIR = "model_versions"  # published by make/refresh_model.py
+CURRENT_POINTER = "current.json"
+KEEP_VERSIONS = 5
+RELOAD_INTERVAL_S = 30
+CURRENT_SEASON = 2026
+
+NUMERIC_FEATURES = ["season", "weight", "stars", "rating"]
+CATEGORICAL_FEATURES = ["position", "from_school"]
+FEATURES = CATEGORICAL_FEATURES + ["height"] + NUMERIC_FEATURES
+
+# App transfer keys → CSV/model keys
+KEY_ALIASES = {"starRating": "stars", "fromTeam": "from_school"}
+
+
+# ── Cleaning (runs inside the pipeline, so train and serve share it) ─────────
+
+def _height_inches(col):
+    if pd.api.types.is_numeric_dtype(col):
+        return col.to_numpy(dtype=float)
+    parts = col.astype("string").str.extract(r"(\d+)['-](\d+)").astype(float)
+    return (parts[0] * 12 + parts[1]).to_numpy()
+
+
+def _number(col):
+    text = col.astype("string").str.replace("lbs", "", regex=False).str.strip()
+    return pd.to_numeric(text, errors="coerce").to_numpy(dtype=float)
+
+
+def parse_height(X):
+    """6'2" or 6-2 → 74 inches, column-wise (already-numeric columns pass
+    through). Unparseable values become NaN."""
+    return np.column_stack([_height_inches(X[c]) for c in X.columns])
+
+
+def parse_number(X):
+    """'225 lbs' → 225.0, '( N/A )' / 'N/A' → NaN, column-wise."""
+    return np.column_stack([_number(X[c]) for c in X.columns])
+
+
+def feature_frame(players):
+    """Raw model inputs for a list of player dicts or a DataFrame."""
+    df = players if isinstance(players, pd.DataFrame) else pd.DataFrame(list(players))
+    df = df.rename(columns={k: v for k, v in KEY_ALIASES.items() if v not in df.columns})
+    df = df.reindex(columns=FEATURES)
+    df["season"] = df["season"].fillna(CURRENT_SEASON)
+    df[CATEGORICAL_FEATURES] = df[CATEGORICAL_FEATURES].fillna("").astype(str)
+    return df
+
+
+def build_pipeline(**forest_params):
+    """Sparse one-hot + numeric parsing in front of the random forest."""
+    def numeric(parse):
+        return make_pipeline(
+            FunctionTransformer(parse, feature_names_out="one-to-one"),
+            SimpleImputer(strategy="median"),
+        )
+
+    preprocess = ColumnTransformer(
+        [
+            ("categorical", OneHotEncoder(handle_unknown="ignore"), CATEGORICAL_FEATURES),
+            ("height", numeric(parse_height), ["height"]),
+            ("numeric", numeric(parse_number), NUMERIC_FEATURES),
+        ],
+        sparse_threshold=1.0,
+    )
+    params = {"n_estimators": 300, "max_depth": None, "random_state": 42}
+    params.update(forest_params)
+    return Pipeline([
+        ("preprocess", preprocess),
+        ("forest", RandomForestClassifier(**params)),
+    ])
+
+
+def top_k_accuracy(model, X, y, k, probs=None):
+    """Share of rows whose true school is among the model's k most likely."""
+    if probs is None:
+        probs = model.predict_proba(X)
+    k = min(k, probs.shape[1])
+    top = np.argpartition(probs, -k, axis=1)[:, -k:]
+    hits = np.asarray(model.classes_)[top] == np.asarray(y)[:, None]
+    return hits.any(axis=1).mean()
+
+
+# ── Versions ─────────────────────────────────────────────────────────────────
+
+def current_version(model_dir=MODEL_DIR):
+    """Manifest of the published model version, or None before the first publish."""
+    try:
+        with open(Path(model_dir) / VERSIONS_DIR / CURRENT_POINTER, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def trained_keys(manifest, model_dir=MODEL_DIR):
+    """Row keys (training_data.row_keys) the published version was trained on."""
+    path = Path(model_dir) / VERSIONS_DIR / manifest["version"] / "trained_keys.parquet"
+    return pd.read_parquet(path)["key"]
+
+
+def publish_version(pipeline, keys, model_dir=MODEL_DIR, **info):
+    """Write pipeline + trained row keys as a new version, then repoint current.json.
+
+    The pointer is replaced atomically, so a serving process sees either the
+    old version or the complete new one. Only the newest KEEP_VERSIONS are kept.
+    """
+    versions = Path(model_dir) / VERSIONS_DIR
+    version = datetime.now().strftime("%Y%m%dT%H%M%S")
+    target = versions / version
+    target.mkdir(parents=True)
+    joblib.dump(pipeline, target / PIPELINE_FILE)  # uncompressed: loads faster
+    pd.DataFrame({"key": pd.Series(keys, dtype=str)}).to_parquet(
+        target / "trained_keys.parquet", index=False
+    )
+
+    manifest = {"version": version, "trees": len(pipeline.named_steps["forest"].estimators_),
+                "rows": len(keys), **info}
+    tmp = versions / (CURRENT_POINTER + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, versions / CURRENT_POINTER)
+
+    for old in sorted(p for p in versions.iterdir() if p.is_dir())[:-KEEP_VERSIONS]:
+        shutil.rmtree(old)
+    return manifest
+
+
+# ── Service ──────────────────────────────────────────────────────────────────
+
+class DestinationModel:
+    """A loaded destination pipeline (encoder + forest)."""
+
+    def __init__(self, pipeline, version=None):
+        self.pipeline = pipeline
+        self.version = version
+        self.classes = np.asarray(pipeline.classes_)
+
+    @classmethod
+    def load(cls, model_dir=MODEL_DIR):
+        """The published version, or the pipeline .pkl before the first publish."""
+        model_dir = Path(model_dir)
+        manifest = current_version(model_dir)
+        if manifest:
+            path = model_dir / VERSIONS_DIR / manifest["version"] / PIPELINE_FILE
+            return cls(joblib.load(path), manifest["version"])
+        return cls(joblib.load(model_dir / PIPELINE_FILE))
+
+    def predict_top_k_batch(self, players, k=3):
+        """Top-k schools for every player with a single predict_proba call.
+
+        Returns (schools, probabilities), both shaped (n_players, k) and sorted
+        best-first within each row.
+        """
+        probs = self.pipeline.predict_proba(feature_frame(players))
+        k = min(k, probs.shape[1])
+        top = np.argpartition(probs, -k, axis=1)[:, -k:]
+        top_probs = np.take_along_axis(probs, top, axis=1)
+        order = np.argsort(-top_probs, axis=1)
+        top = np.take_along_axis(top, order, axis=1)
+        return self.classes[top], np.take_along_axis(top_probs, order, axis=1)
+
+    def predict_top_k(self, player, k=3):
+        schools, probs = self.predict_top_k_batch([player], k)
+        return [
+            {"school": str(school), "probability": float(prob)}
+            for school, prob in zip(schools[0], probs[0])
+        ]
+
+    def describe_top_k(self, player, k=3):
+        """Same text run_model.py used to print, for the Crystal Ball prompt."""
+        top = self.predict_top_k(player, k)
+        lines = [f"Predicted School: {top[0]['school']}", "", f"Top {k} Predictions:"]
+        lines += [f"{p['school']}: {p['probability']:.2%}" for p in top]
+        return "\n".join(lines)
+
+
+_service = None
+_checked_at = 0.0
+
+
+def load_service(model_dir=MODEL_DIR):
+    """Load the model once per process and reuse it for every call.
+
+    At most every RELOAD_INTERVAL_S the published version is re-read; a newer
+    one is loaded and swapped in. Callers already holding the old object keep
+    using it until they finish.
+    """
+    global _service, _checked_at
+    now = time.monotonic()
+    if _service is None:
+        _service, _checked_at = DestinationModel.load(model_dir), now
+    elif now - _checked_at >= RELOAD_INTERVAL_S:
+        _checked_at = now
+        manifest = current_version(model_dir)
+        if manifest and manifest["version"] != _service.version:
+            _service = DestinationModel.load(model_dir)
+    return _service
+
+
+if __name__ == "__main__":
+    # Score every uncommitted entry in a portal CSV in one batch.
+    import sys
+
+    csv_path = sys.argv[1] if len(sys.argv) > 1 else "transfer_247_data/transfer_portal_247_2026.csv"
+    service = load_service()
+    portal = pd.read_csv(csv_path)
+    open_entries = portal[portal["to_school"].isna() | (portal["to_school"] == "N/A")]
+
+    start = time.perf_counter()
+    schools, probs = service.predict_top_k_batch(open_entries, k=3)
+    elapsed = time.perf_counter() - start
+
+    print(f"Scored {len(open_entries)} uncommitted players in {elapsed * 1000:.1f} ms")
+    for name, row_schools, row_probs in list(zip(open_entries["name"], schools, probs))[:10]:
+        picks = ", ".join(f"{s} {p:.0%}" for s, p in zip(row_schools, row_probs))
+        print(f"  {name:<28} {picks}")
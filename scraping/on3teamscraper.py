@@ -15,20 +15,45 @@ Usage:
     python scrape_all_portal.py --out portal_data
     python scrape_all_portal.py --visible
     python scrape_all_portal.py --delay 2.0        # seconds between requests
-    python scrape_all_portal.py --workers 3        # parallel browser instances
+    python scrape_all_portal.py --workers 3        # pages in parallel (one shared browser)
+    python scrape_all_portal.py --block none       # load everything (bandwidth baseline)
+    python scrape_all_portal.py --mode json        # read the list's JSON API (experimental)
+    python scrape_all_portal.py --fresh            # ignore checkpoints, rescrape all
+    python scrape_all_portal.py --parquet          # also write a .parquet file
+    python scrape_all_portal.py --parser bs4       # parse HTML with BeautifulSoup
+
+Each finished team is checkpointed (checkpoint.py), so a rerun after a crash
+only scrapes the teams that are missing or stale. Rows are appended to the
+output file(s) as each team finishes (row_writers.py) rather than collected
+for a single write at the end. In HTML mode pages are parsed with lxml by
+default (page_parsers.py); --parser bs4 selects the original BeautifulSoup
+parser, which returns the same rows.
+
+Each team is recorded in a run log (run_log.py): load and parse time, bytes,
+JSON pages or Load More rounds and rows, one JSON line per team, with a
+summary at the end (`python run_log.py` reports on the latest run).
 """
 
 import asyncio
 import argparse
 import csv
+import json
+import os
 import re
+import subprocess
 import time
 from pathlib import Path
 from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-from bs4 import BeautifulSoup
 from playwright.async_api import async_playwright
 
+from checkpoint import Checkpoint
+from page_parsers import BACKENDS, DEFAULT_BACKEND, parse_entries
+from row_writers import SCHEMA_ON3, RowWriter
+from run_log import RunLog
+from resource_blocking import DEFAULT_SPEC, BlockingRules, BlockStats, block_playwright
+
 # ---------------------------------------------------------------------------
 # Team name → On3 URL slug
 # ---------------------------------------------------------------------------
@@ -182,180 +207,528 @@ def build_url(slug, year=None, status=None):
     return url
 
 
-def parse_entries(html, team_name):
-    soup = BeautifulSoup(html, "html.parser")
-    entries = []
+# ---------------------------------------------------------------------------
+# JSON mode: read the data behind the list instead of clicking Load More
+# ---------------------------------------------------------------------------
+# The list is rendered from the page's Next.js data (__NEXT_DATA__) and each
+# Load More fetches the next page of the same JSON API. JSON mode reads the
+# first page from __NEXT_DATA__, clicks Load More once to learn the API URL,
+# then requests the remaining pages directly. Field names are matched
+# loosely (several candidates per column), and the payload schema has not
+# been checked against live responses, so JSON mode is opt-in (--mode json).
+# Whenever the list might be incomplete (no paged API seen after Load More,
+# a page that failed, fewer entries than the payload's stated total),
+# IncompleteList is raised and the scraper falls back to the HTML path
+# rather than checkpointing a partial team.
+
+LOAD_MORE = (
+    "button:has-text('Load More'), "
+    "a:has-text('Load More'), "
+    "button:has-text('load more')"
+)
+PAGE_PARAMS = ("page", "pageNumber", "pageIndex")
+TOTAL_KEYS = ("totalCount", "totalItems", "totalResults", "total")
+JSON_PAGE_CONCURRENCY = 4
+
+STATUSES = ["Entered", "Committed", "Withdrawn", "Signed", "Enrolled", "Expected"]
+
+JSON_FIELDS = {
+    "Name":       ["player.fullName", "player.name", "fullName", "name"],
+    "Slug":       ["player.slug", "slug"],
+    "Position":   ["player.positionAbbreviation", "player.position.abbr",
+                   "positionAbbreviation", "position.abbr", "position"],
+    "Year/Class": ["player.classRank", "player.classYear", "classRank", "classYear"],
+    "Status":     ["status.name", "status.type", "transferStatus", "status"],
+    "Date":       ["transferEntered", "enteredDate", "portalEntryDate", "date"],
+    "From Team":  ["lastTeam.fullName", "lastTeam.name", "fromOrganization.fullName",
+                   "fromOrganization.name", "fromTeam.name"],
+    "To Team":    ["commitTeam.fullName", "commitTeam.name", "toOrganization.fullName",
+                   "toOrganization.name", "toTeam.name"],
+    "Rating":     ["transferRating.rating", "player.transferRating", "rating.rating",
+                   "rating", "player.rating"],
+    "High School": ["player.highSchool.name", "highSchool.name", "highSchoolName"],
+}
+
+
+def _get(obj, path):
+    for key in path.split("."):
+        if not isinstance(obj, dict) or key not in obj:
+            return None
+        obj = obj[key]
+    return obj
+
+
+def _first(obj, paths):
+    for path in paths:
+        value = _get(obj, path)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _looks_like_entry(item):
+    return isinstance(item, dict) and _first(item, JSON_FIELDS["Name"]) is not None \
+        and _first(item, JSON_FIELDS["Status"] + JSON_FIELDS["From Team"]) is not None
+
+
+def find_entry_lists(payload):
+    """Every list in a JSON payload whose items look like portal entries."""
+    if isinstance(payload, list):
+        if payload and all(_looks_like_entry(i) for i in payload[:5]):
+            yield payload
+            return
+        for item in payload:
+            yield from find_entry_lists(item)
+    elif isinstance(payload, dict):
+        for value in payload.values():
+            yield from find_entry_lists(value)
+
+
+def _portal_date(value):
+    if not value:
+        return ""
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).strftime("%-m/%-d/%Y")
+    except ValueError:
+        return str(value)
+
+
+def entry_from_json(item, team_name):
+    """Map one JSON list item onto the same columns parse_entries produces."""
+    name = _first(item, JSON_FIELDS["Name"])
+    if not isinstance(name, str):
+        return None
+    status_raw = str(_first(item, JSON_FIELDS["Status"]) or "")
+    status = next((s for s in STATUSES if s.lower() in status_raw.lower()), "")
+    rating = _first(item, JSON_FIELDS["Rating"])
+    slug = _first(item, JSON_FIELDS["Slug"])
+    return {
+        "School":              team_name,
+        "Name":                name.strip(),
+        "Position":            str(_first(item, JSON_FIELDS["Position"]) or ""),
+        "Year/Class":          str(_first(item, JSON_FIELDS["Year/Class"]) or ""),
+        "Status":              status,
+        "Date Entered Portal": _portal_date(_first(item, JSON_FIELDS["Date"])),
+        "From Team":           str(_first(item, JSON_FIELDS["From Team"]) or ""),
+        "To Team":             str(_first(item, JSON_FIELDS["To Team"]) or ""),
+        "Rating":              f"{float(rating):.2f}" if isinstance(rating, (int, float)) else "",
+        "High School":         str(_first(item, JSON_FIELDS["High School"]) or ""),
+        "Profile URL":         f"https://www.on3.com/rivals/{slug}/" if slug else "",
+    }
+
+
+def _page_param(url):
+    query = dict(parse_qsl(urlsplit(url).query))
+    return next((p for p in PAGE_PARAMS if p in query), None)
+
+
+def _with_page(url, param, number):
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query[param] = str(number)
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _page_count(payload):
+    """Total pages if the payload says so, else None."""
+    for key in ("pageCount", "totalPages", "pages"):
+        for found in _find_key(payload, key):
+            if isinstance(found, int):
+                return found
+    return None
+
+
+def _stated_total(payload):
+    """Total entries if the payload says so, else None."""
+    for key in TOTAL_KEYS:
+        for found in _find_key(payload, key):
+            if isinstance(found, int) and not isinstance(found, bool):
+                return found
+    return None
+
+
+class IncompleteList(Exception):
+    """The JSON pages read may not hold the whole list."""
+
+
+def _find_key(payload, key):
+    if isinstance(payload, dict):
+        if key in payload:
+            yield payload[key]
+        for value in payload.values():
+            yield from _find_key(value, key)
+    elif isinstance(payload, list):
+        for value in payload:
+            yield from _find_key(value, key)
+
+
+async def read_json_entries(page, captured, team_name, unit):
+    """Entries from __NEXT_DATA__ plus every page of the list's JSON API.
+
+    `captured` collects JSON responses seen since before page.goto; load
+    and parse time and the number of payloads read go to `unit`.
+    """
+    with unit.timing("network"):
+        payloads = await _read_json_payloads(page, captured)
+    unit.add(rounds=len(payloads))
+
+    with unit.timing("parse"):
+        entries = []
+        for payload in payloads:
+            for items in find_entry_lists(payload or {}):
+                entries += [e for e in (entry_from_json(i, team_name) for i in items) if e]
+    # Falling back to HTML on a stray "total" is cheap; checkpointing a
+    # partial team is not.
+    totals = [t for t in map(_stated_total, payloads) if t is not None]
+    if totals and len(entries) < max(totals):
+        raise IncompleteList(f"{len(entries)} entries, the API says {max(totals)}")
+    return entries
+
 
-    for item in soup.select("ol > li"):
+async def _read_json_payloads(page, captured):
+    payloads = []
+    next_data = await page.evaluate(
+        "() => document.getElementById('__NEXT_DATA__')?.textContent || null"
+    )
+    if next_data:
+        payloads.append(json.loads(next_data))
+
+    # One click makes the page request page 2 of its API; read that URL.
+    btn = await page.query_selector(LOAD_MORE)
+    if not (btn and await btn.is_visible()):
+        return payloads  # one page: __NEXT_DATA__ holds the whole list
+    await btn.click()
+    try:
+        await page.wait_for_event(
+            "response", lambda r: _page_param(r.url) is not None, timeout=15000
+        )
+    except Exception:
+        pass
+
+    # The newest paged response that actually holds portal entries, so an
+    # unrelated paged endpoint (ads, news) is never walked instead.
+    first = body = None
+    for response in reversed([r for r in captured if _page_param(r.url)]):
         try:
-            name_tag = item.select_one("a[href*='/rivals/']")
-            if not name_tag:
-                continue
-            name = name_tag.get_text(strip=True)
-            profile_url = "https://www.on3.com" + name_tag["href"]
-            text = item.get_text(" ", strip=True)
-
-            pos_match = re.search(
-                r'\b(QB|RB|WR|TE|OT|IOL|OL|EDGE|DL|LB|CB|S|ATH|K|P|LS)\b', text
-            )
-            position = pos_match.group(1) if pos_match else ""
-
-            year_match = re.search(r'\b(RS-[A-Z]{2}|FR|SO|JR|SR)\b', text)
-            year_class = year_match.group(1) if year_match else ""
-
-            status = ""
-            for s in ["Entered", "Committed", "Withdrawn", "Signed", "Enrolled", "Expected"]:
-                if re.search(s, text, re.IGNORECASE):
-                    status = s
-                    break
-
-            date_match = re.search(r'(\d{1,2}/\d{1,2}/\d{4})', text)
-            portal_date = date_match.group(1) if date_match else ""
-
-            ratings = re.findall(r'\b(\d{2}\.\d{2})\b', text)
-            rating = ratings[0] if ratings else ""
-
-            team_imgs = item.select("img[alt]")
-            team_names = [
-                img["alt"].replace(" Avatar", "").strip()
-                for img in team_imgs
-                if "Avatar" in img.get("alt", "") and img["alt"] != "Default Avatar"
-            ]
-            from_team = team_names[0] if len(team_names) > 0 else ""
-            to_team   = team_names[1] if len(team_names) > 1 else ""
-
-            hs_tag = item.select_one("a[href*='/high-school/']")
-            high_school = hs_tag.get_text(strip=True) if hs_tag else ""
-
-            entries.append({
-                "School":              team_name,
-                "Name":                name,
-                "Position":            position,
-                "Year/Class":          year_class,
-                "Status":              status,
-                "Date Entered Portal": portal_date,
-                "From Team":           from_team,
-                "To Team":             to_team,
-                "Rating":              rating,
-                "High School":         high_school,
-                "Profile URL":         profile_url,
-            })
+            candidate = await response.json()
         except Exception:
             continue
+        if any(find_entry_lists(candidate)):
+            first, body = response, candidate
+            break
+    if first is None:
+        raise IncompleteList("Load More was clicked but no paged list API was seen")
+
+    payloads.append(body)
+    param = _page_param(first.url)
+    current = int(dict(parse_qsl(urlsplit(first.url).query))[param])
+    total = _page_count(body)
+    sem = asyncio.Semaphore(JSON_PAGE_CONCURRENCY)
+
+    async def fetch(number):
+        async with sem:
+            resp = await page.request.get(_with_page(first.url, param, number))
+            if not resp.ok:
+                raise IncompleteList(f"page {number} of the list API: HTTP {resp.status}")
+            return await resp.json()
 
-    return entries
+    if total:
+        payloads += await asyncio.gather(*(fetch(n) for n in range(current + 1, total + 1)))
+    else:
+        # No page count in the payload: walk forward until a page is empty.
+        number = current + 1
+        while True:
+            body = await fetch(number)
+            if not any(find_entry_lists(body)):
+                break
+            payloads.append(body)
+            number += 1
+    return payloads
+
+
+FIELDNAMES = [
+    "School", "Name", "Position", "Year/Class", "Status", "Date Entered Portal",
+    "From Team", "To Team", "Rating", "High School", "Profile URL",
+]
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+
+class PagePool:
+    """One browser per run; `size` pages (each in its own context) reused
+    across teams. Checking a page out of the pool also bounds concurrency,
+    so no separate semaphore is needed. Every context drops requests matching
+    `rules` and counts its traffic in `stats[page]`."""
+
+    def __init__(self, browser, size, rules=None):
+        self.browser = browser
+        self.size = size
+        self.rules = rules or BlockingRules()
+        self.stats = {}
+        self._idle = asyncio.Queue()
+
+    async def open(self):
+        for _ in range(self.size):
+            self._idle.put_nowait(await self._new_page())
+        return self
+
+    async def _new_page(self):
+        context = await self.browser.new_context(user_agent=USER_AGENT)
+        stats = BlockStats()
+        await block_playwright(context, self.rules, stats)
+        page = await context.new_page()
+        self.stats[page] = stats
+        return page
+
+    async def acquire(self):
+        # None is a slot whose replacement page could not be created; try
+        # again now, and hand the slot back if it still fails.
+        page = await self._idle.get()
+        if page is None:
+            try:
+                page = await self._new_page()
+            except BaseException:
+                self._idle.put_nowait(None)
+                raise
+        return page
+
+    async def release(self, page, broken=False):
+        # A page that errored mid-navigation may be wedged; swap in a fresh
+        # one. The slot always goes back to the queue, whatever fails here.
+        if not (broken or page.is_closed()):
+            self._idle.put_nowait(page)
+            return
+        replacement = None
+        try:
+            await page.context.close()
+        except Exception as e:
+            print(f"  ⚠️  Could not close a broken page: {e}")
+        try:
+            replacement = await self._new_page()
+        except Exception as e:
+            print(f"  ⚠️  Could not open a replacement page (retrying on next use): {e}")
+        finally:
+            self._idle.put_nowait(replacement)
 
+    def totals(self):
+        total = BlockStats()
+        for stats in self.stats.values():
+            total.merge(stats)
+        return total
 
-async def scrape_team(slug, team_name, year=None, status=None, headless=True, sem=None):
-    """Scrape a single team's portal page. Uses semaphore if provided."""
-    url = build_url(slug, year, status)
 
-    async def _do():
-        async with async_playwright() as pw:
-            browser = await pw.chromium.launch(headless=headless)
-            context = await browser.new_context(
-                user_agent=(
-                    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/120.0.0.0 Safari/537.36"
-                )
-            )
-            page = await context.new_page()
+# Per-team {"mb", "blocked", "source"}, filled in by scrape_team.
+team_info = {}
 
-            try:
-                await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-                await page.wait_for_timeout(3000)
 
-                clicks = 0
-                while True:
-                    btn = await page.query_selector(
-                        "button:has-text('Load More'), "
-                        "a:has-text('Load More'), "
-                        "button:has-text('load more')"
-                    )
-                    if not btn or not await btn.is_visible():
-                        break
-
-                    clicks += 1
-                    before_count = await page.locator("ol > li").count()
-                    await btn.scroll_into_view_if_needed()
-                    await btn.click()
-
-                    try:
-                        await page.wait_for_function(
-                            f"document.querySelectorAll('ol > li').length > {before_count}",
-                            timeout=15000,
-                        )
-                    except Exception:
-                        break
-
-                    await page.wait_for_timeout(800)
+async def load_all_html(page):
+    """Click Load More until it disappears; returns the number of clicks."""
+    clicks = 0
+    while True:
+        btn = await page.query_selector(LOAD_MORE)
+        if not btn or not await btn.is_visible():
+            break
 
-                html = await page.content()
-            finally:
-                await browser.close()
+        clicks += 1
+        before_count = await page.locator("ol > li").count()
+        await btn.scroll_into_view_if_needed()
+        await btn.click()
 
-        entries = parse_entries(html, team_name)
+        try:
+            await page.wait_for_function(
+                f"document.querySelectorAll('ol > li').length > {before_count}",
+                timeout=15000,
+            )
+        except Exception:
+            break
 
-        # dedup
-        seen, unique = set(), []
-        for e in entries:
-            key = (e["Name"], e["Status"], e["Date Entered Portal"])
-            if key not in seen:
-                seen.add(key)
-                unique.append(e)
-        return unique
+        await page.wait_for_timeout(800)
+    return clicks
 
-    if sem:
-        async with sem:
-            return await _do()
-    else:
-        return await _do()
 
+async def scrape_team(pool, slug, team_name, year=None, status=None, mode="html",
+                      parser=DEFAULT_BACKEND, run_log=None):
+    """Scrape a single team's portal page on a page borrowed from the pool.
 
-async def scrape_all(teams, year=None, status=None, headless=True, delay=1.5, workers=3):
-    sem = asyncio.Semaphore(workers)
-    results = {}
+    mode="html" clicks Load More until it is gone and parses the page.
+    mode="json" reads the list's JSON data instead and falls back to the HTML
+    path when that yields nothing or may be incomplete. The team is
+    recorded in run_log (run_log.py), if given, from when it gets a page.
+    """
+    url = build_url(slug, year, status)
+    page = await pool.acquire()
+    unit = (run_log or RunLog("on3", path=None)).unit(team_name, year)
+    stats = pool.stats[page]
+    before = (stats.bytes_downloaded, sum(stats.blocked.values()), stats.requests)
+    error = None
+    source = "html"
+
+    captured = []
+
+    def on_response(response):
+        if "json" in response.headers.get("content-type", ""):
+            captured.append(response)
+
+    if mode == "json":
+        page.on("response", on_response)
+    try:
+        with unit.timing("network"):
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        entries = []
+        if mode == "json":
+            try:
+                entries = await read_json_entries(page, captured, team_name, unit)
+                source = "json"
+            except Exception as e:
+                print(f"  {team_name}: JSON mode failed ({e}); using HTML")
+        if not entries:
+            source = "html"
+            with unit.timing("network"):
+                await page.wait_for_timeout(3000)
+                clicks = await load_all_html(page)
+                html = await page.content()
+            unit.add(rounds=clicks + 1)
+            with unit.timing("parse"):
+                entries = parse_entries(html, team_name, backend=parser)
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        if mode == "json":
+            page.remove_listener("response", on_response)
+        team_info[team_name] = {
+            "mb": (stats.bytes_downloaded - before[0]) / 1e6,
+            "blocked": sum(stats.blocked.values()) - before[1],
+            "source": source,
+        }
+        unit.add(bytes=stats.bytes_downloaded - before[0],
+                 requests=stats.requests - before[2])
+        if error is not None:
+            unit.finish(error=error)
+        await pool.release(page, broken=error is not None)
+
+    # dedup
+    seen, unique = set(), []
+    for e in entries:
+        key = (e["Name"], e["Status"], e["Date Entered Portal"])
+        if key not in seen:
+            seen.add(key)
+            unique.append(e)
+    unit.finish(rows=len(unique), source=source)
+    return unique
+
+
+def checkpoint_scope(year=None, status=None):
+    return f"{year or 'all'}" + (f"_{status}" if status else "")
+
+
+async def scrape_all(teams, writer, year=None, status=None, headless=True, delay=1.5,
+                     workers=3, block=DEFAULT_SPEC, mode="html", checkpoint=None,
+                     per_team_dir=None, parser=DEFAULT_BACKEND, throttle=None, run_log=None):
+    """Scrape teams, streaming each team's rows into writer as it finishes.
+
+    throttle, if given, is awaited before each team's page load (a rate
+    limit shared with other scrapes, e.g. orchestrator.py's per-domain
+    token bucket). Teams scraped are recorded in run_log, if given.
+    Returns {team: entry count}.
+    """
+    counts = {}
     total = len(teams)
+    checkpoint = checkpoint or Checkpoint("on3", FIELDNAMES)
+    scope = checkpoint_scope(year, status)
+
+    def emit(name, entries):
+        counts[name] = len(entries)
+        writer.write(entries)
+        if per_team_dir:
+            save_team_csv(entries, per_team_dir, name)
+
+    todo = {}
+    for name, slug in teams.items():
+        if checkpoint.is_done(scope, name):
+            emit(name, checkpoint.load_rows(scope, name))
+        else:
+            todo[name] = slug
+    print(f"  {len(counts)}/{total} teams already checkpointed\n")
+    if not todo:
+        return counts
+
+    async with async_playwright() as pw:
+        browser = await pw.chromium.launch(headless=headless)
+        pool = await PagePool(browser, workers, BlockingRules.from_spec(block)).open()
+
+        async def bounded(name, slug):
+            try:
+                if throttle:
+                    await throttle()
+                entries = await scrape_team(pool, slug, name, year=year, status=status,
+                                            mode=mode, parser=parser, run_log=run_log)
+                checkpoint.save(scope, name, entries)
+            except Exception as e:
+                print(f"  ✗ {name}: {e}")
+                checkpoint.fail(scope, name, e)
+                entries = []
+            emit(name, entries)
+            done = len(counts)
+            info = team_info.get(name, {"mb": 0, "blocked": 0, "source": "-"})
+            print(f"  [{done:>3}/{total}] {name:<35} → {len(entries)} entries  "
+                  f"({info['source']}, {info['mb']:.1f} MB, {info['blocked']} blocked)")
+            await asyncio.sleep(delay)
 
-    async def bounded(name, slug):
-        entries = await scrape_team(slug, name, year=year, status=status,
-                                    headless=headless, sem=sem)
-        results[name] = entries
-        done = len(results)
-        print(f"  [{done:>3}/{total}] {name:<35} → {len(entries)} entries")
-        await asyncio.sleep(delay)
+        try:
+            tasks = [bounded(name, slug) for name, slug in todo.items()]
+            await asyncio.gather(*tasks)
+        finally:
+            print(f"\nNetwork: {pool.totals().summary()}")
+            await browser.close()
+    return counts
 
-    tasks = [bounded(name, slug) for name, slug in teams.items()]
-    await asyncio.gather(*tasks)
-    return results
 
+# ---------------------------------------------------------------------------
+# Run stats: wall time and peak RSS of this process + Playwright + Chromium
+# ---------------------------------------------------------------------------
 
-def save_combined_csv(all_entries, filepath):
-    flat = [e for entries in all_entries.values() for e in entries]
-    if not flat:
-        print("No entries to save.")
+def process_tree_rss_mb(root_pid):
+    """Total RSS of root_pid and all its descendants (uses `ps`, so it works
+    on macOS and Linux)."""
+    out = subprocess.run(["ps", "-A", "-o", "pid=,ppid=,rss="],
+                         capture_output=True, text=True).stdout
+    children, rss = {}, {}
+    for line in out.splitlines():
+        pid, ppid, kb = (int(v) for v in line.split())
+        children.setdefault(ppid, []).append(pid)
+        rss[pid] = kb
+    total, stack = 0, [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total / 1024
+
+
+async def track_peak_rss(stats, interval=1.0):
+    """Sample the process tree RSS until cancelled; keeps the max in stats."""
+    pid = os.getpid()
+    while True:
+        rss = await asyncio.to_thread(process_tree_rss_mb, pid)
+        stats["peak_rss_mb"] = max(stats.get("peak_rss_mb", 0.0), rss)
+        await asyncio.sleep(interval)
+
+
+def save_team_csv(entries, out_dir, team):
+    if not entries:
         return
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=list(flat[0].keys()))
-        writer.writeheader()
-        writer.writerows(flat)
-    print(f"\nCombined CSV saved → {filepath}  ({len(flat)} total rows)")
-
-
-def save_per_team_csvs(all_entries, out_dir):
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
-    for team, entries in all_entries.items():
-        if not entries:
-            continue
-        safe = re.sub(r'[^a-z0-9]+', '_', team.lower()).strip('_')
-        path = out_dir / f"{safe}.csv"
-        with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=list(entries[0].keys()))
-            writer.writeheader()
-            writer.writerows(entries)
-    print(f"Per-team CSVs saved → {out_dir}/")
+    safe = re.sub(r'[^a-z0-9]+', '_', team.lower()).strip('_')
+    with open(out_dir / f"{safe}.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDNAMES, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(entries)
 
 
 def parse_args():
@@ -373,7 +746,24 @@ def parse_args():
     p.add_argument("--delay",   type=float, default=1.5,
                    help="Seconds to sleep after each team (default: 1.5)")
     p.add_argument("--workers", type=int, default=3,
-                   help="Parallel browser instances (default: 3)")
+                   help="Pages scraped in parallel in the shared browser (default: 3)")
+    p.add_argument("--block",   default=DEFAULT_SPEC,
+                   help=f"Requests to drop: resource types and/or 'trackers', "
+                        f"or 'none' (default: {DEFAULT_SPEC})")
+    p.add_argument("--mode",    choices=["json", "html"], default="html",
+                   help="html: click Load More and parse the page; json: read the "
+                        "list's JSON API, falling back to HTML (experimental; "
+                        "default: html)")
+    p.add_argument("--stale-after", type=float, default=6,
+                   help="Hours before a checkpointed current-season team is "
+                        "re-scraped (default: 6)")
+    p.add_argument("--fresh", action="store_true",
+                   help="Ignore checkpoints and scrape every team again")
+    p.add_argument("--parquet", action="store_true",
+                   help="Also write the combined output as Parquet (zstd)")
+    p.add_argument("--parser",  choices=BACKENDS, default=DEFAULT_BACKEND,
+                   help=f"HTML parser backend, also used by the --mode json "
+                        f"fallback (default: {DEFAULT_BACKEND})")
     return p.parse_args()
 
 
@@ -392,33 +782,54 @@ async def main():
 
     print(f"\nScraping {len(teams)} team(s)...")
     print(f"  year={args.year or 'all'}  status={args.status or 'all'}  "
-          f"workers={args.workers}  delay={args.delay}s\n")
-
-    start = time.time()
-    all_entries = await scrape_all(
-        teams,
-        year=args.year,
-        status=args.status,
-        headless=not args.visible,
-        delay=args.delay,
-        workers=args.workers,
-    )
-    elapsed = time.time() - start
-    print(f"\nFinished in {elapsed:.1f}s")
+          f"workers={args.workers}  delay={args.delay}s  block={args.block}  mode={args.mode}  "
+          f"parser={args.parser}\n")
 
     suffix = (f"_{args.year}" if args.year else "") + (f"_{args.status}" if args.status else "")
     combined_path = args.out + suffix + ".csv"
-    save_combined_csv(all_entries, combined_path)
+    per_team_dir = args.out + suffix + "_by_team" if args.per_team else None
+
+    start = time.time()
+    stats = {}
+    run_log = RunLog("on3", args=vars(args))
+    monitor = asyncio.create_task(track_peak_rss(stats))
+    try:
+        with RowWriter(combined_path, FIELDNAMES,
+                       parquet=args.out + suffix + ".parquet" if args.parquet else None,
+                       schema=SCHEMA_ON3) as writer:
+            counts = await scrape_all(
+                teams,
+                writer,
+                year=args.year,
+                status=args.status,
+                headless=not args.visible,
+                delay=args.delay,
+                workers=args.workers,
+                block=args.block,
+                mode=args.mode,
+                checkpoint=Checkpoint("on3", FIELDNAMES, stale_after=args.stale_after * 3600,
+                                      fresh=args.fresh),
+                per_team_dir=per_team_dir,
+                parser=args.parser,
+                run_log=run_log,
+            )
+    finally:
+        monitor.cancel()
+        run_log.close()
+    elapsed = time.time() - start
+    print(f"\nFinished in {elapsed:.1f}s  (peak RSS {stats.get('peak_rss_mb', 0):.0f} MB, "
+          f"browser + {args.workers} pages)")
 
-    if args.per_team:
-        save_per_team_csvs(all_entries, args.out + suffix + "_by_team")
+    print(f"\nCombined CSV saved → {combined_path}  ({writer.rows} total rows)")
+    if per_team_dir:
+        print(f"Per-team CSVs saved → {per_team_dir}/")
 
     # summary
-    total_entries = sum(len(v) for v in all_entries.values())
-    empty_teams   = [t for t, v in all_entries.items() if not v]
-    print(f"\nSummary: {total_entries} total entries across {len(teams)} teams")
+    empty_teams = [t for t, n in counts.items() if not n]
+    print(f"\nSummary: {writer.rows} total entries across {len(teams)} teams")
     if empty_teams:
         print(f"  Teams with 0 entries ({len(empty_teams)}): {', '.join(sorted(empty_teams))}")
+    print(f"\n{run_log.report()}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,359 @@
+"""
+Scrape orchestrator
+===================
+Runs the 247, On3 and ESPN scrapers as one job queue instead of three
+scripts with their own delays, then refreshes everything built from their
+output. Each job is one scrape unit:
+
+    247   one season             247teamscraper.scrape_season
+    on3   one year               on3teamscraper.scrape_all
+    espn  one season × category  espnstats.fetch / espnstats.save
+
+Scheduling:
+    - Jobs run in priority order: the current season first, then past
+      seasons newest first, so fresh data lands before the backfill.
+    - At most --workers jobs run at once, and at most SOURCE_SLOTS[source]
+      per source (each On3 year drives its own browser).
+    - Every request to a domain goes through one token bucket per domain
+      (DOMAIN_RATES), shared by all jobs of that source, in place of each
+      scraper's fixed sleeps.
+    - A job that fails, or leaves teams unscraped, is retried with
+      exponential backoff (--retries). Checkpoints (checkpoint.py) mean a
+      retry only scrapes what is missing. A season file is only replaced
+      once every team is in, or on the last attempt.
+
+Output goes where dataset.py reads it (transfer_247_data/,
+transfer_on3_data/, espn_cfb_stats/). Afterwards the Parquet dataset is
+rebuilt, which the app picks up within dataset.RELOAD_INTERVAL_S. The
+Crystal Ball table is rebuilt too, or, with --refresh-model, the model
+is refreshed first (refresh_model.py rebuilds the table itself).
+
+Every job attempt, and every team or page inside it, is recorded in one run
+log (run_log.py), so `python run_log.py` shows where the run's time went.
+
+The Twitter monitor (twitter_scraper/) is a long-running logged-in session,
+not a batch of units, and is not scheduled here.
+
+Usage:
+    python orchestrator.py                          # everything, current season first
+    python orchestrator.py --seasons 2026           # just the current season
+    python orchestrator.py --sources 247 espn --workers 4
+    python orchestrator.py --refresh-model
+"""
+
+import argparse
+import asyncio
+import importlib
+import random
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import dataset
+from checkpoint import Checkpoint
+from fetch_engine import FetchEngine, TokenBucket
+from http_cache import CURRENT_SEASON, HttpCache, season_policy
+from row_writers import SCHEMA_247, SCHEMA_ON3, RowWriter
+from run_log import RunLog
+
+SOURCES = ("247", "on3", "espn")
+
+# Default seasons per source (On3 lists start in 2020).
+SEASONS = {
+    "247": list(range(CURRENT_SEASON, 2017, -1)),
+    "on3": list(range(CURRENT_SEASON, 2019, -1)),
+    "espn": list(range(CURRENT_SEASON, 2017, -1)),
+}
+
+# Requests (247) or page loads (On3 teams, ESPN pages) per second, per domain.
+DOMAIN_RATES = {
+    "247sports.com": 2.0,
+    "www.on3.com": 1.0,
+    "www.espn.com": 0.5,
+}
+
+# Jobs of one source allowed to run at once.
+SOURCE_SLOTS = {"247": 2, "on3": 1, "espn": 3}
+
+OUTPUT_247 = "transfer_247_data/transfer_portal_247_{season}.csv"
+OUTPUT_ON3 = "transfer_on3_data/transfer_portal_on3_{season}.csv"
+
+
+class Incomplete(Exception):
+    """A unit finished but left part of its work undone; worth retrying."""
+
+
+class Job:
+    def __init__(self, source, season, label, run):
+        self.source = source
+        self.season = season
+        self.label = label
+        self.run = run  # async (job) -> rows written
+        self.priority = CURRENT_SEASON - season  # 0 = current season
+        self.attempts = 0
+        self.final = False  # set on the last attempt
+        self.not_before = 0.0
+        self.rows = None
+        self.error = None
+
+
+class Orchestrator:
+    def __init__(self, workers=4, slots=SOURCE_SLOTS, retries=2, backoff=30.0, run_log=None):
+        self.workers = workers
+        self.slots = slots
+        self.retries = retries
+        self.backoff = backoff
+        self.run_log = run_log or RunLog("orchestrator", path=None)
+        self.pending = []
+        self.done = []
+        self.failed = []
+        self.active = {source: 0 for source in slots}
+
+    def add(self, job):
+        job.seq = len(self.pending) + len(self.done) + len(self.failed)
+        self.pending.append(job)
+
+    def _next(self, now):
+        """Highest-priority job that may start now, or None."""
+        for job in sorted(self.pending, key=lambda j: (j.priority, j.seq)):
+            if job.not_before <= now and self.active[job.source] < self.slots[job.source]:
+                return job
+        return None
+
+    async def _attempt(self, job):
+        job.attempts += 1
+        job.final = job.attempts > self.retries
+        unit = self.run_log.unit(job.label, scraper="job")
+        unit.add(retries=int(job.attempts > 1))  # one record per attempt; sums to the retries
+        try:
+            job.rows = await job.run(job)
+            job.error = None
+            unit.finish(rows=job.rows)
+        except Exception as e:
+            job.error = e
+            unit.finish(error=e)
+
+    async def run(self):
+        running = {}
+        while self.pending or running:
+            now = time.monotonic()
+            while len(running) < self.workers and (job := self._next(now)):
+                self.pending.remove(job)
+                self.active[job.source] += 1
+                print(f"▶ {job.label}" + (f" (attempt {job.attempts + 1})" if job.attempts else ""))
+                running[asyncio.create_task(self._attempt(job))] = job
+
+            waits = [j.not_before - now for j in self.pending if j.not_before > now]
+            timeout = min(waits) if waits else None
+            if not running:
+                await asyncio.sleep(timeout or 0)
+                continue
+            finished, _ = await asyncio.wait(running, timeout=timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                job = running.pop(task)
+                self.active[job.source] -= 1
+                if job.error is None:
+                    self.done.append(job)
+                    print(f"✓ {job.label}: {job.rows} rows")
+                elif not job.final:
+                    delay = self.backoff * 2 ** (job.attempts - 1) * random.uniform(0.5, 1.5)
+                    job.not_before = time.monotonic() + delay
+                    self.pending.append(job)
+                    print(f"✗ {job.label}: {job.error} — retrying in {delay:.0f}s")
+                else:
+                    self.failed.append(job)
+                    print(f"✗ {job.label}: {job.error} — giving up")
+
+
+# ── Units ────────────────────────────────────────────────────────────────────
+
+class Context:
+    """What jobs of one run share: cache, rate limits, engines and drivers."""
+
+    def __init__(self, args, run_log):
+        self.args = args
+        self.run_log = run_log
+        self.cache = HttpCache(policy=season_policy(current_ttl=args.current_ttl))
+        self.buckets = {domain: TokenBucket(rate) for domain, rate in DOMAIN_RATES.items()}
+        self.engine = None
+        self.espn_pool = None
+        self.espn_threads = None
+
+    async def __aenter__(self):
+        if "247" in self.args.sources:
+            self.s247 = importlib.import_module("247teamscraper")
+            self.engine = await FetchEngine(
+                concurrency=self.args.concurrency, rate=DOMAIN_RATES["247sports.com"],
+                headers=self.s247.HEADERS, cache=self.cache,
+            ).__aenter__()
+            self.checkpoint_247 = Checkpoint("247", self.s247.FIELDNAMES)
+        if "on3" in self.args.sources:
+            self.on3 = importlib.import_module("on3teamscraper")
+            self.checkpoint_on3 = Checkpoint("on3", self.on3.FIELDNAMES)
+        if "espn" in self.args.sources:
+            self.espn = importlib.import_module("espnstats")
+            self.espn_pool = self.espn.DriverPool()
+            self.espn_threads = ThreadPoolExecutor(max_workers=SOURCE_SLOTS["espn"])
+        return self
+
+    async def __aexit__(self, *exc):
+        if self.engine:
+            await self.engine.__aexit__(*exc)
+        if self.espn_pool:
+            self.espn_threads.shutdown()
+            self.espn_pool.quit()
+
+
+async def run_247(ctx, job):
+    s247, checkpoint = ctx.s247, ctx.checkpoint_247
+    path = dataset.DATA_DIR / OUTPUT_247.format(season=job.season)
+    with RowWriter(path, s247.FIELDNAMES, schema=SCHEMA_247) as writer:
+        await s247.scrape_season(ctx.engine, job.season, checkpoint, writer, ctx.args.parser,
+                                 ctx.run_log)
+        missing = [t for t in s247.TEAMS if not checkpoint.is_done(job.season, t)]
+        if missing and not job.final:
+            raise Incomplete(f"{len(missing)} teams not scraped")  # keeps the old file
+    return writer.rows
+
+
+async def run_on3(ctx, job):
+    on3, checkpoint = ctx.on3, ctx.checkpoint_on3
+    path = dataset.DATA_DIR / OUTPUT_ON3.format(season=job.season)
+    scope = on3.checkpoint_scope(job.season)
+    with RowWriter(path, on3.FIELDNAMES, schema=SCHEMA_ON3) as writer:
+        await on3.scrape_all(on3.TEAM_SLUGS, writer, year=job.season, delay=0,
+                             checkpoint=checkpoint, parser=ctx.args.parser,
+                             throttle=ctx.buckets["www.on3.com"].acquire,
+                             run_log=ctx.run_log)
+        missing = [t for t in on3.TEAM_SLUGS if not checkpoint.is_done(scope, t)]
+        if missing and not job.final:
+            raise Incomplete(f"{len(missing)} teams not scraped")
+    return writer.rows
+
+
+async def run_espn(ctx, job, category):
+    espn, loop = ctx.espn, asyncio.get_running_loop()
+    name, url = espn.page_name(category, job.season), espn.stats_url(category, job.season)
+    unit = ctx.run_log.unit(category, job.season, scraper="espn")
+    # espn.fetch only handles WebDriverException; whatever else escapes it (or
+    # save) still finishes the page's unit before the job is retried.
+    try:
+        entry = ctx.cache.get(url)
+        if entry and ctx.cache.is_fresh(entry):
+            ctx.cache.stats.fresh += 1
+            unit.note(cache="fresh")
+            html = ctx.cache.body(entry)
+        else:
+            await ctx.buckets["www.espn.com"].acquire()
+            html, _, _, _ = await loop.run_in_executor(
+                ctx.espn_threads, espn.fetch, ctx.espn_pool, name, url, unit
+            )
+            if html is None:
+                raise Incomplete("page did not load fully")
+            ctx.cache.store(url, html)
+        out_dir = dataset.DATA_DIR / espn.OUTPUT_DIR
+        rows = await loop.run_in_executor(None, espn.save, name, html, out_dir, unit)
+    except Exception as e:
+        unit.finish(error=e)
+        raise
+    unit.finish(rows=rows)
+    return rows
+
+
+def plan(ctx, seasons=None):
+    """Every job for the selected sources and seasons."""
+    jobs = []
+    for source in ctx.args.sources:
+        for season in seasons or SEASONS[source]:
+            if source == "247":
+                jobs.append(Job(source, season, f"247 {season}",
+                                lambda job: run_247(ctx, job)))
+            elif source == "on3":
+                jobs.append(Job(source, season, f"On3 {season}",
+                                lambda job: run_on3(ctx, job)))
+            else:
+                (dataset.DATA_DIR / ctx.espn.OUTPUT_DIR).mkdir(exist_ok=True)
+                for category in ctx.espn.CATEGORIES:
+                    jobs.append(Job(source, season, f"ESPN {category} {season}",
+                                    lambda job, c=category: run_espn(ctx, job, c)))
+    return jobs
+
+
+# ── After scraping ───────────────────────────────────────────────────────────
+
+def refresh_outputs(refresh_model=False):
+    """Rebuild the dataset (the app reloads it), then the model or the
+    Crystal Ball table."""
+    print("\nRebuilding the dataset...")
+    dataset.build(verbose=True)
+    print(f"✓ The app picks up the new data within {dataset.RELOAD_INTERVAL_S}s")
+
+    if refresh_model:
+        subprocess.run([sys.executable, "refresh_model.py"], cwd=dataset.DATA_DIR, check=True)
+        return
+    import prediction_table
+    if prediction_table.has_table():
+        table, _ = prediction_table.build()
+        print(f"✓ Rebuilt {prediction_table.TABLE_FILE} ({len(table['players'])} players)")
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Run every scraper as one prioritized job queue")
+    p.add_argument("--sources", nargs="+", choices=SOURCES, default=list(SOURCES),
+                   help="Scrapers to run (default: all)")
+    p.add_argument("--seasons", type=int, nargs="+", default=None,
+                   help="Seasons to scrape (default: every season each source has)")
+    p.add_argument("--workers", type=int, default=4,
+                   help="Jobs running at once across all sources (default: 4)")
+    p.add_argument("--retries", type=int, default=2,
+                   help="Retries for a failed or incomplete job (default: 2)")
+    p.add_argument("--backoff", type=float, default=30.0,
+                   help="Seconds before the first retry, doubling after (default: 30)")
+    p.add_argument("--concurrency", type=int, default=8,
+                   help="247 requests in flight at once (default: 8)")
+    p.add_argument("--current-ttl", type=int, default=3600,
+                   help="Seconds a cached current-season page stays fresh (default: 3600)")
+    p.add_argument("--parser", default="lxml", choices=["lxml", "bs4"],
+                   help="HTML parser backend for 247 and On3 (default: lxml)")
+    p.add_argument("--no-refresh", action="store_true",
+                   help="Only scrape; don't rebuild the dataset or predictions")
+    p.add_argument("--refresh-model", action="store_true",
+                   help="Refresh the destination model after rebuilding the dataset")
+    args = p.parse_args()
+    if args.workers < 1:
+        p.error("--workers must be at least 1")
+    return args
+
+
+async def main():
+    args = parse_args()
+    start = time.perf_counter()
+    run_log = RunLog("orchestrator", args=vars(args))
+    orchestrator = Orchestrator(args.workers, retries=args.retries, backoff=args.backoff,
+                                run_log=run_log)
+    async with Context(args, run_log) as ctx:
+        for job in plan(ctx, args.seasons):
+            orchestrator.add(job)
+        print(f"{len(orchestrator.pending)} jobs, {args.workers} at a time "
+              f"(per source: {SOURCE_SLOTS})\n")
+        try:
+            await orchestrator.run()
+        finally:
+            run_log.close()
+
+    print(f"\nScraped {len(orchestrator.done)} units in {time.perf_counter() - start:.0f}s "
+          f"({sum(j.rows or 0 for j in orchestrator.done)} rows); cache: {ctx.cache.stats}")
+    if ctx.engine:
+        print(f"247 requests: {ctx.engine.stats}")
+    print(run_log.report())
+    for job in orchestrator.failed:
+        print(f"  gave up: {job.label} ({job.error})")
+
+    if orchestrator.done and not args.no_refresh:
+        refresh_outputs(args.refresh_model)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,475 @@
+"""
+Page parsers for the scrapers
+=============================
+The HTML → rows step of each scraper, kept apart from the browser and HTTP
+code so it can be imported (and benchmarked against saved pages, see
+bench_parsers.py) without Playwright, Selenium or network access:
+
+    parse_team_page     247Sports team transfer-portal page   (247teamscraper.py)
+    parse_entries       On3 team transfer-portal list          (on3teamscraper.py)
+    parse_stats_table   ESPN player stats page                 (espnstats.py)
+
+The 247 and On3 parsers have two backends returning identical records:
+"bs4" (BeautifulSoup, the original implementation) and "lxml", which walks
+the libxml2 tree with XPath expressions compiled once at import. lxml is the
+default; pass backend="bs4" (or --parser bs4 on the scrapers) to compare.
+Note that lxml repairs broken markup the way the 247 bs4 backend already did
+(both use libxml2), while On3's bs4 backend used html.parser; the fixture
+check in bench_parsers.py covers both.
+"""
+
+import re
+from io import BytesIO
+
+import pandas as pd
+from bs4 import BeautifulSoup
+from lxml import etree
+from lxml import html as lxml_html
+
+BACKENDS = ("lxml", "bs4")
+DEFAULT_BACKEND = "lxml"
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Text nodes as BeautifulSoup's get_text sees them (no <script>/<style>).
+_TEXT = etree.XPath(".//text()[not(ancestor::script or ancestor::style)]")
+
+
+def _text(el, separator=""):
+    """el.get_text(separator, strip=True) for an lxml element."""
+    return separator.join(t for t in (s.strip() for s in _TEXT(el)) if t)
+
+
+# ── 247Sports ────────────────────────────────────────────────────────────────
+
+def parse_team_page(html, team_name, institution_key, season_year, backend=DEFAULT_BACKEND):
+    parse = _parse_team_page_lxml if backend == "lxml" else _parse_team_page_bs4
+    return parse(html, team_name, institution_key, season_year)
+
+
+def _parse_team_page_bs4(html, team_name, institution_key, season_year):
+    soup = BeautifulSoup(html, 'lxml')
+    players_li = soup.find_all('li', class_='transfer-player')
+
+    players = []
+    for li in players_li:
+        player = {
+            'team': team_name,
+            'institution_key': institution_key,
+            'season': season_year
+        }
+
+
+        # Name
+        name_elem = li.find('h3')
+        if name_elem:
+            name_link = name_elem.find('a')
+            if name_link:
+                player['name'] = name_link.get_text(strip=True)
+                player['profile_url'] = name_link.get('href', 'N/A')
+            else:
+                player['name'] = name_elem.get_text(strip=True)
+                player['profile_url'] = 'N/A'
+        else:
+            player['name'] = 'N/A'
+            player['profile_url'] = 'N/A'
+
+        # Position
+        pos_elem = li.find('div', class_='position')
+        player['position'] = pos_elem.get_text(strip=True) if pos_elem else 'N/A'
+
+        # Height / Weight
+        bio_elem = li.find('div', class_='bio')
+        if bio_elem:
+            bio_text = bio_elem.get_text(strip=True)
+            parts = bio_text.split('/')
+            if len(parts) >= 2:
+                player['height'] = parts[0].strip().replace('-', "'") + '"'
+                player['weight'] = parts[1].strip() + ' lbs'
+            else:
+                player['height'] = bio_text.strip()
+                player['weight'] = 'N/A'
+        else:
+            player['height'] = 'N/A'
+            player['weight'] = 'N/A'
+
+        # Stars + numeric rating
+        star_container = li.find('div', class_='starContainer')
+        if star_container:
+            filled_stars = star_container.find_all('path', fill='#FBD032')
+            player['stars'] = len(filled_stars)
+            rating_elem = li.find('div', class_='rating')
+            player['rating'] = rating_elem.get_text(strip=True) if rating_elem else 'N/A'
+        else:
+            player['stars'] = 0
+            player['rating'] = 'N/A'
+
+        # Status
+        status_elem = li.find('div', class_='status')
+        player['status'] = status_elem.get_text(strip=True) if status_elem else 'N/A'
+
+        # From / To schools
+        prediction_div = li.find('div', class_='transfer-prediction')
+        if prediction_div:
+            source_img = prediction_div.find('img', class_='source')
+            player['from_school'] = source_img.get('alt', 'N/A') if source_img else 'N/A'
+
+            dest_li = prediction_div.find('li', class_='destination')
+            if dest_li:
+                dest_img = dest_li.find('img')
+                player['to_school'] = dest_img.get('alt', 'N/A') if dest_img else 'N/A'
+            else:
+                player['to_school'] = 'N/A'
+        else:
+            player['from_school'] = 'N/A'
+            player['to_school'] = 'N/A'
+
+        players.append(player)
+
+    return players
+
+
+_X247 = {
+    "players":     etree.XPath(f"//li[{_has_class('transfer-player')}]"),
+    "h3":          etree.XPath("(.//h3)[1]"),
+    "a":           etree.XPath("(.//a)[1]"),
+    "position":    etree.XPath(f"(.//div[{_has_class('position')}])[1]"),
+    "bio":         etree.XPath(f"(.//div[{_has_class('bio')}])[1]"),
+    "stars":       etree.XPath(f"(.//div[{_has_class('starContainer')}])[1]"),
+    "filled":      etree.XPath(".//path[@fill='#FBD032']"),
+    "rating":      etree.XPath(f"(.//div[{_has_class('rating')}])[1]"),
+    "status":      etree.XPath(f"(.//div[{_has_class('status')}])[1]"),
+    "prediction":  etree.XPath(f"(.//div[{_has_class('transfer-prediction')}])[1]"),
+    "source":      etree.XPath(f"(.//img[{_has_class('source')}])[1]"),
+    "destination": etree.XPath(f"(.//li[{_has_class('destination')}])[1]"),
+    "img":         etree.XPath("(.//img)[1]"),
+}
+
+
+def _first(name, el):
+    found = _X247[name](el)
+    return found[0] if found else None
+
+
+def _parse_team_page_lxml(html, team_name, institution_key, season_year):
+    """Same records as the bs4 backend, from compiled XPath lookups."""
+    players = []
+    for li in _X247["players"](lxml_html.fromstring(html)):
+        player = {
+            'team': team_name,
+            'institution_key': institution_key,
+            'season': season_year
+        }
+
+        name_elem = _first("h3", li)
+        name_link = _first("a", name_elem) if name_elem is not None else None
+        if name_link is not None:
+            player['name'] = _text(name_link)
+            player['profile_url'] = name_link.get('href', 'N/A')
+        else:
+            player['name'] = _text(name_elem) if name_elem is not None else 'N/A'
+            player['profile_url'] = 'N/A'
+
+        pos_elem = _first("position", li)
+        player['position'] = _text(pos_elem) if pos_elem is not None else 'N/A'
+
+        bio_elem = _first("bio", li)
+        if bio_elem is not None:
+            bio_text = _text(bio_elem)
+            parts = bio_text.split('/')
+            if len(parts) >= 2:
+                player['height'] = parts[0].strip().replace('-', "'") + '"'
+                player['weight'] = parts[1].strip() + ' lbs'
+            else:
+                player['height'] = bio_text.strip()
+                player['weight'] = 'N/A'
+        else:
+            player['height'] = 'N/A'
+            player['weight'] = 'N/A'
+
+        star_container = _first("stars", li)
+        if star_container is not None:
+            player['stars'] = len(_X247["filled"](star_container))
+            rating_elem = _first("rating", li)
+            player['rating'] = _text(rating_elem) if rating_elem is not None else 'N/A'
+        else:
+            player['stars'] = 0
+            player['rating'] = 'N/A'
+
+        status_elem = _first("status", li)
+        player['status'] = _text(status_elem) if status_elem is not None else 'N/A'
+
+        prediction_div = _first("prediction", li)
+        if prediction_div is not None:
+            source_img = _first("source", prediction_div)
+            player['from_school'] = source_img.get('alt', 'N/A') if source_img is not None else 'N/A'
+            dest_li = _first("destination", prediction_div)
+            dest_img = _first("img", dest_li) if dest_li is not None else None
+            player['to_school'] = dest_img.get('alt', 'N/A') if dest_img is not None else 'N/A'
+        else:
+            player['from_school'] = 'N/A'
+            player['to_school'] = 'N/A'
+
+        players.append(player)
+
+    return players
+
+
+# ── On3 ──────────────────────────────────────────────────────────────────────
+
+def parse_entries(html, team_name, backend=DEFAULT_BACKEND):
+    parse = _parse_entries_lxml if backend == "lxml" else _parse_entries_bs4
+    return parse(html, team_name)
+
+
+# Status words in priority order: an item mentioning several (a prediction
+# "Expected" next to "Committed") gets the first one in this list, wherever it
+# appears. Matched case-insensitively (casefold), anywhere in a word.
+ON3_STATUSES = ("Entered", "Committed", "Withdrawn", "Signed", "Enrolled", "Expected")
+_ON3_STATUS_FOLDED = [(s, s.casefold()) for s in ON3_STATUSES]
+
+# Position, class, portal date and rating from one pass over an item's text;
+# each field keeps its first (leftmost) match. Position and class are whole
+# words, rating is a whole NN.NN token and the date may sit inside a longer
+# digit run ("101/14/2026" → "01/14/2026"). Class and rating are captured in
+# a lookahead and only their first two characters consumed, so a match never
+# hides a later field's first match: the "QB" in "RS-QB" is still a position
+# and the date in "12.34/5/2026" is still "34/5/2026".
+_ON3_SCAN = re.compile(
+    r"\b(?:(?P<position>QB|RB|WR|TE|OT|IOL|OL|EDGE|DL|LB|CB|S|ATH|K|P|LS)\b"
+    r"|(?=(?P<year_class>RS-[A-Z]{2}|FR|SO|JR|SR)\b)\w\w"
+    r"|(?=(?P<rating>\d{2}\.\d{2})\b)\d\d)"
+    r"|(?P<portal_date>\d{1,2}/\d{1,2}/\d{4})"
+)
+
+
+def scan_on3_text(text):
+    """{position, year_class, status, portal_date, rating} of an item's text,
+    "" for each field not found."""
+    fields = dict.fromkeys(("position", "year_class", "portal_date", "rating"), "")
+    for m in _ON3_SCAN.finditer(text):
+        if not fields[m.lastgroup]:
+            fields[m.lastgroup] = m[m.lastgroup]
+    folded = text.casefold()
+    fields["status"] = next((s for s, f in _ON3_STATUS_FOLDED if f in folded), "")
+    return fields
+
+
+def _entry(team_name, name, href, text, alts, high_school):
+    """One list item's record from its text and attributes (both backends)."""
+    profile_url = "https://www.on3.com" + href
+    fields = scan_on3_text(text)
+
+    team_names = [
+        alt.replace(" Avatar", "").strip()
+        for alt in alts
+        if "Avatar" in alt and alt != "Default Avatar"
+    ]
+    from_team = team_names[0] if len(team_names) > 0 else ""
+    to_team   = team_names[1] if len(team_names) > 1 else ""
+
+    return {
+        "School":              team_name,
+        "Name":                name,
+        "Position":            fields["position"],
+        "Year/Class":          fields["year_class"],
+        "Status":              fields["status"],
+        "Date Entered Portal": fields["portal_date"],
+        "From Team":           from_team,
+        "To Team":             to_team,
+        "Rating":              fields["rating"],
+        "High School":         high_school,
+        "Profile URL":         profile_url,
+    }
+
+
+def _parse_entries_bs4(html, team_name):
+    soup = BeautifulSoup(html, "html.parser")
+    entries = []
+
+    for item in soup.select("ol > li"):
+        try:
+            name_tag = item.select_one("a[href*='/rivals/']")
+            if not name_tag:
+                continue
+            hs_tag = item.select_one("a[href*='/high-school/']")
+            entries.append(_entry(
+                team_name,
+                name_tag.get_text(strip=True),
+                name_tag["href"],
+                item.get_text(" ", strip=True),
+                [img["alt"] for img in item.select("img[alt]")],
+                hs_tag.get_text(strip=True) if hs_tag else "",
+            ))
+        except Exception:
+            continue
+
+    return entries
+
+
+_XON3 = {
+    "items":       etree.XPath("//ol/li"),
+    "name":        etree.XPath("(.//a[contains(@href, '/rivals/')])[1]"),
+    "alts":        etree.XPath(".//img/@alt"),
+    "high_school": etree.XPath("(.//a[contains(@href, '/high-school/')])[1]"),
+}
+
+
+def _parse_entries_lxml(html, team_name):
+    entries = []
+    for item in _XON3["items"](lxml_html.fromstring(html)):
+        try:
+            name_tag = _XON3["name"](item)
+            if not name_tag:
+                continue
+            hs_tag = _XON3["high_school"](item)
+            entries.append(_entry(
+                team_name,
+                _text(name_tag[0]),
+                name_tag[0].get("href"),
+                _text(item, " "),
+                [str(alt) for alt in _XON3["alts"](item)],
+                _text(hs_tag[0]) if hs_tag else "",
+            ))
+        except Exception:
+            continue
+
+    return entries
+
+
+# ── ESPN ─────────────────────────────────────────────────────────────────────
+
+# Separator between a stat's group and its name in the flattened headers:
+# "Tackles/SOLO", "Field Goals/FG%"; ungrouped columns keep their own name.
+STAT_HEADER_SEP = "/"
+
+_THOUSANDS = re.compile(r"-?\d{1,3}(?:,\d{3})+(?:\.\d+)?")
+
+
+def _cell_text(el):
+    text = "".join(el.itertext()) if len(el) else el.text
+    text = text.strip() if text else ""
+    if "," in text and _THOUSANDS.fullmatch(text):
+        text = text.replace(",", "")  # "4,379" → "4379", as the CSVs have always held
+    return text or None
+
+
+def _stat_labels(header_rows):
+    """Flatten the header rows (group row(s) with colspans, then the stat
+    names) to one label per column: "Group/STAT", or "STAT" with no group."""
+    expanded = []
+    for cells in header_rows:
+        row = []
+        for th in cells:
+            row += [_cell_text(th) or ""] * int(th.get("colspan", 1) or 1)
+        expanded.append(row)
+    width = len(expanded[-1])
+    return [
+        STAT_HEADER_SEP.join(level[i] for level in expanded if i < len(level) and level[i])
+        or str(i)
+        for i in range(width)
+    ]
+
+
+def parse_stats_table(html):
+    """
+    ESPN uses two side-by-side tables:
+      Table 1 — RK, Name (with team embedded as a sub-element), POS
+      Table 2 — stat columns, under one or two header rows (a group row such
+                as "Tackles" above SOLO / AST / TOT)
+
+    The player name and team are in the same <td> but in separate elements:
+      <td>
+        <a>Drew Mestemaker</a>  ← player name
+        <span>UNT</span>        ← team
+      </td>
+
+    Both tables are read in one streaming lxml pass (iterparse over <tr>
+    elements, each cleared once read), straight into column lists, so a
+    6,000-row defense page is never held as a full tree or parsed twice.
+    Stat columns are named "Group/STAT" (STAT_HEADER_SEP) and keep the page's
+    text, minus thousands separators; typing them is dataset.clean_espn's job.
+    """
+    info = {"RK": [], "NAME": [], "TEAM": [], "POS": []}
+    header_rows, stat_rows = [], []
+    table = -1
+
+    events = etree.iterparse(BytesIO(html.encode("utf-8")), events=("start", "end"),
+                             tag=("table", "tr"), html=True, encoding="utf-8")
+    for event, el in events:
+        if el.tag == "table":
+            table += event == "start"
+            continue
+        if event == "start" or table > 1:
+            continue
+
+        tds = el.findall("td")
+        if table == 0 and tds:
+            # ── Table 1: RK, Name + Team, POS ───────────────────────────────
+            info["RK"].append(_text(tds[0]))
+            name_td = tds[1] if len(tds) > 1 else None
+            if name_td is not None:
+                # Name is in <a>, team is in a nested <span> or <a> after it
+                anchors = name_td.findall(".//a")
+                spans = name_td.findall(".//span")
+                info["NAME"].append(_text(anchors[0]) if anchors else _text(name_td))
+                # Team is usually the last <span> or second <a>
+                if len(anchors) >= 2:
+                    info["TEAM"].append(_text(anchors[1]))
+                elif spans:
+                    info["TEAM"].append(_text(spans[-1]))
+                else:
+                    info["TEAM"].append("")
+            else:
+                info["NAME"].append(None)
+                info["TEAM"].append(None)
+            info["POS"].append(_text(tds[2]) if len(tds) > 2 else None)
+        elif table == 1:
+            # ── Table 2: header rows, then one row of stats per player ──────
+            if el.getparent().tag == "thead":
+                header_rows.append(el.findall("th"))
+                continue
+            if tds:
+                stat_rows.append([_cell_text(td) for td in tds])
+
+        # Free each finished row (and the ones before it) as we go.
+        el.clear(keep_tail=True)
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+
+    if table < 0:
+        print("  No <table> tags found.")
+        return None
+    if not info["RK"]:
+        print("  Could not parse player info from Table 1.")
+        return None
+    if all(pos is None for pos in info["POS"]):
+        del info["POS"]
+    df_info = pd.DataFrame(info)
+
+    if table < 1:
+        return df_info
+    if not stat_rows:
+        print("  Could not parse stats table: no rows")
+        return df_info
+
+    width = max(len(row) for row in stat_rows)
+    labels = _stat_labels(header_rows) if header_rows else [str(i) for i in range(width)]
+    columns = [[row[i] if i < len(row) else None for row in stat_rows]
+               for i in range(len(labels))]
+
+    # Drop stat columns Table 1 already has (POS appears in both on some pages)
+    keep = [i for i, label in enumerate(labels) if label.upper() not in df_info.columns]
+    df_stats = pd.DataFrame({labels[i]: columns[i] for i in keep}, dtype=object)
+
+    # Align row counts before merging
+    min_len = min(len(df_info), len(df_stats))
+    merged = pd.concat(
+        [df_info.iloc[:min_len].reset_index(drop=True),
+         df_stats.iloc[:min_len].reset_index(drop=True)],
+        axis=1
+    )
+    return merged
@@ -0,0 +1,197 @@
+"""
+Precomputed Crystal Ball predictions
+====================================
+The set of uncommitted 2026 players only changes when we scrape, so instead
+of querying the destination model per click, this batch step scores every
+"In Portal" / "Entered" player at once and writes the top-k schools to
+crystal_ball_predictions.json, indexed by profile URL.
+
+The server loads the table once (re-reading it when the file changes) and
+answers lookups from a dict; refresh_model.py rebuilds it after publishing a
+new model, so it stays in step with the served version.
+
+Players come from the typed dataset (dataset.py) when it has been built, or
+from the 2026 247 CSV.
+
+Usage:
+    python prediction_table.py               # rebuild for the 2026 247 players
+    python prediction_table.py --csv transfer_247_data/transfer_portal_247_2026.csv
+    python prediction_table.py --k 10
+
+    from prediction_table import load_table
+    table = load_table()
+    table.get(player)        # {"name", "fromSchool", "position", "top": [...]} or None
+    table.describe(player)   # same text as model_service.describe_top_k
+"""
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+MODEL_DIR = Path(__file__).resolve().parent
+TABLE_FILE = "crystal_ball_predictions.json"
+PORTAL_CSV = "transfer_247_data/transfer_portal_247_2026.csv"
+PORTAL_SEASON = 2026
+OPEN_STATUSES = ["N/A", "Entered"]  # "N/A" is shown as "In Portal" in the app
+RELOAD_INTERVAL_S = 30  # same as model_service
+
+
+def player_key(player):
+    """Profile URL, or name|school when a row has none. Takes CSV or app keys."""
+    url = player.get("profile_url") or player.get("profileUrl")
+    if url:
+        return url
+    name = player.get("name") or player.get("playerName") or ""
+    school = player.get("from_school") or player.get("fromTeam") or ""
+    return f"{name}|{school}"
+
+
+# ── Build (batch, after each data refresh) ───────────────────────────────────
+
+def _load_model(model_dir):
+    # The published sklearn pipeline, not the NumPy export: the export is for
+    # per-player serving, and sklearn is ~3× faster on a batch this size.
+    # Loaded fresh, so the table is labelled with the version that scored it.
+    from model_service import DestinationModel
+    model = DestinationModel.load(model_dir)
+    return model, model.version or "unversioned"
+
+
+def _portal_rows(csv_path, model_dir):
+    """(every 2026 247 row, where it came from). The dataset stores "N/A" as null;
+    text columns get it back so keys and output match the CSV path."""
+    import pandas as pd
+
+    import dataset
+    if csv_path is None and dataset.has_dataset(model_dir):
+        dataset.build(model_dir)  # no-op unless a CSV changed since the last build
+        table = dataset.read_table(
+            dataset.TRANSFERS_FILE,
+            filters=[("source", "=", "247"), ("season", "=", PORTAL_SEASON)],
+            data_dir=model_dir,
+        )
+        portal = table.to_pandas()
+        text = ["name", "position", "status", "from_school", "to_school"]
+        portal[text] = portal[text].fillna("N/A")
+        portal["profile_url"] = portal["profile_url"].fillna("")
+        return portal, f"{dataset.DATASET_DIR}/{dataset.TRANSFERS_FILE}"
+    csv_path = csv_path or PORTAL_CSV
+    return pd.read_csv(model_dir / csv_path, dtype=str, keep_default_na=False), csv_path
+
+
+def build(csv_path=None, k=5, model_dir=MODEL_DIR):
+    """Score every uncommitted player and write the table."""
+    model_dir = Path(model_dir)
+    portal, source = _portal_rows(csv_path, model_dir)
+    # Each transfer is listed under both teams; the first row is enough.
+    portal["key"] = [player_key(row) for row in portal.to_dict("records")]
+    open_entries = portal[portal["status"].isin(OPEN_STATUSES)].drop_duplicates("key")
+
+    model, model_version = _load_model(model_dir)
+    start = time.perf_counter()
+    schools, probs = model.predict_top_k_batch(open_entries, k=k)
+    elapsed = time.perf_counter() - start
+
+    players = {}
+    for row, row_schools, row_probs in zip(open_entries.to_dict("records"), schools, probs):
+        players[row["key"]] = {
+            "name": row["name"],
+            "fromSchool": row["from_school"],
+            "position": row["position"],
+            "top": [
+                {"school": str(s), "probability": round(float(p), 4)}
+                for s, p in zip(row_schools, row_probs)
+            ],
+        }
+
+    table = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "model": model_version,
+        "source": source,
+        "k": k,
+        "players": players,
+    }
+    path = model_dir / TABLE_FILE
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(table), encoding="utf-8")
+    os.replace(tmp, path)
+    return table, elapsed
+
+
+# ── Lookup (server) ──────────────────────────────────────────────────────────
+
+class PredictionTable:
+    def __init__(self, table):
+        self.generated = table["generated"]
+        self.model = table["model"]
+        self.k = table["k"]
+        self.players = table["players"]
+
+    @classmethod
+    def load(cls, model_dir=MODEL_DIR):
+        with open(Path(model_dir) / TABLE_FILE, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def get(self, player):
+        return self.players.get(player_key(player))
+
+    def describe(self, player, k=3):
+        """Same text as model_service.describe_top_k, or "" if the player isn't listed."""
+        entry = self.get(player)
+        if not entry:
+            return ""
+        top = entry["top"][:k]
+        lines = [f"Predicted School: {top[0]['school']}", "", f"Top {len(top)} Predictions:"]
+        lines += [f"{p['school']}: {p['probability']:.2%}" for p in top]
+        return "\n".join(lines)
+
+    def projected_destinations(self):
+        """Projected top pick → number of uncommitted players, most first."""
+        counts = {}
+        for entry in self.players.values():
+            school = entry["top"][0]["school"]
+            counts[school] = counts.get(school, 0) + 1
+        return dict(sorted(counts.items(), key=lambda kv: -kv[1]))
+
+
+def has_table(model_dir=MODEL_DIR):
+    return (Path(model_dir) / TABLE_FILE).exists()
+
+
+_table = None
+_table_mtime = None
+_checked_at = 0.0
+
+
+def load_table(model_dir=MODEL_DIR):
+    """Load the table once per process; re-read it when the file is rebuilt
+    (checked at most every RELOAD_INTERVAL_S)."""
+    global _table, _table_mtime, _checked_at
+    now = time.monotonic()
+    if _table is None or now - _checked_at >= RELOAD_INTERVAL_S:
+        _checked_at = now
+        mtime = os.stat(Path(model_dir) / TABLE_FILE).st_mtime_ns
+        if mtime != _table_mtime:
+            _table, _table_mtime = PredictionTable.load(model_dir), mtime
+    return _table
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Precompute Crystal Ball predictions for uncommitted players")
+    p.add_argument("--csv", default=None,
+                   help="Read this portal CSV instead of the dataset")
+    p.add_argument("--k", type=int, default=5, help="Schools kept per player (default: 5)")
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    table, elapsed = build(args.csv, args.k)
+    print(f"Scored {len(table['players'])} uncommitted players in {elapsed * 1000:.1f} ms "
+          f"(model {table['model']})")
+    top = list(PredictionTable(table).projected_destinations().items())[:10]
+    print("Most projected destinations: " + ", ".join(f"{s} ({n})" for s, n in top))
+    print(f"✓ Saved {TABLE_FILE}")
@@ -0,0 +1,167 @@
+"""
+Incremental destination model refresh
+=====================================
+The 2026 portal changes daily as players go from Entered to Committed, but a
+full make_model.py retrain rebuilds every tree. Run this after each scrape
+instead: it finds labelled rows the published model has not seen yet and
+grows the forest with warm_start, training the new trees on those rows plus a
+replay sample of older ones. No trees are dropped: the trees fit on the full
+data stay the bulk of the forest, and after --max-warm warm refreshes in a
+row the next run is a full refit, so the forest stays bounded at
+--trees + max_warm × --add-trees.
+
+The encoder is kept as-is (new schools are ignored by handle_unknown) and the
+forest's class list can neither grow nor shrink, so a full refit runs instead
+when a new destination school appears, when a school the forest knows has no
+rows left, on --full, or when nothing has been published yet.
+
+Each run publishes a new version under model_versions/ and repoints
+current.json; a running server's load_service() / load_engine() picks it up
+within RELOAD_INTERVAL_S. If forest_engine.py has exported the forest, the
+export is rewritten too, and the Crystal Ball prediction table
+(prediction_table.py) is rebuilt from the new model.
+
+Usage:
+    python refresh_model.py                  # after each scrape
+    python refresh_model.py --add-trees 50 --replay 3
+    python refresh_model.py --full
+"""
+
+import argparse
+import time
+import warnings
+
+import joblib
+import numpy as np
+import pandas as pd
+
+import forest_engine
+import prediction_table
+from model_service import (
+    MODEL_DIR, PIPELINE_FILE, VERSIONS_DIR, build_pipeline, current_version,
+    publish_version, trained_keys,
+)
+from training_data import load_training_data, model_frame, row_keys
+
+
+class NeedsFullRefit(Exception):
+    """A warm start cannot keep the forest's class list; refit instead."""
+
+
+def full_refit(X, y, args):
+    model = build_pipeline(
+        n_estimators=args.trees, min_samples_leaf=args.min_samples_leaf,
+        n_jobs=args.n_jobs, random_state=42,
+    )
+    model.fit(X, y)
+    return model
+
+
+def warm_refresh(model, X_new, y_new, X_seen, y_seen, args):
+    """Add args.add_trees trees trained on new rows + a replay sample of seen rows."""
+    forest = model.named_steps["forest"]
+    rng = np.random.default_rng(len(forest.estimators_))
+    n_replay = min(len(X_seen), args.replay * len(X_new))
+    replay = rng.choice(len(X_seen), size=n_replay, replace=False)
+    X_fit = pd.concat([X_new, X_seen.iloc[replay]])
+    y_fit = pd.concat([y_new, y_seen.iloc[replay]])
+
+    # fit() re-derives classes_ from y, and the old trees' outputs are indexed
+    # by the old class list. One zero-weight row per missing class keeps the
+    # list identical; the tree splitter skips zero-weight samples entirely.
+    missing = set(forest.classes_) - set(y_fit)
+    y_all = pd.concat([y_new, y_seen])
+    pad = y_all[y_all.isin(missing)].drop_duplicates()
+    if len(pad) < len(missing):
+        gone = sorted(missing - set(pad))
+        raise NeedsFullRefit(f"{len(gone)} school(s) with no rows left, e.g. {gone[0]}")
+    X_fit = pd.concat([X_fit, pd.concat([X_new, X_seen]).loc[pad.index]])
+    y_fit = pd.concat([y_fit, pad])
+    weight = np.r_[np.ones(len(X_fit) - len(pad)), np.zeros(len(pad))]
+
+    classes = forest.classes_.copy()
+    forest.set_params(warm_start=True, n_estimators=len(forest.estimators_) + args.add_trees,
+                      n_jobs=args.n_jobs)
+    with warnings.catch_warnings():
+        # With one padding row per class, a small refresh has more classes than
+        # half its rows, which sklearn flags (per tree) as a likely regression
+        # target. Here it is expected.
+        warnings.filterwarnings("ignore", "The number of unique classes", UserWarning)
+        forest.fit(model.named_steps["preprocess"].transform(X_fit), y_fit, sample_weight=weight)
+    forest.set_params(warm_start=False)
+    if not np.array_equal(forest.classes_, classes):
+        raise NeedsFullRefit("class list changed during warm start")
+    return model
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Refresh the destination model with new portal entries")
+    p.add_argument("--add-trees", type=int, default=25,
+                   help="Trees added per refresh (default: 25)")
+    p.add_argument("--trees", type=int, default=300,
+                   help="Trees in a full refit (default: 300)")
+    p.add_argument("--max-warm", type=int, default=8,
+                   help="Warm refreshes in a row before a full refit (default: 8)")
+    p.add_argument("--replay", type=int, default=4,
+                   help="Seen rows replayed per new row (default: 4)")
+    p.add_argument("--min-samples-leaf", type=int, default=10)
+    p.add_argument("--n-jobs", type=int, default=None,
+                   help="Cores for tree fitting (default: 1)")
+    p.add_argument("--full", action="store_true", help="Refit from scratch")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    data = load_training_data(verbose=True)
+    X, y = model_frame(data)
+    keys = row_keys(data.loc[X.index])
+
+    manifest = current_version()
+    reason = "--full" if args.full else None
+    if manifest is None and not args.full:
+        reason = "no published version"
+
+    start = time.perf_counter()
+    if reason is None:
+        is_new = ~keys.isin(set(trained_keys(manifest)))
+        if not is_new.any():
+            print(f"Version {manifest['version']} is up to date — nothing to refresh.")
+            return
+        model = joblib.load(MODEL_DIR / VERSIONS_DIR / manifest["version"] / PIPELINE_FILE)
+        unseen = set(y[is_new]) - set(model.classes_)
+        streak = manifest.get("warm_streak", 0)
+        if unseen:
+            reason = f"{len(unseen)} new destination school(s), e.g. {sorted(unseen)[0]}"
+        elif streak >= args.max_warm:
+            reason = f"{streak} warm refreshes since the last full refit"
+        else:
+            print(f"Warm-starting {args.add_trees} trees on {is_new.sum()} new rows "
+                  f"(base {manifest['version']})")
+            try:
+                model = warm_refresh(model, X[is_new], y[is_new], X[~is_new], y[~is_new], args)
+                info = {"kind": "warm", "base": manifest["version"],
+                        "new_rows": int(is_new.sum()), "warm_streak": streak + 1}
+            except NeedsFullRefit as e:
+                reason = str(e)
+
+    if reason is not None:
+        print(f"Full refit on {len(X)} rows ({reason})")
+        model = full_refit(X, y, args)
+        info = {"kind": "full"}
+    fit_s = time.perf_counter() - start
+
+    published = publish_version(model, keys, fit_s=round(fit_s, 1), **info)
+    print(f"✓ Published {published['version']} ({published['kind']}, "
+          f"{published['trees']} trees) in {fit_s:.1f}s")
+
+    if forest_engine.has_export():
+        forest_engine.save(forest_engine.convert(model))
+        print(f"✓ Re-exported {forest_engine.ENGINE_FILE}")
+
+    table, _ = prediction_table.build()
+    print(f"✓ Rebuilt {prediction_table.TABLE_FILE} ({len(table['players'])} players)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 Convert transfer portal CSV to a JAC mock_data file.
 Usage: python csv_to_jac.py players.csv > mock_players.jac
   or:  python csv_to_jac.py players.csv  (writes mock_players.jac automatically)
+  or:  python csv_to_jac.py dataset/transfers.parquet  (typed, from dataset.py;
+       only the 247 rows of PARQUET_SEASON, like the CSV of that season)
 """
 
 import csv
@@ -9,8 +11,13 @@ import sys
 import json
 import re
 
+# transfers.parquet holds every source and season; the app shows 247's 2026.
+PARQUET_SEASON = 2026
+
 def clean_value(val: str):
     """Convert CSV string values to appropriate Python/JAC types."""
+    if not isinstance(val, str):
+        return val  # already typed (Parquet input)
     val = val.strip()
 
     if val in ("N/A", "( N/A )", "", "None"):
@@ -71,50 +78,65 @@ def make_date(season) -> str:
     return "2026-01-15"
 
 
+def read_rows(path: str):
+    """CSV rows, or rows of a Parquet file from dataset.py (already typed)."""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path, memory_map=True,
+                              filters=[("source", "=", "247"), ("season", "=", PARQUET_SEASON)])
+        for row in table.to_pylist():
+            inches = row.get("height")
+            if inches is not None:
+                row["height"] = f"{inches // 12}'{inches % 12}\""
+            yield row
+        return
+    with open(path, newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+
 def csv_to_jac(csv_path: str, output_path: str = "mock_players.jac"):
     players = []
 
-    with open(csv_path, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader):
-            # Skip incomplete rows (e.g. trailing partial lines)
-            if not row.get("name", "").strip():
-                continue
-
-            pid        = str(i + 1)
-            season     = clean_value(row.get("season", ""))
-            name       = clean_value(row.get("name", ""))
-            position   = clean_value(row.get("position", ""))
-            from_school = clean_value(row.get("from_school", ""))
-            to_school  = clean_value(row.get("to_school", ""))
-            stars      = clean_value(row.get("stars", "")) or 0
-            status     = clean_value(row.get("status", ""))
-            height     = clean_value(row.get("height", ""))
-            weight     = clean_value(row.get("weight", ""))
-            rating     = clean_value(row.get("rating", ""))
-            profile_url = clean_value(row.get("profile_url", ""))
-
-            player = {
-                "id":           pid,
-                "playerId":     pid,
-                "playerName":   name,
-                "playerPhoto":  "👤",
-                "position":     position,
-                "fromTeam":     from_school,
-                "fromTeamLogo": team_logo(from_school),
-                "toTeam":       to_school,
-                "toTeamLogo":   team_logo(to_school),
-                "starRating":   stars,
-                "rating":       rating,
-                "height":       height,
-                "weight":       weight,
-                "status":       status,
-                "stats":        {},
-                "date":         make_date(season),
-                "sport":        "Football",
-                "profileUrl":   profile_url,
-            }
-            players.append(player)
+    for i, row in enumerate(read_rows(csv_path)):
+        # Skip incomplete rows (e.g. trailing partial lines)
+        if not (row.get("name") or "").strip():
+            continue
+
+        pid        = str(i + 1)
+        season     = clean_value(row.get("season", ""))
+        name       = clean_value(row.get("name", ""))
+        position   = clean_value(row.get("position", ""))
+        from_school = clean_value(row.get("from_school", ""))
+        to_school  = clean_value(row.get("to_school", ""))
+        stars      = clean_value(row.get("stars", "")) or 0
+        status     = clean_value(row.get("status", ""))
+        height     = clean_value(row.get("height", ""))
+        weight     = clean_value(row.get("weight", ""))
+        rating     = clean_value(row.get("rating", ""))
+        profile_url = clean_value(row.get("profile_url", ""))
+
+        player = {
+            "id":           pid,
+            "playerId":     pid,
+            "playerName":   name,
+            "playerPhoto":  "👤",
+            "position":     position,
+            "fromTeam":     from_school,
+            "fromTeamLogo": team_logo(from_school),
+            "toTeam":       to_school,
+            "toTeamLogo":   team_logo(to_school),
+            "starRating":   stars,
+            "rating":       rating,
+            "height":       height,
+            "weight":       weight,
+            "status":       status,
+            "stats":        {},
+            "date":         make_date(season),
+            "sport":        "Football",
+            "profileUrl":   profile_url,
+        }
+        players.append(player)
 
     # Render as JAC
     lines = ['"""Auto-generated from CSV — do not edit by hand."""', ""]
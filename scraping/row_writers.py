@@ -0,0 +1,140 @@
+"""
+Streaming row writers for the scrapers
+======================================
+The scrapers used to collect every team (and, for 247, every season) in one
+list and write the CSV at the end, so memory grew with the size of the
+backfill. RowWriter instead appends each team's rows as they arrive: to a
+CSV, and optionally to a Parquet file with an explicit Arrow schema (one row
+group per write). Output goes to a temporary file that replaces the target
+on close, so a crash never leaves a half-written file behind.
+
+Multi-season files are assembled from the per-season files by concatenation
+(concat_csv / concat_parquet), a chunk or row group at a time.
+
+Usage:
+    with RowWriter("out.csv", FIELDNAMES, parquet="out.parquet", schema=SCHEMA) as w:
+        w.write(team_rows)
+    concat_csv(["a.csv", "b.csv"], "all.csv")
+"""
+
+import csv
+import os
+import shutil
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Raw scraped columns stay text here (cleaning heights, weights and ratings
+# is the canonical dataset's job); only the columns the scrapers always
+# produce as integers are typed.
+SCHEMA_247 = pa.schema([
+    ("season", pa.int16()),
+    ("team", pa.string()),
+    ("institution_key", pa.int32()),
+    ("name", pa.string()),
+    ("position", pa.string()),
+    ("height", pa.string()),
+    ("weight", pa.string()),
+    ("stars", pa.int8()),
+    ("rating", pa.string()),
+    ("status", pa.string()),
+    ("from_school", pa.string()),
+    ("to_school", pa.string()),
+    ("profile_url", pa.string()),
+])
+
+SCHEMA_ON3 = pa.schema([
+    (name, pa.string()) for name in [
+        "School", "Name", "Position", "Year/Class", "Status", "Date Entered Portal",
+        "From Team", "To Team", "Rating", "High School", "Profile URL",
+    ]
+])
+
+
+def _tmp(path):
+    return path.with_name(f"{path.name}.{os.getpid()}.tmp")
+
+
+def _column(rows, field):
+    values = [row.get(field.name) for row in rows]
+    if pa.types.is_integer(field.type):
+        # Rows read back from checkpoint CSVs carry numbers as strings.
+        values = [int(v) if v not in (None, "", "N/A") else None for v in values]
+    else:
+        values = [None if v is None else str(v) for v in values]
+    return pa.array(values, type=field.type)
+
+
+def to_table(rows, schema):
+    return pa.Table.from_arrays([_column(rows, f) for f in schema], schema=schema)
+
+
+class RowWriter:
+    def __init__(self, path, fieldnames, parquet=None, schema=None):
+        self.path = Path(path)
+        self.fieldnames = fieldnames
+        self.parquet = Path(parquet) if parquet else None
+        self.schema = schema
+        self.rows = 0
+        self._file = open(_tmp(self.path), "w", newline="", encoding="utf-8")
+        self._csv = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction="ignore")
+        self._csv.writeheader()
+        self._pq = (pq.ParquetWriter(_tmp(self.parquet), schema, compression="zstd")
+                    if self.parquet else None)
+
+    def write(self, rows):
+        if not rows:
+            return
+        self._csv.writerows(rows)
+        self._file.flush()
+        if self._pq:
+            self._pq.write_table(to_table(rows, self.schema))
+        self.rows += len(rows)
+
+    def close(self):
+        self._file.close()
+        os.replace(_tmp(self.path), self.path)
+        if self._pq:
+            self._pq.close()
+            os.replace(_tmp(self.parquet), self.parquet)
+
+    def abort(self):
+        self._file.close()
+        _tmp(self.path).unlink(missing_ok=True)
+        if self._pq:
+            self._pq.close()
+            _tmp(self.parquet).unlink(missing_ok=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type:
+            self.abort()
+        else:
+            self.close()
+
+
+def concat_csv(parts, out):
+    """Concatenate CSVs with the same header into out, keeping one header."""
+    out = Path(out)
+    with open(_tmp(out), "wb") as dst:
+        for i, part in enumerate(parts):
+            with open(part, "rb") as src:
+                header = src.readline()
+                if i == 0:
+                    dst.write(header)
+                shutil.copyfileobj(src, dst)
+    os.replace(_tmp(out), out)
+
+
+def concat_parquet(parts, out, schema):
+    """Concatenate Parquet files into out, one row group at a time."""
+    out = Path(out)
+    with pq.ParquetWriter(_tmp(out), schema, compression="zstd") as writer:
+        for part in parts:
+            source = pq.ParquetFile(part)
+            for i in range(source.num_row_groups):
+                writer.write_table(source.read_row_group(i))
+    os.replace(_tmp(out), out)
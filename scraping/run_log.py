@@ -0,0 +1,249 @@
+"""
+Scraper run telemetry
+=====================
+Every scraper writes one JSON line per unit it works on (a 247 team-season,
+an On3 team, an ESPN page, a Twitter profile check, an orchestrator job
+attempt), so slow units can be found and two runs compared after a tuning
+change:
+
+    .cache/runs/<scraper>_<YYYYmmdd-HHMMSS>.jsonl   (-2, -3, ... if that exists)
+
+    {"type": "run", "scraper": "247", "started": "...", "args": {...}}
+    {"type": "unit", "scraper": "247", "unit": "Alabama", "season": 2025,
+     "wall_s": 1.92, "network_s": 1.85, "parse_s": 0.04, "bytes": 412345,
+     "requests": 1, "rounds": 1, "retries": 0, "rows": 38, "cache": null,
+     "status": "ok"}
+    ...
+    {"type": "summary", "units": 138, "failed": 0, "wall_s": 96.3}
+
+wall_s runs from when the unit starts work (not while it waits for a free
+page or driver) to when its rows are in. network_s is time spent loading
+(requests, page loads, Load More / Show More rounds) and parse_s time spent
+turning HTML or JSON into rows. rounds counts pages or clicks needed to get
+every row.
+
+Usage:
+    run_log = RunLog("247", args=vars(args))
+    unit = run_log.unit("Alabama", season=2025)
+    with unit.timing("network"):
+        html = await fetch(url)
+    with unit.timing("parse"):
+        rows = parse(html)
+    unit.finish(rows=len(rows))
+    run_log.close()
+    print(run_log.report())
+
+    python run_log.py                      # report on the latest run
+    python run_log.py .cache/runs/espn_20261019-101500.jsonl --slowest 20
+    python run_log.py --compare BEFORE.jsonl AFTER.jsonl
+"""
+
+import argparse
+import itertools
+import json
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+RUN_DIR = Path(__file__).resolve().parent / ".cache" / "runs"
+
+COUNTERS = ("network_s", "parse_s", "bytes", "requests", "rounds", "retries")
+
+
+class Unit:
+    def __init__(self, log, scraper, name, season=None):
+        self.log = log
+        self.record = {"type": "unit", "scraper": scraper, "unit": name, "season": season,
+                       **{c: 0 for c in COUNTERS}, "rows": 0, "cache": None, "status": "ok"}
+        self.begin()
+
+    def begin(self):
+        """(Re)start the wall clock, e.g. once a free page or driver is in hand."""
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def timing(self, kind):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record[f"{kind}_s"] += time.perf_counter() - start
+
+    def add(self, **counts):
+        for key, value in counts.items():
+            self.record[key] += value
+
+    def note(self, **fields):
+        self.record.update(fields)
+
+    def finish(self, rows=0, error=None, **fields):
+        self.record.update(fields, rows=rows, wall_s=time.perf_counter() - self._start)
+        if error is not None:
+            self.record.update(status="failed", error=str(error))
+        for key in ("wall_s", "network_s", "parse_s"):
+            self.record[key] = round(self.record[key], 3)
+        self.log.write(self.record)
+
+
+def _open_new(scraper):
+    """(path, file) of a new log in RUN_DIR; runs started in the same second
+    (the orchestrator's scrapers, parallel jobs) get -2, -3, ... suffixes."""
+    RUN_DIR.mkdir(parents=True, exist_ok=True)
+    stem = f"{scraper}_{datetime.now():%Y%m%d-%H%M%S}"
+    for n in itertools.count(1):
+        path = RUN_DIR / (f"{stem}.jsonl" if n == 1 else f"{stem}-{n}.jsonl")
+        try:
+            return path, open(path, "x", encoding="utf-8")
+        except FileExistsError:
+            continue
+
+
+class RunLog:
+    """One run's unit records; path=None keeps them in memory only.
+
+    keep=False writes records to the file without holding them (for a
+    long-running monitor); report() then reads them back from the file.
+    """
+
+    def __init__(self, scraper, args=None, path="auto", keep=True):
+        self.scraper = scraper
+        self.units = []
+        self.keep = keep
+        self.count = 0
+        self.failed = 0
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()  # ESPN finishes units from worker threads
+        if path == "auto":
+            self.path, self._file = _open_new(scraper)
+        else:
+            self.path = Path(path) if path else None
+            self._file = open(self.path, "w", encoding="utf-8") if self.path else None
+        self._append({"type": "run", "scraper": scraper,
+                      "started": datetime.now().isoformat(timespec="seconds"),
+                      "args": args or {}})
+
+    def unit(self, name, season=None, scraper=None):
+        return Unit(self, scraper or self.scraper, name, season)
+
+    def _append(self, record):
+        if self._file:
+            self._file.write(json.dumps(record, default=str) + "\n")
+            self._file.flush()
+
+    def write(self, record):
+        with self._lock:
+            self.count += 1
+            self.failed += record["status"] != "ok"
+            if self.keep:
+                self.units.append(record)
+            self._append(record)
+
+    def close(self):
+        if self._file and not self._file.closed:
+            self._append({"type": "summary", "units": self.count, "failed": self.failed,
+                          "wall_s": round(time.perf_counter() - self.started, 3)})
+            self._file.close()
+
+    def report(self, slowest=5):
+        where = f" → {self.path}" if self.path else ""
+        units = self.units if self.keep or not self.path else read(self.path)
+        return f"Run log{where}\n" + report(units, slowest)
+
+
+# ── Reports ──────────────────────────────────────────────────────────────────
+
+def read(path):
+    """Unit records of a run log."""
+    with open(path, encoding="utf-8") as f:
+        return [r for r in map(json.loads, f) if r["type"] == "unit"]
+
+
+def latest(run_dir=RUN_DIR):
+    logs = sorted(Path(run_dir).glob("*.jsonl"), key=lambda p: p.stat().st_mtime)
+    return logs[-1] if logs else None
+
+
+def _quantile(values, q):
+    values = sorted(values)
+    return values[min(int(q * len(values)), len(values) - 1)] if values else 0.0
+
+
+def summarize(units):
+    """{scraper: totals and wall-time percentiles}."""
+    groups = {}
+    for u in units:
+        groups.setdefault(u["scraper"], []).append(u)
+    summary = {}
+    for scraper, group in groups.items():
+        walls = [u["wall_s"] for u in group]
+        s = {c: sum(u[c] for u in group) for c in COUNTERS}
+        s.update(units=len(group), rows=sum(u["rows"] for u in group), mb=s["bytes"] / 1e6,
+                 failed=sum(u["status"] != "ok" for u in group),
+                 cached=sum(bool(u["cache"]) for u in group), wall_s=sum(walls),
+                 p50_s=statistics.median(walls), p90_s=_quantile(walls, 0.9), max_s=max(walls))
+        summary[scraper] = s
+    return summary
+
+
+def report(units, slowest=5):
+    if not units:
+        return "  no units recorded"
+    lines = [f"  {'scraper':<13}{'units':>6}{'failed':>7}{'cached':>7}{'rows':>8}"
+             f"{'p50 s':>8}{'p90 s':>8}{'max s':>8}{'net %':>7}{'parse %':>8}"
+             f"{'MB':>8}{'rounds':>8}{'retries':>8}"]
+    for scraper, s in summarize(units).items():
+        busy = s["wall_s"] or 1
+        lines.append(f"  {scraper:<13}{s['units']:>6}{s['failed']:>7}{s['cached']:>7}"
+                     f"{s['rows']:>8}{s['p50_s']:>8.2f}{s['p90_s']:>8.2f}{s['max_s']:>8.1f}"
+                     f"{s['network_s'] / busy:>7.0%}{s['parse_s'] / busy:>8.0%}"
+                     f"{s['mb']:>8.1f}{s['rounds']:>8}{s['retries']:>8}")
+    if slowest:
+        lines.append(f"  slowest {slowest}:")
+        for u in sorted(units, key=lambda u: u["wall_s"], reverse=True)[:slowest]:
+            season = f" {u['season']}" if u["season"] else ""
+            lines.append(f"    {u['wall_s']:>8.2f}s  {u['scraper']} {u['unit']}{season}  "
+                         f"({u['rows']} rows, {u['rounds']} rounds, {u['retries']} retries)")
+    for u in units:
+        if u["status"] != "ok":
+            season = f" {u['season']}" if u["season"] else ""
+            lines.append(f"  failed: {u['scraper']} {u['unit']}{season} ({u['error']})")
+    return "\n".join(lines)
+
+
+def compare(before, after):
+    """Per-scraper change in unit wall times, load and parse time, MB and retries."""
+    old, new = summarize(before), summarize(after)
+    lines = [f"  {'scraper':<13}{'metric':<11}{'before':>10}{'after':>10}{'change':>9}"]
+    for scraper in [s for s in new if s in old]:
+        for metric in ("p50_s", "p90_s", "wall_s", "network_s", "parse_s", "mb", "retries"):
+            a, b = old[scraper][metric], new[scraper][metric]
+            change = f"{(b - a) / a:+.0%}" if a else ""
+            lines.append(f"  {scraper:<13}{metric:<11}{a:>10.2f}{b:>10.2f}{change:>9}")
+    return "\n".join(lines)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Report on scraper run logs")
+    p.add_argument("log", nargs="?", help="Run log (default: the latest in .cache/runs/)")
+    p.add_argument("--slowest", type=int, default=10, help="Slowest units to list (default: 10)")
+    p.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                   help="Compare two run logs")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.compare:
+        print(compare(*map(read, args.compare)))
+        return
+    path = args.log or latest()
+    if path is None:
+        raise SystemExit(f"No run logs in {RUN_DIR}")
+    print(f"{path}\n{report(read(path), args.slowest)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Destination model training set builder
+=======================================
+Reads the cleaned 247Sports and On3 transfers from the canonical Parquet
+dataset (dataset.py, which converts and cleans the CSVs once and rebuilds
+when any of them changes) and drops 247's second listing of each transfer.
+
+Usage:
+    python training_data.py                 # build (or load) and summarise
+    python training_data.py --workers 8
+    python training_data.py --rebuild       # reconvert the CSVs
+
+    from training_data import load_training_data, model_frame
+    data = load_training_data()
+    X, y = model_frame(data)
+"""
+
+import argparse
+import time
+
+from dataset import load_transfers
+from model_service import FEATURES
+
+
+def load_training_data(workers=None, rebuild=False, verbose=False):
+    """Cleaned transfers from every season of every source, one row per transfer."""
+    data = load_transfers(workers=workers, rebuild=rebuild, verbose=verbose)
+    # 247 lists every transfer under both the old and new team.
+    data = data.drop_duplicates(subset=["source", "season", "profile_url", "status"])
+    return data.reset_index(drop=True)
+
+
+def model_frame(data=None):
+    """(X, y) for the destination model: player attributes → to_school."""
+    if data is None:
+        data = load_training_data()
+    # On3 has no height/weight/stars; the pipeline imputes those.
+    data = data.dropna(subset=["to_school", "position", "from_school"])
+    return data[FEATURES], data["to_school"]
+
+
+def row_keys(data):
+    """Stable id per labelled row, used to find entries a model has not seen.
+
+    A player who goes from Entered to Committed gets a new key, because the
+    destination is part of it.
+    """
+    return (data["source"] + "|" + data["season"].astype(str) + "|"
+            + data["profile_url"].fillna(data["name"]) + "|" + data["to_school"])
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Build the destination model training set")
+    p.add_argument("--workers", type=int, default=None,
+                   help="Worker processes (default: one per CPU)")
+    p.add_argument("--rebuild", action="store_true", help="Ignore any cached build")
+    return p.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    start = time.perf_counter()
+    data = load_training_data(workers=args.workers, rebuild=args.rebuild, verbose=True)
+    print(f"Loaded {len(data)} rows in {time.perf_counter() - start:.2f}s\n")
+    print(data.groupby(["source", "season"]).size().unstack(0).fillna(0).astype(int))
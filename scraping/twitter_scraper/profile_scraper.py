@@ -7,11 +7,17 @@ import shutil
 import signal
 import subprocess
 import socket
+import sys
 import time
 from typing import Dict, Optional, List
 
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page
 
+# resource_blocking.py lives one level up, in scraping/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from resource_blocking import DEFAULT_SPEC, BlockingRules, BlockStats, block_playwright
+from run_log import RunLog
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
@@ -55,6 +61,7 @@ class TwitterScraper:
     - Automated login bypass and session persistence
     - Disk-backed state management for tweet watermarks
     - Global and profile-specific scrape limits
+    - Images, video, fonts and trackers blocked (only tweet text is read)
     
     Detection avoidance:
     - Launches a real Chrome subprocess (NOT Playwright's bundled Chromium)
@@ -69,7 +76,8 @@ class TwitterScraper:
         user_data_dir: str = "./playwright_chrome_data",
         state_file: str = "scraper_state.json",
         headless: bool = True,
-        default_n: int = GLOBAL_DEFAULT_N
+        default_n: int = GLOBAL_DEFAULT_N,
+        block: str = DEFAULT_SPEC
     ):
         self.username = username
         self.password = password
@@ -79,6 +87,15 @@ class TwitterScraper:
         self.headless = headless
         self.default_n = default_n
         
+        # Requests dropped before they leave the browser ("none" to disable)
+        self.block_rules = BlockingRules.from_spec(block)
+        self.block_stats = BlockStats()
+        
+        # One JSON line per profile check (run_log.py), written but not kept
+        # in memory: the monitor runs indefinitely.
+        self.run_log = RunLog("twitter", args={"headless": headless, "block": block},
+                              keep=False)
+        
         # Profile-specific overrides for N
         self.custom_n_settings: Dict[str, int] = {}
         
@@ -186,6 +203,7 @@ class TwitterScraper:
             f"http://127.0.0.1:{debug_port}"
         )
         self._browser_context = self._browser.contexts[0]
+        await block_playwright(self._browser_context, self.block_rules, self.block_stats)
         
         # 3. Minimal stealth patches (most detection is already gone
         #    because Chrome was launched cleanly)
@@ -225,6 +243,9 @@ class TwitterScraper:
                 self._chrome_proc.kill()
             self._chrome_proc = None
             
+        logger.info(f"Network: {self.block_stats.summary()}")
+        self.run_log.close()
+        logger.info(self.run_log.report())
         self._save_state()
         logger.info("Shutdown complete.")
 
@@ -327,11 +348,15 @@ class TwitterScraper:
             return
         logger.info(f"Checking profile: {profile_url}")
         n_to_check = self._get_n_for_profile(profile_url)
+        unit = self.run_log.unit(profile_url)
+        before = (self.block_stats.bytes_downloaded, self.block_stats.requests)
         
         try:
-            await page.goto(profile_url)
+            with unit.timing("network"):
+                await page.goto(profile_url)
             await self._human_delay(1.5, 3.5)  # Pause after navigating
-            await page.wait_for_selector('[data-testid="tweet"]', timeout=15000)
+            with unit.timing("network"):
+                await page.wait_for_selector('[data-testid="tweet"]', timeout=15000)
             await self._human_delay(1.0, 2.5)  # Pause before reading tweets
             
             tweets = page.locator('[data-testid="tweet"]')
@@ -346,14 +371,17 @@ class TwitterScraper:
                 # Scroll tweet into view and pause like a human reading
                 await tweet_loc.scroll_into_view_if_needed()
                 await self._human_delay(0.5, 1.5)
+                unit.add(rounds=1)
                 
-                text = await tweet_loc.inner_text()
+                with unit.timing("parse"):
+                    text = await tweet_loc.inner_text()
                 
                 if text.startswith("Pinned"):
                     continue
                     
                 time_link = tweet_loc.locator("time").first.locator("xpath=..")
-                href = await time_link.get_attribute("href")
+                with unit.timing("parse"):
+                    href = await time_link.get_attribute("href")
                 
                 if not href:
                     continue
@@ -376,5 +404,10 @@ class TwitterScraper:
                 logger.info(f"🚨 NEW TWEET [{profile_url}] ID: {t['id']}\n{t['text'][:100]}...\n")
                 # Insert your Discord webhook logic here
                 
+            unit.add(bytes=self.block_stats.bytes_downloaded - before[0],
+                     requests=self.block_stats.requests - before[1])
+            unit.finish(rows=len(new_tweets))
+                
         except Exception as e:
-            logger.error(f"Failed to check {profile_url}: {e}")
\ No newline at end of file
+            logger.error(f"Failed to check {profile_url}: {e}")
+            unit.finish(error=e)
\ No newline at end of file